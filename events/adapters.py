@@ -2,6 +2,8 @@ from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
 from django.contrib.auth import get_user_model
 from django.shortcuts import redirect
 
+from .roles import get_user_role
+
 User = get_user_model()
 
 
@@ -55,13 +57,8 @@ class CustomSocialAccountAdapter(DefaultSocialAccountAdapter):
         - If user has profile → go to home
         - If new Google user → go to choice page
         """
-        user = request.user
-
         # Check if user has any profile
-        has_volunteer_profile = hasattr(user, 'volunteer_profile')
-        has_organizer_profile = hasattr(user, 'organizer_profile')
-
-        if has_volunteer_profile or has_organizer_profile:
+        if get_user_role(request.user).has_profile:
             # User has a profile, go to home
             return '/'
 
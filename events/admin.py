@@ -1,23 +1,247 @@
-from django.contrib import admin
-from .models import OrganizerProfile, VolunteerProfile, Event, EventRegistration, UserHistory
+import csv
+
+from django.contrib import admin, messages
+from django.contrib.auth.admin import UserAdmin
+from django.contrib.auth.models import User
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Min
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from . import registrations
+from .deletion import soft_delete_event, soft_delete_user
+from .models import (
+    OrganizerProfile, VolunteerProfile, Event, EventRegistration, Attendance, UserHistory, EventRecommendation,
+    EventSeries, SeriesOccurrenceOverride, EventImpactReport, ImpactSummary, PurgeJob,
+)
+
+# Unfiltered changelists of tables at least this big show an estimated count
+ESTIMATE_THRESHOLD = 10000
+EXPORT_CHUNK_SIZE = 2000
+
+
+# ==================== CHANGELIST HELPERS ====================
+
+def estimated_count(queryset):
+    """Approximate row count of the whole table, without a COUNT(*) scan"""
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            # Kept up to date by autovacuum/ANALYZE; -1 if never analyzed
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] >= 0 else None
+    # Elsewhere, the primary key span: two index lookups
+    span = queryset.model._base_manager.using(queryset.db).aggregate(low=Min('pk'), high=Max('pk'))
+    return span['high'] - span['low'] + 1 if span['low'] is not None else 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """Exact counts for filtered lists; an estimate for a big table's full list"""
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if not query.where and not query.distinct:
+            estimate = estimated_count(self.object_list)
+            if estimate is not None and estimate >= ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    For tables with millions of rows: no full COUNT(*), an estimated
+    count on the unfiltered list, and only the list_only columns loaded
+    for the rows on the page.
+    """
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    list_only = None
+
+    def get_changelist(self, request, **kwargs):
+        list_only = self.list_only
+
+        class OnlyChangeList(ChangeList):
+            def get_queryset(self, request, exclude_parameters=None):
+                queryset = super().get_queryset(request, exclude_parameters)
+                return queryset.only(*list_only) if list_only else queryset
+
+        return OnlyChangeList
+
+
+class SoftDeleteAdminMixin:
+    """
+    Delete (single or bulk) soft-deletes and queues a purge (events.deletion)
+    instead of cascading in the request. The confirmation page lists just
+    the selected objects, so it doesn't collect every dependent row either.
+    """
+    soft_delete = None
+
+    def get_deleted_objects(self, objs, request):
+        objs = list(objs)
+        model_count = {self.model._meta.verbose_name_plural: len(objs)}
+        return [str(obj) for obj in objs], model_count, set(), []
+
+    def delete_model(self, request, obj):
+        self.soft_delete(obj, requested_by=request.user)
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            self.soft_delete(obj, requested_by=request.user)
+
+
+def export_csv(queryset, columns, name):
+    """Stream (header, lookup) columns of the queryset as CSV, in chunks"""
+    class Echo:
+        def write(self, value):
+            return value
+
+    writer = csv.writer(Echo())
+    rows = queryset.order_by('pk').values_list(*(lookup for _, lookup in columns)).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    def lines():
+        yield writer.writerow([header for header, _ in columns])
+        for row in rows:
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(lines(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{name}-{timezone.now():%Y%m%d-%H%M}.csv"'
+    return response
+
+
+# ==================== MODEL ADMINS ====================
 
 @admin.register(OrganizerProfile)
 class OrganizerProfileAdmin(admin.ModelAdmin):
     list_display = ['organization_name', 'user', 'created_at']
+    list_select_related = ['user']
+    autocomplete_fields = ['user']
 
 @admin.register(VolunteerProfile)
 class VolunteerProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'city', 'total_events_attended']
+    list_select_related = ['user']
+    autocomplete_fields = ['user']
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
+    soft_delete = staticmethod(soft_delete_event)
     list_display = ['title', 'category', 'organizer', 'date', 'capacity']
     list_filter = ['category', 'date']
+    list_select_related = ['organizer']
+    search_fields = ['title', 'city']
+    autocomplete_fields = ['organizer']
+    raw_id_fields = ['series']
+    date_hierarchy = 'date'
+    actions = ['promote_waitlist']
+
+    @admin.action(description='Promote waitlisted volunteers into free spots')
+    def promote_waitlist(self, request, queryset):
+        promoted = registrations.promote_waitlist(queryset.values_list('pk', flat=True))
+        self.message_user(request, f'Promoted {promoted} waitlisted registrations.', messages.SUCCESS)
 
 @admin.register(EventRegistration)
-class EventRegistrationAdmin(admin.ModelAdmin):
-    list_display = ['event', 'volunteer', 'status', 'registered_at']
+class EventRegistrationAdmin(LargeTableAdmin):
+    list_display = ['event', 'volunteer', 'status', 'registered_at', 'checked_in_at']
+    list_select_related = ['event', 'volunteer']
+    list_only = ['status', 'registered_at', 'checked_in_at', 'event__title', 'volunteer__username']
+    list_filter = ['status']
+    autocomplete_fields = ['event', 'volunteer']
+    date_hierarchy = 'registered_at'
+    actions = ['cancel_registrations', 'promote_waitlist', 'export_registrations']
+
+    @admin.action(description='Cancel selected registrations')
+    def cancel_registrations(self, request, queryset):
+        cancelled, event_ids = registrations.cancel(queryset)
+        self.message_user(
+            request, f'Cancelled {cancelled} registrations across {len(event_ids)} events.', messages.SUCCESS,
+        )
+
+    @admin.action(description="Promote the waitlist of the selected registrations' events")
+    def promote_waitlist(self, request, queryset):
+        event_ids = set(queryset.order_by().values_list('event_id', flat=True).distinct())
+        promoted = registrations.promote_waitlist(event_ids)
+        self.message_user(request, f'Promoted {promoted} waitlisted registrations.', messages.SUCCESS)
+
+    @admin.action(description='Export selected registrations as CSV')
+    def export_registrations(self, request, queryset):
+        return export_csv(queryset, [
+            ('Registration ID', 'pk'), ('Event ID', 'event_id'), ('Event', 'event__title'),
+            ('Event date', 'event__date'), ('Volunteer', 'volunteer__username'), ('Email', 'volunteer__email'),
+            ('Status', 'status'), ('Registered at', 'registered_at'), ('Checked in at', 'checked_in_at'),
+        ], 'registrations')
+
+@admin.register(Attendance)
+class AttendanceAdmin(LargeTableAdmin):
+    list_display = ['event', 'volunteer', 'source', 'recorded_at']
+    list_filter = ['source']
+    list_select_related = ['event', 'volunteer']
+    list_only = ['source', 'recorded_at', 'event__title', 'volunteer__username']
+    autocomplete_fields = ['event', 'volunteer']
+    date_hierarchy = 'recorded_at'
 
 @admin.register(UserHistory)
-class UserHistoryAdmin(admin.ModelAdmin):
-    list_display = ['user', 'event', 'viewed_at']
\ No newline at end of file
+class UserHistoryAdmin(LargeTableAdmin):
+    list_display = ['user', 'event', 'viewed_at']
+    list_select_related = ['user', 'event']
+    list_only = ['viewed_at', 'user__username', 'event__title']
+    autocomplete_fields = ['user', 'event']
+    date_hierarchy = 'viewed_at'
+    actions = ['export_history']
+
+    @admin.action(description='Export selected history as CSV')
+    def export_history(self, request, queryset):
+        return export_csv(queryset, [
+            ('User', 'user__username'), ('Event ID', 'event_id'), ('Event', 'event__title'), ('Viewed at', 'viewed_at'),
+        ], 'history')
+
+@admin.register(EventRecommendation)
+class EventRecommendationAdmin(LargeTableAdmin):
+    list_display = ['event', 'recommended_event', 'rank', 'score']
+    list_select_related = ['event', 'recommended_event']
+    list_only = ['rank', 'score', 'event__title', 'recommended_event__title']
+    autocomplete_fields = ['event', 'recommended_event']
+
+class SeriesOccurrenceOverrideInline(admin.TabularInline):
+    model = SeriesOccurrenceOverride
+    extra = 0
+
+@admin.register(EventSeries)
+class EventSeriesAdmin(admin.ModelAdmin):
+    list_display = ['title', 'category', 'organizer', 'first_start', 'recurrence', 'last_start', 'is_active']
+    list_filter = ['category', 'is_active']
+    list_select_related = ['organizer']
+    autocomplete_fields = ['organizer']
+    readonly_fields = ['city', 'latitude', 'longitude', 'geo_cell', 'last_start']
+    inlines = [SeriesOccurrenceOverrideInline]
+
+@admin.register(EventImpactReport)
+class EventImpactReportAdmin(admin.ModelAdmin):
+    list_display = ['event', 'trees_planted', 'co2_saved_kg', 'waste_collected_kg', 'hours_volunteered', 'reported_at']
+    list_select_related = ['event']
+    autocomplete_fields = ['event']
+
+@admin.register(ImpactSummary)
+class ImpactSummaryAdmin(admin.ModelAdmin):
+    list_display = ['scope', 'key', 'events', 'attendees', 'trees_planted', 'co2_saved_kg', 'updated_at']
+    list_filter = ['scope']
+
+@admin.register(PurgeJob)
+class PurgeJobAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'label', 'status', 'step', 'rows_deleted', 'requested_by', 'requested_at', 'finished_at']
+    list_filter = ['kind', 'status']
+    list_select_related = ['requested_by']
+    readonly_fields = [field.name for field in PurgeJob._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+admin.site.unregister(User)
+
+@admin.register(User)
+class SoftDeleteUserAdmin(SoftDeleteAdminMixin, UserAdmin):
+    soft_delete = staticmethod(soft_delete_user)
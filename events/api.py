@@ -0,0 +1,314 @@
+"""
+Read-only JSON API (v1) for events, registrations and dashboard stats.
+
+Every list is read with .values() over just the columns the requested
+fields need, so a row is a dict built in the same query: no model
+instances, no per-row lazy loads. Related data (organizer name, event
+title) comes from joins in that query, and counts come from annotations.
+
+    GET /api/v1/events/?fields=id,title,date&category=beach_cleanup
+    GET /api/v1/events/?ids=4,8,15
+    GET /api/v1/events/<id>/
+    GET /api/v1/registrations/?status=confirmed     (login required)
+    GET /api/v1/stats/                              (login required)
+
+Lists are paged with an opaque cursor (keyset on the sort column plus id),
+so a page costs the same however deep into the results it is:
+``{"data": [...], "next_cursor": "..."}``. Pass next_cursor back as
+``?cursor=`` until it is null.
+"""
+
+import base64
+import json
+from datetime import datetime
+from functools import wraps
+
+from django.core.files.storage import default_storage
+from django.db.models import Count, F, Q
+from django.http import JsonResponse
+from django.utils import timezone
+
+from .categories import category_label
+from .impact import IMPACT_METRICS
+from .models import Event, EventRegistration
+from .roles import get_user_role
+from .views import (
+    build_organizer_analytics, build_volunteer_analytics, organizer_analytics_queries,
+    run_queries, volunteer_analytics_queries,
+)
+
+API_VERSION = 'v1'
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_IDS = 100
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class Resource:
+    """
+    The public fields of one kind of object and how each is read.
+
+    columns:     API field -> ORM path for .values()
+    annotations: API field -> aggregate expression
+    derived:     API field -> (fields it needs, function(row) -> value)
+    """
+
+    def __init__(self, columns, annotations=None, derived=None, default=()):
+        self.columns = columns
+        self.annotations = annotations or {}
+        self.derived = derived or {}
+        self.default = list(default)
+
+    @property
+    def names(self):
+        return list(self.columns) + list(self.annotations) + list(self.derived)
+
+    def parse_fields(self, param):
+        if not param:
+            return self.default
+        fields = [name.strip() for name in param.split(',') if name.strip()]
+        unknown = [name for name in fields if name not in self.names]
+        if unknown:
+            raise ApiError(f'Unknown fields: {", ".join(unknown)}. Available: {", ".join(self.names)}')
+        return list(dict.fromkeys(fields))
+
+    def values(self, queryset, fields, extra=()):
+        """``queryset`` reduced to the columns and annotations ``fields`` need"""
+        needed = set(fields) | set(extra)
+        for name in fields:
+            if name in self.derived:
+                needed.update(self.derived[name][0])
+        annotations = {name: expr for name, expr in self.annotations.items() if name in needed}
+        columns = {name: path for name, path in self.columns.items() if name in needed}
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        # Alias joined paths to their API names; plain columns are read as-is
+        aliased = {name: path for name, path in columns.items() if name != path}
+        plain = [name for name in columns if name not in aliased]
+        return queryset.values(*plain, *annotations, **{name: F(path) for name, path in aliased.items()})
+
+    def serialize(self, row, fields):
+        return {
+            name: self.derived[name][1](row) if name in self.derived else row[name]
+            for name in fields
+        }
+
+
+def _media_url(path):
+    return default_storage.url(path) if path else None
+
+
+EVENTS = Resource(
+    columns={
+        'id': 'id', 'title': 'title', 'description': 'description', 'category': 'category',
+        'organizer_id': 'organizer_id', 'organizer_name': 'organizer__username',
+        'location': 'location', 'address': 'address', 'city': 'city',
+        'latitude': 'latitude', 'longitude': 'longitude', 'date': 'date', 'end_date': 'end_date',
+        'capacity': 'capacity', 'allow_waitlist': 'allow_waitlist', 'is_active': 'is_active',
+        'cover_image': 'cover_image', 'updated_at': 'updated_at',
+    },
+    annotations={
+        'registration_count': Count('registrations', filter=Q(registrations__status='confirmed')),
+    },
+    derived={
+        'category_display': (['category'], lambda row: category_label(row['category'])),
+        'spots_remaining': (['capacity', 'registration_count'], lambda row: max(row['capacity'] - row['registration_count'], 0)),
+        'cover_image_url': (['cover_image'], lambda row: _media_url(row['cover_image'])),
+    },
+    default=['id', 'title', 'category', 'location', 'city', 'date', 'end_date', 'capacity'],
+)
+
+REGISTRATIONS = Resource(
+    columns={
+        'id': 'id', 'status': 'status', 'registered_at': 'registered_at',
+        'event_id': 'event_id', 'event_title': 'event__title', 'event_date': 'event__date',
+        'volunteer_id': 'volunteer_id', 'volunteer_name': 'volunteer__username',
+    },
+    default=['id', 'event_id', 'event_title', 'event_date', 'status', 'registered_at'],
+)
+
+
+# ---- cursor pagination ----
+
+def encode_cursor(value, pk):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        value, pk = json.loads(raw)
+        return datetime.fromisoformat(value), int(pk)
+    except (ValueError, TypeError):
+        raise ApiError('Invalid cursor')
+
+
+def page_size(request):
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ApiError('limit must be a whole number')
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def paginate(request, resource, queryset, fields, key, descending=False):
+    """One page of serialized rows ordered by (key, id), plus the next cursor"""
+    cursor = request.GET.get('cursor')
+    limit = page_size(request)
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        after = 'lt' if descending else 'gt'
+        queryset = queryset.filter(Q(**{f'{key}__{after}': value}) | Q(**{key: value, f'id__{after}': pk}))
+    order = [f'-{key}', '-id'] if descending else [key, 'id']
+    rows = list(resource.values(queryset.order_by(*order), fields, extra=[key, 'id'])[:limit + 1])
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][key], rows[-1]['id'])
+    return [resource.serialize(row, fields) for row in rows], next_cursor
+
+
+def parse_ids(param):
+    try:
+        ids = [int(part) for part in param.split(',') if part.strip()]
+    except ValueError:
+        raise ApiError('ids must be a comma-separated list of whole numbers')
+    if len(ids) > MAX_IDS:
+        raise ApiError(f'At most {MAX_IDS} ids per request')
+    return list(dict.fromkeys(ids))
+
+
+def by_ids(resource, queryset, ids, fields):
+    """Batch fetch in one query, returned in the order the ids were asked for"""
+    rows = {row['id']: row for row in resource.values(queryset.filter(id__in=ids), fields, extra=['id'])}
+    return [resource.serialize(rows[pk], fields) for pk in ids if pk in rows]
+
+
+# ---- views ----
+
+def api_view(view):
+    """JSON errors instead of HTML pages, and a version header on every response"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            response = JsonResponse({'error': 'Method not allowed'}, status=405)
+            response['Allow'] = 'GET'
+        else:
+            try:
+                response = view(request, *args, **kwargs)
+            except ApiError as exc:
+                response = JsonResponse({'error': str(exc)}, status=exc.status)
+        response['X-API-Version'] = API_VERSION
+        return response
+    return wrapper
+
+
+def _require_user(request):
+    if not request.user.is_authenticated:
+        raise ApiError('Authentication required', status=401)
+    return request.user
+
+
+@api_view
+def event_list(request):
+    """Active events (upcoming unless ?upcoming=0), filterable by category and city"""
+    fields = EVENTS.parse_fields(request.GET.get('fields'))
+    events = Event.objects.filter(is_active=True)
+    if 'ids' in request.GET:
+        return JsonResponse({'data': by_ids(EVENTS, events, parse_ids(request.GET['ids']), fields)})
+
+    if request.GET.get('upcoming', '1') != '0':
+        # archived_at: served by the partial index on the listed events
+        events = events.filter(archived_at__isnull=True, date__gte=timezone.now())
+    if request.GET.get('category'):
+        events = events.filter(category__in=request.GET['category'].split(','))
+    if request.GET.get('city'):
+        events = events.filter(city__in=request.GET['city'].split(','))
+    data, next_cursor = paginate(request, EVENTS, events, fields, key='date')
+    return JsonResponse({'data': data, 'next_cursor': next_cursor})
+
+
+@api_view
+def event_item(request, event_id):
+    """One event"""
+    fields = EVENTS.parse_fields(request.GET.get('fields'))
+    found = by_ids(EVENTS, Event.objects.all(), [event_id], fields)
+    if not found:
+        raise ApiError('Event not found', status=404)
+    return JsonResponse({'data': found[0]})
+
+
+@api_view
+def registration_list(request):
+    """A volunteer's own registrations, or those for an organizer's events"""
+    user = _require_user(request)
+    role = get_user_role(user)
+    if role.is_organizer:
+        registrations = EventRegistration.objects.filter(event__organizer=user)
+        if request.GET.get('event'):
+            if not request.GET['event'].isdigit():
+                raise ApiError('event must be an event id')
+            registrations = registrations.filter(event_id=request.GET['event'])
+    elif role.is_volunteer:
+        registrations = EventRegistration.objects.filter(volunteer=user, event__deleted_at__isnull=True)
+    else:
+        raise ApiError('Profile not found', status=403)
+
+    fields = REGISTRATIONS.parse_fields(request.GET.get('fields'))
+    if request.GET.get('status'):
+        registrations = registrations.filter(status__in=request.GET['status'].split(','))
+    if 'ids' in request.GET:
+        return JsonResponse({'data': by_ids(REGISTRATIONS, registrations, parse_ids(request.GET['ids']), fields)})
+    data, next_cursor = paginate(request, REGISTRATIONS, registrations, fields, key='registered_at', descending=True)
+    return JsonResponse({'data': data, 'next_cursor': next_cursor})
+
+
+# Dashboard figures the templates get as JSON strings for Chart.js
+_CHART_KEYS = {
+    'activity_months', 'activity_counts', 'registration_months', 'registration_counts',
+    'category_labels', 'category_counts',
+}
+
+
+def _stats_payload(analytics):
+    payload = {}
+    for key, value in analytics.items():
+        if key == 'now':
+            continue
+        if key in _CHART_KEYS:
+            value = json.loads(value)
+        elif key == 'impact':
+            value = {metric: getattr(value, metric) for metric in IMPACT_METRICS} if value is not None else None
+        elif key == 'leaderboard':
+            value = [
+                {'username': profile.user.username, 'events_attended': profile.total_events_attended, 'points': profile.points}
+                for profile in value
+            ]
+        payload[key] = value
+    return payload
+
+
+@api_view
+def dashboard_stats(request):
+    """The figures behind the volunteer or organizer dashboard"""
+    user = _require_user(request)
+    role = get_user_role(user)
+    now = timezone.now()
+    if role.is_volunteer:
+        registrations = EventRegistration.objects.filter(volunteer=user, status__in=['confirmed', 'waitlist'])
+        analytics = build_volunteer_analytics(run_queries(volunteer_analytics_queries(user, registrations, now)), now)
+    elif role.is_organizer:
+        events = Event.objects.filter(organizer=user)
+        analytics = build_organizer_analytics(run_queries(organizer_analytics_queries(user, events, now)), now)
+    else:
+        raise ApiError('Profile not found', status=403)
+    return JsonResponse({'role': role.name, 'data': _stats_payload(analytics)})
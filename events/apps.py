@@ -6,4 +6,7 @@ class EventsConfig(AppConfig):
     name = 'events'
 
     def ready(self):
-        import events.signals  # Import signals
\ No newline at end of file
+        import events.signals  # Import signals
+        from events import sqlite, tracing
+        sqlite.install()  # WAL and the other SQLITE_PRAGMAS on each new connection
+        tracing.install()  # SQL/template/email spans, only when TRACING_ENABLED
@@ -0,0 +1,59 @@
+"""
+Archiving finished events.
+
+The events table keeps every event ever held, but the home listing only
+needs the ones still to come. archive_finished_events() stamps
+archived_at on every live event whose end (end_date, or date when there
+is none) has passed. The listing then reads listed_events(): live,
+unarchived events, through a partial index on date that holds only those
+rows (models.LISTED). However many past events pile up, the listing,
+its search and its facet counts only touch the upcoming calendar.
+
+Archived events stay where they are, with their registrations,
+attendance and impact untouched: event pages, dashboards and calendars
+work as before. They are browsed on the separate archive page
+(archived_events()), which users have to ask for.
+
+archived_at is not is_active: an inactive event was cancelled or
+deleted, and attendance, impact and calendar feeds read it that way.
+Cancelled events aren't archived; they are off the listing anyway.
+"""
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .attendance import ended
+from .models import LISTED, Event
+from .sqlite import write_transaction
+
+BATCH_SIZE = 1000
+
+
+def upcoming(now):
+    """Events that haven't ended yet (the complement of attendance.ended)"""
+    return Q(end_date__gte=now) | Q(end_date__isnull=True, date__gte=now)
+
+
+def listed_events(now=None):
+    """The home listing: live events still to come, soonest first"""
+    # Deleted events are inactive, so LISTED leaves them out; going through
+    # all_objects keeps deleted_at (and its index) out of the query plan
+    return Event.all_objects.filter(LISTED).filter(upcoming(now or timezone.now())).order_by('date')
+
+
+def archived_events():
+    """Finished events, most recent first"""
+    return Event.objects.filter(is_active=True, archived_at__isnull=False).order_by('-date')
+
+
+def archive_finished_events(now=None, batch_size=BATCH_SIZE):
+    """Archive every listed event that has ended; returns how many"""
+    now = now or timezone.now()
+    archived = 0
+    while True:
+        with write_transaction():
+            batch = list(Event.all_objects.filter(LISTED).filter(ended(now)).values_list('pk', flat=True)[:batch_size])
+            if batch:
+                archived += Event.objects.filter(pk__in=batch).update(archived_at=now)
+        if len(batch) < batch_size:
+            return archived
@@ -0,0 +1,110 @@
+"""
+Attendance ledger: who actually attended each finished event.
+
+close_past_events() finalizes every event whose end (end_date, or date
+when there is no end_date) has passed. If anyone checked in at the door
+(events.tickets), only the volunteers who checked in are recorded.
+Otherwise all confirmed registrations are recorded, because there is no
+better evidence. Cancelled (inactive) events record nobody. The event
+is then stamped with attendance_closed_at, so each run only looks at
+newly finished events.
+
+VolunteerProfile.total_events_attended is the number of ledger rows for
+that volunteer. It is refreshed for the affected volunteers only, with
+one correlated-subquery UPDATE per batch. Dashboards and the leaderboard
+just read the stored figure and never write on a page view.
+"""
+
+from django.db import transaction
+from django.db.models import Case, CharField, Count, Exists, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Attendance, Event, EventRegistration, VolunteerProfile
+
+CLOSE_BATCH_SIZE = 200
+TOTALS_BATCH_SIZE = 500
+
+
+def ended(now):
+    return Q(end_date__lt=now) | Q(end_date__isnull=True, date__lt=now)
+
+
+def finished_events(now=None):
+    """Events that are over but whose attendance hasn't been recorded yet"""
+    return Event.objects.filter(ended(now or timezone.now()), attendance_closed_at__isnull=True)
+
+
+def attendee_rows(event_ids):
+    """(event_id, volunteer_id, source) for everyone who attended ``event_ids``"""
+    door_used = EventRegistration.objects.filter(event_id=OuterRef('event_id'), checked_in_at__isnull=False)
+    return (
+        EventRegistration.objects.filter(event_id__in=event_ids, event__is_active=True, status='confirmed')
+        .filter(Q(checked_in_at__isnull=False) | ~Exists(door_used))
+        .annotate(source=Case(
+            When(checked_in_at__isnull=False, then=Value('check_in')),
+            default=Value('registration'),
+            output_field=CharField(),
+        ))
+        .values_list('event_id', 'volunteer_id', 'source')
+    )
+
+
+def refresh_totals(volunteer_ids=None):
+    """Set total_events_attended from the ledger (for everyone when ids is None)"""
+    attended = (
+        Attendance.objects.filter(volunteer_id=OuterRef('user_id'))
+        .values('volunteer_id')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    total = Coalesce(Subquery(attended, output_field=IntegerField()), 0)
+    if volunteer_ids is None:
+        return VolunteerProfile.objects.update(total_events_attended=total)
+
+    volunteer_ids = list(volunteer_ids)
+    updated = 0
+    for start in range(0, len(volunteer_ids), TOTALS_BATCH_SIZE):
+        batch = volunteer_ids[start:start + TOTALS_BATCH_SIZE]
+        updated += VolunteerProfile.objects.filter(user_id__in=batch).update(total_events_attended=total)
+    return updated
+
+
+def close_events(event_ids, now=None):
+    """
+    Write the ledger for ``event_ids`` and refresh the affected totals.
+    Closing an event again replaces its rows, e.g. after late door syncs.
+    Returns (attendances recorded, volunteers affected).
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        previous = Attendance.objects.filter(event_id__in=event_ids)
+        affected = set(previous.values_list('volunteer_id', flat=True))
+        previous.delete()
+
+        rows = [
+            Attendance(event_id=event_id, volunteer_id=volunteer_id, source=source)
+            for event_id, volunteer_id, source in attendee_rows(event_ids).iterator(chunk_size=2000)
+        ]
+        Attendance.objects.bulk_create(rows, batch_size=1000)
+        Event.objects.filter(id__in=event_ids).update(attendance_closed_at=now)
+
+        affected.update(row.volunteer_id for row in rows)
+        refresh_totals(affected)
+    return len(rows), affected
+
+
+def close_past_events(now=None, batch_size=CLOSE_BATCH_SIZE):
+    """Close every finished event in batches; returns (events, attendances, volunteers)"""
+    now = now or timezone.now()
+    closed = recorded = 0
+    volunteers = set()
+    while True:
+        event_ids = list(finished_events(now).order_by('id').values_list('id', flat=True)[:batch_size])
+        if not event_ids:
+            break
+        count, affected = close_events(event_ids, now)
+        closed += len(event_ids)
+        recorded += count
+        volunteers |= affected
+    return closed, recorded, len(volunteers)
@@ -0,0 +1,186 @@
+"""
+Live spot availability for event_detail, pushed over Server-Sent Events.
+
+When an EventRegistration (or an Event's capacity) changes, the signal
+handlers in events.signals call publish_availability() after the
+transaction commits. That runs one aggregate query and hands the same
+snapshot to every open stream for that event. Watchers never poll the
+database themselves, however many there are.
+
+Streaming needs ASGI. Under WSGI a StreamingHttpResponse drains the
+whole async generator before sending anything, and this one never ends,
+so it would block a worker thread per page view for good. Under WSGI
+(streaming_supported() is False) the stream answers 204, which tells
+EventSource not to reconnect, and event_detail doesn't open it at all.
+
+The broker is in-process. Each ASGI worker process fans out the changes
+made in that process. Changes made by other processes are picked up by a
+periodic refresh (AVAILABILITY_REFRESH_SECONDS). The first idle stream
+to time out re-reads the counts and publishes them to all the others, so
+this is also one query per event per worker, not one per watcher.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Q
+
+from .models import Event
+
+
+def streaming_supported(request):
+    """Only an ASGI server can hold an open stream without blocking a worker"""
+    return isinstance(request, ASGIRequest)
+
+
+def availability_snapshot(event_id):
+    """Capacity, confirmed and waitlist counts for one event, in one query"""
+    row = (
+        Event.objects.filter(pk=event_id)
+        .annotate(
+            confirmed=Count('registrations', filter=Q(registrations__status='confirmed')),
+            waitlist=Count('registrations', filter=Q(registrations__status='waitlist')),
+        )
+        .values('capacity', 'confirmed', 'waitlist', 'allow_waitlist')
+        .first()
+    )
+    if row is None:
+        return None
+    return {
+        'event_id': event_id,
+        'capacity': row['capacity'],
+        'confirmed': row['confirmed'],
+        'waitlist': row['waitlist'],
+        'available_spots': max(row['capacity'] - row['confirmed'], 0),
+        'is_full': row['confirmed'] >= row['capacity'],
+        'allow_waitlist': row['allow_waitlist'],
+    }
+
+
+class Subscription:
+    """One open stream. Only the latest snapshot is kept, so slow readers never queue up"""
+
+    def __init__(self, event_id, loop):
+        self.event_id = event_id
+        self.loop = loop
+        self.latest = None
+        self._ready = asyncio.Event()
+
+    def _set(self, snapshot):
+        self.latest = snapshot
+        self._ready.set()
+
+    def deliver(self, snapshot):
+        """Thread-safe: called from whichever thread committed the change"""
+        self.loop.call_soon_threadsafe(self._set, snapshot)
+
+    async def next(self, timeout):
+        """The newest snapshot since the last call, or None after ``timeout``"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._ready.clear()
+        return self.latest
+
+
+class AvailabilityBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._published_at = {}
+
+    def subscribe(self, event_id):
+        subscription = Subscription(event_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[event_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            watchers = self._subscribers.get(subscription.event_id)
+            if watchers is not None:
+                watchers.discard(subscription)
+                if not watchers:
+                    del self._subscribers[subscription.event_id]
+                    self._published_at.pop(subscription.event_id, None)
+
+    def watcher_count(self, event_id):
+        with self._lock:
+            return len(self._subscribers.get(event_id, ()))
+
+    def published_since(self, event_id, seconds):
+        with self._lock:
+            return time.monotonic() - self._published_at.get(event_id, float('-inf')) < seconds
+
+    def publish(self, event_id, snapshot):
+        with self._lock:
+            watchers = list(self._subscribers.get(event_id, ()))
+            self._published_at[event_id] = time.monotonic()
+        for subscription in watchers:
+            subscription.deliver(snapshot)
+        return len(watchers)
+
+
+broker = AvailabilityBroker()
+
+
+def publish_availability(event_id):
+    """Recount once and push to every watcher; no query when nobody is watching"""
+    if not broker.watcher_count(event_id):
+        return 0
+    snapshot = availability_snapshot(event_id)
+    if snapshot is None:
+        return 0
+    return broker.publish(event_id, snapshot)
+
+
+def refresh_availability(event_id):
+    """Periodic re-read, skipped if a snapshot went out in the last half interval"""
+    if broker.published_since(event_id, refresh_seconds() / 2):
+        return 0
+    return publish_availability(event_id)
+
+
+def refresh_seconds():
+    return getattr(settings, 'AVAILABILITY_REFRESH_SECONDS', 30)
+
+
+def format_sse(data, event=None, retry=None):
+    lines = []
+    if retry is not None:
+        lines.append(f'retry: {retry}')
+    if event:
+        lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+async def availability_stream(event_id, initial):
+    """
+    Async generator of SSE frames: the initial snapshot, then one frame per
+    change. Unchanged refreshes go out as keep-alive comments so proxies
+    keep the connection open.
+    """
+    subscription = broker.subscribe(event_id)
+    last = initial
+    try:
+        yield format_sse(initial, event='availability', retry=5000)
+        while True:
+            snapshot = await subscription.next(refresh_seconds())
+            if snapshot is None:
+                await sync_to_async(refresh_availability)(event_id)
+                yield ': keep-alive\n\n'
+            elif snapshot != last:
+                last = snapshot
+                yield format_sse(snapshot, event='availability')
+            else:
+                yield ': keep-alive\n\n'
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from allauth.account.auth_backends import AuthenticationBackend
+
+from .roles import PROFILE_RELATIONS
+
+UserModel = get_user_model()
+
+
+class ProfileSelectRelatedMixin:
+    """
+    Load the session user together with both profile relations.
+    Missing profiles are cached as None, so role checks later in the
+    request never hit the database again.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related(*PROFILE_RELATIONS).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        try:
+            user = await UserModel._default_manager.select_related(*PROFILE_RELATIONS).aget(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+class ProfileModelBackend(ProfileSelectRelatedMixin, ModelBackend):
+    """Django's username/password backend with profiles preloaded"""
+
+
+class ProfileAuthenticationBackend(ProfileSelectRelatedMixin, AuthenticationBackend):
+    """Allauth's username/email backend with profiles preloaded"""
@@ -0,0 +1,311 @@
+"""
+Shared helpers for the benchmark management commands.
+
+seed_dataset() fills a (throwaway) database at a configurable scale using
+the same name/city/title pools as generate_dummy_data, but with
+bulk_create so tens of thousands of rows take seconds. summarize() and
+compare_results() turn raw samples into the JSON reports the commands
+write and diff against a saved baseline.
+"""
+
+import json
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection
+from django.utils import timezone
+
+from .geo import apply_geocode
+from .management.commands.generate_dummy_data import Command as DummyData
+from .models import Event, EventRegistration, OrganizerProfile, UserHistory, VolunteerProfile
+
+# Rows per unit of --scale, matching generate_dummy_data's defaults
+BASE_COUNTS = {
+    'volunteers': 100,
+    'organizers': 30,
+    'events': 60,
+    'registrations': 300,
+    'history': 350,
+}
+
+# Metrics compared against a baseline; higher is worse except for throughput
+COMPARED_METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'queries_mean', 'throughput_rps')
+HIGHER_IS_BETTER = {'throughput_rps', 'messages_per_s'}
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of floats"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class QueryCounter:
+    """Counts SQL statements on the default connection via execute_wrapper"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def measure(self):
+        start = self.count
+        with connection.execute_wrapper(self):
+            yield
+        self.last = self.count - start
+
+
+def summarize(latencies, queries, elapsed, errors):
+    """Latency percentiles (ms), queries per request and throughput"""
+    requests = len(latencies)
+    return {
+        'requests': requests,
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'mean_ms': round(sum(latencies) / requests * 1000, 2) if requests else 0.0,
+        'queries_mean': round(sum(queries) / requests, 2) if requests else 0.0,
+        'queries_max': max(queries, default=0),
+        'throughput_rps': round(requests / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def compare_results(current, baseline, metrics=COMPARED_METRICS):
+    """
+    {journey: {metric: (baseline, current, change %)}} for journeys present
+    in both reports. Positive change means slower or more queries, except
+    for HIGHER_IS_BETTER metrics where positive means faster.
+    """
+    diff = {}
+    for name, values in current.get('journeys', {}).items():
+        previous = baseline.get('journeys', {}).get(name)
+        if previous is None:
+            continue
+        diff[name] = {}
+        for metric in metrics:
+            before, after = previous.get(metric), values.get(metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before * 100 if before else 0.0
+            diff[name][metric] = (before, after, round(change, 1))
+    return diff
+
+
+def is_regression(metric, change, threshold=10):
+    """True if a change (in %) is at least ``threshold`` in the bad direction"""
+    worse = -change if metric in HIGHER_IS_BETTER else change
+    return worse >= threshold
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def save_report(path, report):
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+
+
+def _phone(rng):
+    return f'+1-{rng.randint(200, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}'
+
+
+def seed_dataset(scale=1, seed=0, batch_size=1000, password='password123'):
+    """
+    Create BASE_COUNTS * scale rows with bulk_create and return the counts.
+    Events are geocoded here because bulk_create skips the pre_save signal.
+    """
+    rng = random.Random(seed)
+    counts = {name: int(count * scale) for name, count in BASE_COUNTS.items()}
+    password_hash = make_password(password)
+    now = timezone.now()
+
+    volunteer_users = User.objects.bulk_create([
+        User(
+            username=f'bench_volunteer_{i + 1}',
+            email=f'bench.volunteer{i + 1}@example.com',
+            password=password_hash,
+            first_name=rng.choice(DummyData.FIRST_NAMES),
+            last_name=rng.choice(DummyData.LAST_NAMES),
+        )
+        for i in range(counts['volunteers'])
+    ], batch_size=batch_size)
+    organizer_users = User.objects.bulk_create([
+        User(
+            username=f'bench_organizer_{i + 1}',
+            email=f'bench.organizer{i + 1}@example.org',
+            password=password_hash,
+            first_name=rng.choice(DummyData.FIRST_NAMES),
+            last_name=rng.choice(DummyData.LAST_NAMES),
+        )
+        for i in range(counts['organizers'])
+    ], batch_size=batch_size)
+
+    volunteer_profiles = []
+    for user in volunteer_users:
+        profile = VolunteerProfile(
+            user=user,
+            bio=rng.choice(DummyData.BIOS),
+            interests=', '.join(rng.sample(DummyData.INTERESTS, rng.randint(2, 5))),
+            phone=_phone(rng),
+            city=rng.choice(DummyData.CITIES),
+        )
+        apply_geocode(profile, profile.city)
+        volunteer_profiles.append(profile)
+    VolunteerProfile.objects.bulk_create(volunteer_profiles, batch_size=batch_size)
+
+    org_types = ['non_profit', 'community_group', 'government', 'educational', 'corporate']
+    organizer_profiles = []
+    for user in organizer_users:
+        org_name = rng.choice(DummyData.ORGANIZATIONS)
+        organizer_profiles.append(OrganizerProfile(
+            user=user,
+            organization_name=org_name,
+            organization_type=rng.choice(org_types),
+            description=f'{org_name} is dedicated to environmental conservation and sustainability.',
+            phone=_phone(rng),
+        ))
+    OrganizerProfile.objects.bulk_create(organizer_profiles, batch_size=batch_size)
+
+    categories = [key for key, _ in Event.CATEGORY_CHOICES]
+    events = []
+    for i in range(counts['events']):
+        # Same past / upcoming / around-now split as generate_dummy_data
+        if i % 3 == 0:
+            event_date = now - timedelta(days=rng.randint(1, 180))
+        elif i % 3 == 1:
+            event_date = now + timedelta(days=rng.randint(1, 90))
+        else:
+            event_date = now + timedelta(days=rng.randint(-7, 7))
+        city = rng.choice(DummyData.CITIES)
+        category = rng.choice(categories)
+        event = Event(
+            organizer=rng.choice(organizer_users),
+            title=f'{rng.choice(DummyData.EVENT_TITLES)} - {city}',
+            description=f'Join us for an amazing {category} event in {city}!',
+            category=category,
+            location=city,
+            address=f'{rng.randint(100, 9999)} Green Street, {city}, Canada',
+            date=event_date,
+            end_date=event_date + timedelta(hours=rng.randint(2, 4)),
+            capacity=rng.randint(20, 100),
+            allow_waitlist=rng.choice([True, False]),
+        )
+        apply_geocode(event, event.location, event.address, set_city=True)
+        events.append(event)
+    Event.objects.bulk_create(events, batch_size=batch_size)
+
+    pairs = set()
+    confirmed = {}
+    registrations = []
+    attempts = 0
+    while len(registrations) < counts['registrations'] and attempts < counts['registrations'] * 3:
+        attempts += 1
+        volunteer = rng.choice(volunteer_users)
+        event = rng.choice(events)
+        if (volunteer.id, event.id) in pairs:
+            continue
+        pairs.add((volunteer.id, event.id))
+        if confirmed.get(event.id, 0) < event.capacity or not event.allow_waitlist:
+            status = 'confirmed'
+            confirmed[event.id] = confirmed.get(event.id, 0) + 1
+        else:
+            status = 'waitlist'
+        registrations.append(EventRegistration(volunteer=volunteer, event=event, status=status))
+    EventRegistration.objects.bulk_create(registrations, batch_size=batch_size)
+
+    UserHistory.objects.bulk_create([
+        UserHistory(user=rng.choice(volunteer_users), event=rng.choice(events))
+        for _ in range(counts['history'])
+    ], batch_size=batch_size)
+
+    counts['registrations'] = len(registrations)
+    return counts
+
+
+def seed_reminder_events(events, registrations_per_event, starts_in=timedelta(minutes=30), batch_size=1000):
+    """
+    One organizer, ``registrations_per_event`` volunteers and ``events``
+    events starting ``starts_in`` from now, every volunteer confirmed for
+    every event. Returns the created events.
+    """
+    password_hash = make_password('password123')
+    organizer = User.objects.create(username='bench_reminder_organizer', password=password_hash)
+    OrganizerProfile.objects.create(user=organizer, organization_name='Reminder Benchmark')
+
+    volunteers = User.objects.bulk_create([
+        User(
+            username=f'bench_reminder_volunteer_{i + 1}',
+            email=f'bench.reminder{i + 1}@example.com',
+            password=password_hash,
+            first_name=DummyData.FIRST_NAMES[i % len(DummyData.FIRST_NAMES)],
+        )
+        for i in range(registrations_per_event)
+    ], batch_size=batch_size)
+    VolunteerProfile.objects.bulk_create(
+        [VolunteerProfile(user=user) for user in volunteers], batch_size=batch_size
+    )
+
+    start = timezone.now() + starts_in
+    created = []
+    for i in range(events):
+        city = DummyData.CITIES[i % len(DummyData.CITIES)]
+        event = Event(
+            organizer=organizer,
+            title=f'{DummyData.EVENT_TITLES[i % len(DummyData.EVENT_TITLES)]} - {city}',
+            description='Reminder benchmark event',
+            category=Event.CATEGORY_CHOICES[i % len(Event.CATEGORY_CHOICES)][0],
+            location=city,
+            address=f'{100 + i} Green Street, {city}, Canada',
+            date=start,
+            end_date=start + timedelta(hours=2),
+            capacity=registrations_per_event,
+        )
+        apply_geocode(event, event.location, event.address, set_city=True)
+        created.append(event)
+    Event.objects.bulk_create(created, batch_size=batch_size)
+
+    EventRegistration.objects.bulk_create([
+        EventRegistration(event=event, volunteer=volunteer, status='confirmed')
+        for event in created
+        for volunteer in volunteers
+    ], batch_size=batch_size)
+    return created
+
+
+class Stopwatch:
+    """Collects per-request latency and query samples for one journey"""
+
+    def __init__(self, counter):
+        self.counter = counter
+        self.latencies = []
+        self.queries = []
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def time(self, call, *args, **kwargs):
+        start = time.perf_counter()
+        with self.counter.measure():
+            response = call(*args, **kwargs)
+        latency = time.perf_counter() - start
+        self.elapsed += latency
+        self.latencies.append(latency)
+        self.queries.append(self.counter.last)
+        if response.status_code >= 400:
+            self.errors += 1
+        return response
+
+    def summary(self):
+        return summarize(self.latencies, self.queries, self.elapsed, self.errors)
@@ -0,0 +1,194 @@
+"""
+iCalendar (.ics) feeds: one per volunteer (confirmed registrations), one
+per organizer (their events) and one public feed per category.
+
+Calendar apps poll these feeds every few minutes, so a poll has to be
+cheap. Each feed's ETag comes from one indexed aggregate query (row
+count plus latest change timestamps) and the feed's identity (kind,
+owner, host). A matching If-None-Match gets a 304 without building
+anything. A changed feed is streamed straight from an iterator() query,
+and the finished body is cached under its identity and ETag so the next
+client polling the same version is served from memory.
+
+Personal feeds are addressed by a signed token rather than a session,
+because calendar clients cannot log in.
+"""
+
+import hashlib
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Event
+
+PRODID = '-//GreenEvents//Event Calendar//EN'
+
+# Public category feeds include events that ended up to this long ago
+CATEGORY_FEED_PAST_DAYS = 30
+
+_FEED_FIELDS = [
+    'id', 'title', 'description', 'category', 'location', 'address',
+    'date', 'end_date', 'updated_at', 'is_active',
+]
+
+
+def feed_cache_seconds():
+    return getattr(settings, 'ICAL_CACHE_SECONDS', 300)
+
+
+# ---- tokens ----
+
+def feed_token(user, kind):
+    """Signed, URL-safe token identifying ``user``'s ``kind`` feed"""
+    return signing.Signer(salt=f'events.calendar.{kind}').sign(str(user.pk)).replace(':', '-')
+
+
+def user_id_from_token(token, kind):
+    """User id from a feed token, or None if it was not signed by us"""
+    try:
+        value = signing.Signer(salt=f'events.calendar.{kind}').unsign(token.replace('-', ':', 1))
+    except signing.BadSignature:
+        return None
+    return int(value) if value.isdigit() else None
+
+
+# ---- feed querysets ----
+
+def volunteer_feed_events(user_id):
+    return Event.objects.filter(registrations__volunteer_id=user_id, registrations__status='confirmed')
+
+
+def organizer_feed_events(user_id):
+    return Event.objects.filter(organizer_id=user_id)
+
+
+def category_feed_events(category, now=None):
+    now = now or timezone.now()
+    return Event.objects.filter(
+        category=category,
+        is_active=True,
+        date__gte=now - timedelta(days=CATEGORY_FEED_PAST_DAYS),
+    )
+
+
+def feed_scope(kind, owner, host):
+    """
+    Which feed this is: kind ('volunteer', 'organizer', 'category'), whose
+    (user id or category) and the host its links point at. Two feeds with
+    the same contents, e.g. two organizers without events, still differ.
+    """
+    return f'{kind}:{owner}@{host}'
+
+
+def feed_etag(scope, name, events, extra=None):
+    """
+    Strong ETag for a feed from a single aggregate: how many events it has
+    and when any of them (or, via ``extra``, their registrations) last changed.
+    """
+    aggregates = {'count': Count('id', distinct=True), 'updated': Max('updated_at')}
+    if extra:
+        aggregates.update(extra)
+    state = events.order_by().aggregate(**aggregates)
+    raw = '|'.join([scope, name] + [str(state[key]) for key in sorted(state)])
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+# ---- iCalendar formatting ----
+
+def escape_text(value):
+    return (
+        (value or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """Fold a content line at 75 octets as RFC 5545 requires"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Don't split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def format_utc(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def vevent(event, base_url, host):
+    location = event.location
+    if event.address:
+        location = f'{location}, {event.address}'
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:event-{event.id}@{host}',
+        f'DTSTAMP:{format_utc(event.updated_at)}',
+        f'LAST-MODIFIED:{format_utc(event.updated_at)}',
+        f'DTSTART:{format_utc(event.date)}',
+    ]
+    if event.end_date and event.end_date > event.date:
+        lines.append(f'DTEND:{format_utc(event.end_date)}')
+    lines += [
+        f'SUMMARY:{escape_text(event.title)}',
+        f'LOCATION:{escape_text(location)}',
+        f'DESCRIPTION:{escape_text(event.description)}',
+        f'CATEGORIES:{escape_text(event.get_category_display())}',
+        f'URL:{base_url}{reverse("event_detail", args=[event.id])}',
+        'STATUS:CONFIRMED' if event.is_active else 'STATUS:CANCELLED',
+        'END:VEVENT',
+    ]
+    return ''.join(fold(line) for line in lines)
+
+
+def stream_calendar(name, events, base_url, host):
+    """Yield the feed in chunks: the header, one VEVENT per event, the footer"""
+    header = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(name)}',
+        'REFRESH-INTERVAL;VALUE=DURATION:PT1H',
+        'X-PUBLISHED-TTL:PT1H',
+    ]
+    yield ''.join(fold(line) for line in header)
+    for event in events.only(*_FEED_FIELDS).order_by('date').iterator(chunk_size=500):
+        yield vevent(event, base_url, host)
+    yield fold('END:VCALENDAR')
+
+
+def cache_key(scope, etag):
+    return f'ical-feed:{scope}:{etag}'
+
+
+def caching_stream(chunks, key):
+    """Pass chunks through and cache the complete body once the stream finishes"""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    cache.set(key, ''.join(parts), feed_cache_seconds())
+
+
+def registration_state():
+    """Extra aggregate so volunteer feeds change when a registration is redone"""
+    return {'registered': Max('registrations__registered_at')}
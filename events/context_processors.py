@@ -0,0 +1,12 @@
+from .categories import CATEGORIES, CATEGORY_LIST
+from .roles import get_user_role
+
+
+def user_role(request):
+    """Expose the current user's resolved role as ``user_role`` in templates"""
+    return {'user_role': get_user_role(getattr(request, 'user', None))}
+
+
+def categories(request):
+    """The category registry: ``categories`` in order, ``category_map`` by key"""
+    return {'categories': CATEGORY_LIST, 'category_map': CATEGORIES}
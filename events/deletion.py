@@ -0,0 +1,184 @@
+"""
+Deleting events and users without one huge cascade.
+
+Django's delete() first loads every dependent row (every registration
+and history entry of an event, and for an organizer, of all their
+events), then deletes them inside one transaction. For a big event or
+account that takes seconds and holds the write lock the whole time.
+
+Deleting is split in two instead:
+
+soft_delete_event() / soft_delete_user() run in the request. They are a
+couple of UPDATEs: the event gets is_active=False and deleted_at, which
+hides it from Event.objects everywhere. A user gets is_active=False (so
+they can no longer log in), and their events are soft-deleted too. A
+PurgeJob is queued for each.
+
+purge_deleted (cron, or run right after) works through the queue. For
+each job it deletes the dependent rows with plain DELETE ... WHERE pk IN
+(...) statements, BATCH_SIZE rows at a time. Each batch and the job's
+progress (step, rows_deleted) commit together in one short write
+transaction. Once the big tables are empty, the row itself is deleted
+with the normal delete(), which then only has a handful of small
+dependents left (profiles, impact report, social accounts). A job that
+was interrupted is simply picked up again: every step deletes whatever
+is left.
+"""
+
+import time
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.utils import timezone
+
+from .attendance import refresh_totals
+from .models import Attendance, Event, EventRecommendation, EventRegistration, EventSeries, PurgeJob, UserHistory
+from .registrations import publish_on_commit
+from .sqlite import write_transaction
+
+BATCH_SIZE = 1000
+
+
+def _after_event_attendance(rows):
+    # The volunteers' attended totals drop with the ledger rows
+    refresh_totals({volunteer_id for _, volunteer_id in rows})
+
+
+def _after_volunteer_registrations(rows):
+    # Those events each have a spot more now
+    publish_on_commit({event_id for _, event_id in rows})
+
+
+# (model, field pointing at the deleted row, extra column, hook run on each batch)
+EVENT_DEPENDENTS = [
+    (EventRegistration, 'event', None, None),
+    (UserHistory, 'event', None, None),
+    (Attendance, 'event', 'volunteer_id', _after_event_attendance),
+    (EventRecommendation, 'event', None, None),
+    (EventRecommendation, 'recommended_event', None, None),
+]
+USER_DEPENDENTS = [
+    (EventRegistration, 'volunteer', 'event_id', _after_volunteer_registrations),
+    (UserHistory, 'user', None, None),
+    (Attendance, 'volunteer', None, None),
+]
+
+
+# ==================== SOFT DELETE ====================
+
+def soft_delete_event(event, requested_by=None):
+    """Hide the event now and queue its purge"""
+    with write_transaction():
+        Event.all_objects.filter(pk=event.pk).update(is_active=False, deleted_at=timezone.now())
+        job, _ = PurgeJob.objects.get_or_create(
+            kind='event', object_id=event.pk, defaults={'label': event.title[:200], 'requested_by': requested_by},
+        )
+    return job
+
+
+def soft_delete_user(user, requested_by=None):
+    """Deactivate the user, hide their events and series, and queue the purge"""
+    now = timezone.now()
+    with write_transaction():
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        Event.all_objects.filter(organizer=user, deleted_at__isnull=True).update(is_active=False, deleted_at=now)
+        EventSeries.objects.filter(organizer=user).update(is_active=False)
+        job, _ = PurgeJob.objects.get_or_create(
+            kind='user', object_id=user.pk, defaults={'label': user.username, 'requested_by': requested_by},
+        )
+    return job
+
+
+# ==================== PURGE ====================
+
+def _delete_batch(model, field, extra, hook, value, batch_size):
+    """Delete up to batch_size rows of model where field = value; returns how many"""
+    columns = ['pk', extra] if extra else ['pk']
+    rows = list(model._base_manager.filter(**{field: value}).values_list(*columns)[:batch_size])
+    if not rows:
+        return 0
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(rows))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(model._meta.db_table)} WHERE {quote(model._meta.pk.column)} IN ({placeholders})',
+            [row[0] for row in rows],
+        )
+    if hook is not None:
+        hook(rows)
+    return len(rows)
+
+
+class Purger:
+    """Runs purge jobs batch by batch until done or out of time"""
+
+    def __init__(self, batch_size=BATCH_SIZE, deadline=None, pause=0, progress=None):
+        self.batch_size = batch_size
+        self.deadline = deadline
+        self.pause = pause
+        self.progress = progress
+
+    def out_of_time(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def run(self, job):
+        """Purge one job; returns True when it finished, False when time ran out"""
+        if job.status != 'running':
+            job.status = 'running'
+            job.started_at = job.started_at or timezone.now()
+            job.error = ''
+            job.save(update_fields=['status', 'started_at', 'error'])
+        try:
+            done = self.purge_user(job) if job.kind == 'user' else self.purge_event(job, job.object_id)
+        except Exception as exc:
+            PurgeJob.objects.filter(pk=job.pk).update(status='failed', error=repr(exc))
+            raise
+        if done:
+            job.status, job.finished_at, job.step = 'done', timezone.now(), ''
+            job.save(update_fields=['status', 'finished_at', 'step'])
+        return done
+
+    def purge_event(self, job, event_id):
+        if not self.purge_rows(job, EVENT_DEPENDENTS, event_id):
+            return False
+        with write_transaction():
+            Event.all_objects.filter(pk=event_id).delete()
+        return True
+
+    def purge_user(self, job):
+        user_id = job.object_id
+        # The organizer's events first, each emptied in batches
+        for event_id in list(Event.all_objects.filter(organizer_id=user_id).values_list('pk', flat=True)):
+            if not self.purge_event(job, event_id):
+                return False
+        if not self.purge_rows(job, USER_DEPENDENTS, user_id):
+            return False
+        with write_transaction():
+            User.objects.filter(pk=user_id).delete()
+        return True
+
+    def purge_rows(self, job, dependents, value):
+        """Empty each dependent table for value; False if time ran out first"""
+        for model, field, extra, hook in dependents:
+            step = f'{model._meta.label}.{field}'
+            while True:
+                if self.out_of_time():
+                    return False
+                with write_transaction():
+                    deleted = _delete_batch(model, field, extra, hook, value, self.batch_size)
+                    if deleted:
+                        job.rows_deleted += deleted
+                        job.step = step
+                        PurgeJob.objects.filter(pk=job.pk).update(rows_deleted=job.rows_deleted, step=step)
+                if self.progress is not None and deleted:
+                    self.progress(job)
+                if deleted < self.batch_size:
+                    break
+                if self.pause:
+                    # Let other writers in between batches
+                    time.sleep(self.pause)
+        return True
+
+
+def pending_jobs():
+    return PurgeJob.objects.exclude(status='done')
@@ -1,7 +1,10 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
-from .models import Event, OrganizerProfile, VolunteerProfile
+from .models import Event, EventImpactReport, OrganizerProfile, VolunteerProfile
+from .geo import MAX_RADIUS_KM
+from .search import DATE_BUCKETS
+from .recurrence import MAX_OCCURRENCES, WEEKDAYS, parse_rule
 
 
 # VOLUNTEER SIGNUP FORM
@@ -60,15 +63,104 @@ class EventForm(forms.ModelForm):
         }
 
 
+# IMPACT REPORT FORM (organizer's actual figures for a finished event)
+class EventImpactReportForm(forms.ModelForm):
+    class Meta:
+        model = EventImpactReport
+        fields = ['trees_planted', 'co2_saved_kg', 'waste_collected_kg', 'hours_volunteered']
+        labels = {
+            'co2_saved_kg': 'CO₂ saved (kg)',
+            'waste_collected_kg': 'Waste collected (kg)',
+            'hours_volunteered': 'Volunteer hours (total)',
+        }
+
+
+# BULK IMPORT FORM
+class EventImportForm(forms.Form):
+    file = forms.FileField(help_text='CSV with a header row, or JSONL (one event object per line)')
+    dry_run = forms.BooleanField(required=False, label='Only validate, do not create events')
+    skip_invalid = forms.BooleanField(required=False, label='Create the valid rows even if some rows fail')
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith(('.csv', '.jsonl', '.ndjson', '.json')):
+            raise forms.ValidationError('Upload a .csv or .jsonl file.')
+        return upload
+
+
+# RECURRING SERIES (CLONE) FORM
+class EventCloneForm(forms.Form):
+    FREQUENCY_CHOICES = [('WEEKLY', 'Weekly'), ('DAILY', 'Daily'), ('MONTHLY', 'Monthly')]
+    WEEKDAY_CHOICES = list(zip(WEEKDAYS, ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']))
+
+    frequency = forms.ChoiceField(choices=FREQUENCY_CHOICES)
+    interval = forms.IntegerField(min_value=1, max_value=52, initial=1, help_text='Every N days/weeks/months')
+    weekdays = forms.MultipleChoiceField(
+        required=False,
+        choices=WEEKDAY_CHOICES,
+        widget=forms.CheckboxSelectMultiple,
+        help_text='Weekly only; defaults to the event\'s own weekday',
+    )
+    count = forms.IntegerField(
+        required=False, min_value=2, max_value=MAX_OCCURRENCES,
+        help_text='Total number of occurrences, including this event',
+    )
+    until = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+
+    def clean(self):
+        cleaned = super().clean()
+        if self.errors:
+            return cleaned
+        if not cleaned.get('count') and not cleaned.get('until'):
+            raise forms.ValidationError('Give a number of occurrences or an end date.')
+        parts = [f'FREQ={cleaned["frequency"]}', f'INTERVAL={cleaned["interval"]}']
+        if cleaned.get('weekdays'):
+            parts.append('BYDAY=' + ','.join(cleaned['weekdays']))
+        if cleaned.get('count'):
+            parts.append(f'COUNT={cleaned["count"]}')
+        if cleaned.get('until'):
+            parts.append('UNTIL=' + cleaned['until'].strftime('%Y%m%d'))
+        cleaned['rule'] = parse_rule(';'.join(parts))
+        return cleaned
+
+
+# Free-form repeated GET parameter (?city=Toronto&city=Ottawa)
+class MultiValueField(forms.Field):
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if not value:
+            return []
+        if isinstance(value, str):
+            value = [value]
+        return [item.strip() for item in value if item and item.strip()]
+
+
 # SEARCH FORM
 class EventSearchForm(forms.Form):
     query = forms.CharField(
         required=False,
         widget=forms.TextInput(attrs={'placeholder': 'Search events...'})
     )
-    category = forms.ChoiceField(
+    category = forms.MultipleChoiceField(
+        required=False,
+        choices=Event.CATEGORY_CHOICES,
+        widget=forms.CheckboxSelectMultiple,
+    )
+    city = MultiValueField(required=False)
+    when = forms.MultipleChoiceField(
+        required=False,
+        choices=DATE_BUCKETS,
+        widget=forms.CheckboxSelectMultiple,
+    )
+    near = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={'placeholder': 'City or lat,lng'})
+    )
+    radius_km = forms.FloatField(
         required=False,
-        choices=[('', 'All Categories')] + Event.CATEGORY_CHOICES
+        min_value=1,
+        max_value=MAX_RADIUS_KM,
     )
 
 
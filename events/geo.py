@@ -0,0 +1,217 @@
+"""
+Offline geocoding and a grid index for "near me" event search.
+
+Locations are resolved against the bundled city table in
+``events/data/cities.csv``; no network geocoder or PostGIS is needed.
+Each geocoded event also stores ``geo_cell``, the id of the fixed-size
+lat/lng grid cell it falls in. A radius or bounding-box search becomes a
+handful of indexed ``geo_cell`` range lookups (one per grid row), and only
+the rows in those cells are distance-checked and sorted.
+"""
+
+import csv
+import math
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+from django.db.models import Q
+
+CITY_TABLE_PATH = Path(__file__).resolve().parent / 'data' / 'cities.csv'
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+# Grid cell size in degrees (about 11 km north-south)
+GRID_DEGREES = 0.1
+GRID_COLUMNS = int(round(360 / GRID_DEGREES))
+
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 500
+
+_COORDINATES_RE = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$')
+
+
+class City:
+    def __init__(self, name, province, latitude, longitude):
+        self.name = name
+        self.province = province
+        self.latitude = latitude
+        self.longitude = longitude
+
+    def __repr__(self):
+        return f'<City {self.name}, {self.province}>'
+
+
+def normalize_place(text):
+    """Lowercase, strip accents and punctuation, and spell 'saint' as 'st'"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = text.replace("'", '').replace('’', '')
+    text = re.sub(r'[^a-z0-9]+', ' ', text).strip()
+    return re.sub(r'\bsaint\b', 'st', text)
+
+
+@lru_cache(maxsize=1)
+def load_city_table():
+    """Return {normalized name or alias: City} from the bundled CSV"""
+    table = {}
+    with open(CITY_TABLE_PATH, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            city = City(row['name'], row['province'], float(row['latitude']), float(row['longitude']))
+            names = [row['name']] + [alias for alias in row['aliases'].split(';') if alias]
+            for name in names:
+                table.setdefault(normalize_place(name), city)
+    return table
+
+
+@lru_cache(maxsize=1)
+def _city_keys_longest_first():
+    return sorted(load_city_table(), key=len, reverse=True)
+
+
+def geocode(*texts):
+    """
+    Resolve free-text locations to a City using the bundled table.
+    Each text is tried in order, first as an exact name and then by
+    looking for known city names inside it. Addresses put the city last,
+    so the match ending furthest right wins ("12 Victoria Park Ave,
+    Toronto" is Toronto), and the longer name breaks ties ("Quebec City"
+    over "Quebec"). Returns None if nothing matches.
+    """
+    table = load_city_table()
+    for text in texts:
+        normalized = normalize_place(text)
+        if not normalized:
+            continue
+        if normalized in table:
+            return table[normalized]
+        padded = f' {normalized} '
+        best = None
+        for key in _city_keys_longest_first():
+            start = padded.rfind(f' {key} ')
+            if start >= 0:
+                rank = (start + len(key), len(key))
+                if best is None or rank > best[0]:
+                    best = (rank, key)
+        if best is not None:
+            return table[best[1]]
+    return None
+
+
+def parse_point(text):
+    """Turn a ?near= value ("Toronto" or "43.65,-79.38") into (lat, lng, label)"""
+    match = _COORDINATES_RE.match(text or '')
+    if match:
+        latitude, longitude = float(match.group(1)), float(match.group(2))
+        if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            return latitude, longitude, f'{latitude:.4f}, {longitude:.4f}'
+        return None
+    city = geocode(text)
+    if city is None:
+        return None
+    return city.latitude, city.longitude, city.name
+
+
+def grid_cell(latitude, longitude):
+    """Id of the GRID_DEGREES cell containing the point"""
+    row = int(math.floor((latitude + 90) / GRID_DEGREES))
+    column = int(math.floor((longitude + 180) / GRID_DEGREES)) % GRID_COLUMNS
+    return row * GRID_COLUMNS + column
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lng, max_lng) enclosing a circle; lng may exceed ±180"""
+    lat_delta = radius_km / KM_PER_DEGREE_LAT
+    min_lat = max(-90.0, latitude - lat_delta)
+    max_lat = min(90.0, latitude + lat_delta)
+
+    widest = max(abs(min_lat), abs(max_lat))
+    cos_lat = math.cos(math.radians(widest))
+    if cos_lat < 1e-6:
+        return min_lat, max_lat, -180.0, 180.0
+    lng_delta = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+    if lng_delta >= 180:
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, longitude - lng_delta, longitude + lng_delta
+
+
+def _column_ranges(min_lng, max_lng):
+    """Inclusive grid column ranges for a longitude span, split at the antimeridian"""
+    if max_lng - min_lng >= 360:
+        return [(0, GRID_COLUMNS - 1)]
+    first = int(math.floor((min_lng + 180) / GRID_DEGREES)) % GRID_COLUMNS
+    last = int(math.floor((max_lng + 180) / GRID_DEGREES)) % GRID_COLUMNS
+    if first <= last:
+        return [(first, last)]
+    return [(first, GRID_COLUMNS - 1), (0, last)]
+
+
+def bbox_filter(min_lat, max_lat, min_lng, max_lng, prefix=''):
+    """
+    Q object selecting rows whose geo_cell lies in the box. Every grid row
+    contributes one contiguous geo_cell range, so the lookup stays on the
+    index. The exact lat/lng bounds trim the partial cells at the edges.
+    """
+    first_row = int(math.floor((min_lat + 90) / GRID_DEGREES))
+    last_row = int(math.floor((max_lat + 90) / GRID_DEGREES))
+    column_ranges = _column_ranges(min_lng, max_lng)
+
+    cells = Q()
+    for row in range(first_row, last_row + 1):
+        base = row * GRID_COLUMNS
+        for first, last in column_ranges:
+            cells |= Q(**{f'{prefix}geo_cell__range': (base + first, base + last)})
+
+    bounds = Q(**{f'{prefix}latitude__gte': min_lat, f'{prefix}latitude__lte': max_lat})
+    if max_lng - min_lng < 360:
+        if min_lng < -180:
+            bounds &= Q(**{f'{prefix}longitude__gte': min_lng + 360}) | Q(**{f'{prefix}longitude__lte': max_lng})
+        elif max_lng > 180:
+            bounds &= Q(**{f'{prefix}longitude__gte': min_lng}) | Q(**{f'{prefix}longitude__lte': max_lng - 360})
+        else:
+            bounds &= Q(**{f'{prefix}longitude__gte': min_lng, f'{prefix}longitude__lte': max_lng})
+    return cells & bounds
+
+
+def radius_filter(latitude, longitude, radius_km, prefix=''):
+    """Q object for the grid cells covering a circle (a superset of it)"""
+    return bbox_filter(*bounding_box(latitude, longitude, radius_km), prefix=prefix)
+
+
+def sort_by_distance(objects, latitude, longitude, radius_km):
+    """
+    Attach distance_km to each candidate, drop those outside the circle and
+    return the rest nearest first.
+    """
+    nearby = []
+    for obj in objects:
+        obj.distance_km = haversine_km(latitude, longitude, obj.latitude, obj.longitude)
+        if obj.distance_km <= radius_km:
+            nearby.append(obj)
+    nearby.sort(key=lambda obj: obj.distance_km)
+    return nearby
+
+
+def apply_geocode(instance, *texts, set_city=False):
+    """
+    Set latitude/longitude (and geo_cell where the model has one) from the
+    first text that resolves, clearing them when none does. With
+    set_city=True the canonical city name is stored as well.
+    """
+    city = geocode(*texts)
+    instance.latitude = city.latitude if city else None
+    instance.longitude = city.longitude if city else None
+    if hasattr(instance, 'geo_cell'):
+        instance.geo_cell = grid_cell(city.latitude, city.longitude) if city else None
+    if set_city:
+        instance.city = city.name if city else ''
+    return city
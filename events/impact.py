@@ -0,0 +1,141 @@
+"""
+Environmental impact estimates and their precomputed totals.
+
+Each category has its own per-attendee coefficients (from the registry in
+events.categories, plus IMPACT_COEFFICIENTS in settings to adjust them). An event's impact is
+coefficient x attendees, unless its organizer filed an
+EventImpactReport. Any reported figure replaces the estimate for that
+event, and is shared equally among its attendees.
+
+Attendees are the Attendance ledger (events.attendance): door check-ins
+where the door was used, confirmed registrations otherwise, recorded
+once the event has ended (end_date included). Impact therefore counts
+the same people as total_events_attended, and an event counts once it
+has been closed by close_past_events.
+
+rebuild_impact_summary() computes platform, organizer, city and volunteer
+totals in one pass. That is one grouped query over closed events
+(attendee counts plus reports) and one streamed query over their
+ledger rows. The results are written to ImpactSummary.
+Dashboards and the home banner then read a single row (the platform row
+via the cache) instead of aggregating on every page view.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .categories import CATEGORIES, UNKNOWN
+from .metrics import record_cache
+from .models import Attendance, Event, ImpactSummary
+
+IMPACT_METRICS = ('trees_planted', 'co2_saved_kg', 'waste_collected_kg', 'hours_volunteered')
+
+# Per attendee of a finished event (from the category registry)
+CATEGORY_IMPACT = {key: category.impact for key, category in CATEGORIES.items()}
+
+# Categories without coefficients get the old flat per-event estimate
+DEFAULT_IMPACT = UNKNOWN.impact
+
+PLATFORM_CACHE_KEY = 'impact:platform'
+
+
+def coefficients(category):
+    overrides = getattr(settings, 'IMPACT_COEFFICIENTS', {})
+    return {**CATEGORY_IMPACT.get(category, DEFAULT_IMPACT), **overrides.get(category, {})}
+
+
+def estimate(attendances):
+    """Impact of ``attendances`` event attendances with the default coefficients"""
+    return {metric: DEFAULT_IMPACT[metric] * attendances for metric in IMPACT_METRICS}
+
+
+def event_impact(category, attendees, report=None):
+    """Total impact of one event: reported figures where given, else the estimate"""
+    rates = coefficients(category)
+    report = report or {}
+    return {
+        metric: report[metric] if report.get(metric) is not None else rates[metric] * attendees
+        for metric in IMPACT_METRICS
+    }
+
+
+def _empty():
+    return {'events': 0, 'attendees': 0, **{metric: 0.0 for metric in IMPACT_METRICS}}
+
+
+def compute_impact(now=None):
+    """{(scope, key): totals} for every scope, from active events closed by ``now``"""
+    now = now or timezone.now()
+    closed = Q(attendance_closed_at__lte=now, is_active=True)
+    report_fields = [f'impact_report__{metric}' for metric in IMPACT_METRICS]
+    rows = (
+        Event.objects.filter(closed)
+        .annotate(attendees=Count('attendances'))
+        .values('id', 'category', 'organizer_id', 'city', 'attendees', *report_fields)
+    )
+
+    totals = defaultdict(_empty)
+    per_attendee = {}
+    for row in rows.iterator(chunk_size=2000):
+        report = {metric: row[f'impact_report__{metric}'] for metric in IMPACT_METRICS}
+        if not row['attendees'] and all(value is None for value in report.values()):
+            continue
+        impact = event_impact(row['category'], row['attendees'], report)
+        scopes = [('platform', ''), ('organizer', str(row['organizer_id']))]
+        if row['city']:
+            scopes.append(('city', row['city']))
+        for scope in scopes:
+            entry = totals[scope]
+            entry['events'] += 1
+            entry['attendees'] += row['attendees']
+            for metric in IMPACT_METRICS:
+                entry[metric] += impact[metric]
+        if row['attendees']:
+            per_attendee[row['id']] = {metric: impact[metric] / row['attendees'] for metric in IMPACT_METRICS}
+
+    attendances = Attendance.objects.filter(
+        event__attendance_closed_at__lte=now, event__is_active=True,
+    ).values_list('volunteer_id', 'event_id')
+    for volunteer_id, event_id in attendances.iterator(chunk_size=5000):
+        share = per_attendee.get(event_id)
+        if share is None:
+            continue
+        entry = totals[('volunteer', str(volunteer_id))]
+        entry['events'] += 1
+        entry['attendees'] += 1
+        for metric in IMPACT_METRICS:
+            entry[metric] += share[metric]
+    return totals
+
+
+def rebuild_impact_summary(now=None, batch_size=1000):
+    """Replace the ImpactSummary table; returns the row count per scope"""
+    totals = compute_impact(now)
+    summaries = [ImpactSummary(scope=scope, key=key, **values) for (scope, key), values in totals.items()]
+    with transaction.atomic():
+        ImpactSummary.objects.all().delete()
+        ImpactSummary.objects.bulk_create(summaries, batch_size=batch_size)
+    cache.delete(PLATFORM_CACHE_KEY)
+
+    counts = {scope: 0 for scope, _ in ImpactSummary.SCOPE_CHOICES}
+    for scope, _ in totals:
+        counts[scope] += 1
+    return counts
+
+
+def summary_query(scope, key=''):
+    return ImpactSummary.objects.filter(scope=scope, key=str(key))
+
+
+async def aplatform_impact():
+    """Platform totals for the home banner: a cache hit, or one indexed row"""
+    summary = record_cache('impact', await cache.aget(PLATFORM_CACHE_KEY))
+    if summary is None:
+        summary = await summary_query('platform').afirst() or False
+        await cache.aset(PLATFORM_CACHE_KEY, summary, getattr(settings, 'IMPACT_CACHE_SECONDS', 3600))
+    return summary or None
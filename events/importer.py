@@ -0,0 +1,187 @@
+"""
+Bulk event import and recurring-series cloning for organizers.
+
+import_events() takes rows parsed from CSV or JSONL and validates every
+row before writing anything. File-level problems such as unknown columns
+are reported once, not per row. Each row then goes through EventForm.
+Duplicate (title, start) pairs are checked against the file and against
+the organizer's existing events in a single query. Valid rows are
+geocoded (bulk_create skips the pre_save signal) and inserted with
+bulk_create in one transaction.
+
+clone_event() copies an event across a recurrence rule (events.recurrence)
+in one transaction, keeping each copy's duration.
+"""
+
+import csv
+import io
+import json
+
+from django.db import transaction
+
+from .forms import EventForm
+from .geo import apply_geocode
+from .models import Event
+from .recurrence import occurrences
+
+IMPORT_FIELDS = [name for name in EventForm.Meta.fields if name != 'cover_image']
+REQUIRED_COLUMNS = {'title', 'description', 'category', 'location', 'date', 'capacity'}
+
+# Upper bound on rows per import, to keep one request/transaction bounded
+MAX_IMPORT_ROWS = 2000
+
+_TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on'}
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = []
+        self.errors = {}          # row number -> {field: [messages]}
+        self.file_errors = []
+        self.total = 0
+
+    @property
+    def ok(self):
+        return not self.errors and not self.file_errors
+
+    def add_error(self, row_number, field, message):
+        self.errors.setdefault(row_number, {}).setdefault(field, []).append(message)
+
+
+def read_rows(handle, filename=''):
+    """Rows from a CSV or JSONL file (picked by extension, then by sniffing)"""
+    content = handle.read()
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    name = filename.lower()
+    if name.endswith(('.jsonl', '.ndjson', '.json')) or (not name.endswith('.csv') and content.lstrip().startswith('{')):
+        rows = []
+        for number, line in enumerate(content.splitlines(), start=1):
+            if line.strip():
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f'Line {number} is not valid JSON: {exc.msg}')
+        return rows
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+def _form_data(row):
+    """Normalize a raw row into EventForm data (CSV gives strings, JSONL may not)"""
+    data = {}
+    for field in IMPORT_FIELDS:
+        value = row.get(field)
+        if value is None:
+            continue
+        if field == 'allow_waitlist':
+            # Unchecked checkboxes are absent from form data
+            if value is True or str(value).strip().lower() in _TRUE_VALUES:
+                data[field] = 'on'
+            continue
+        data[field] = str(value).strip()
+    return data
+
+
+def validate_rows(rows, organizer):
+    """Validate all rows; returns (ImportResult, [unsaved Event])"""
+    result = ImportResult()
+    result.total = len(rows)
+    if not rows:
+        result.file_errors.append('The file has no rows.')
+        return result, []
+    if len(rows) > MAX_IMPORT_ROWS:
+        result.file_errors.append(f'At most {MAX_IMPORT_ROWS} rows can be imported at once.')
+        return result, []
+
+    if any(not isinstance(row, dict) for row in rows):
+        result.file_errors.append('Every row must be an object with event fields.')
+        return result, []
+    columns = set().union(*(row.keys() for row in rows))
+    unknown = sorted(columns - set(IMPORT_FIELDS))
+    if unknown:
+        result.file_errors.append(f'Unknown columns: {", ".join(unknown)}')
+    missing = sorted(REQUIRED_COLUMNS - columns)
+    if missing:
+        result.file_errors.append(f'Missing required columns: {", ".join(missing)}')
+    if result.file_errors:
+        return result, []
+
+    candidates = []
+    for number, row in enumerate(rows, start=1):
+        form = EventForm(data=_form_data(row))
+        if not form.is_valid():
+            for field, messages in form.errors.items():
+                for message in messages:
+                    result.add_error(number, field, message)
+            continue
+        event = form.save(commit=False)
+        event.organizer = organizer
+        if event.end_date and event.end_date < event.date:
+            result.add_error(number, 'end_date', 'End date must be after the start date.')
+            continue
+        candidates.append((number, event))
+
+    # Duplicates within the file and against existing events, in one query
+    seen = {}
+    existing = set(
+        Event.objects.filter(
+            organizer=organizer,
+            title__in={event.title for _, event in candidates},
+            date__in={event.date for _, event in candidates},
+        ).values_list('title', 'date')
+    )
+    events = []
+    for number, event in candidates:
+        key = (event.title, event.date)
+        if key in existing:
+            result.add_error(number, 'title', 'You already have an event with this title at this time.')
+        elif key in seen:
+            result.add_error(number, 'title', f'Duplicate of row {seen[key]}.')
+        else:
+            seen[key] = number
+            events.append(event)
+    return result, events
+
+
+def import_events(rows, organizer, dry_run=False, skip_invalid=False, batch_size=500):
+    """
+    Validate and insert events. Nothing is written if any row is invalid,
+    unless skip_invalid is set, in which case only the valid rows are.
+    """
+    result, events = validate_rows(rows, organizer)
+    if result.file_errors or (result.errors and not skip_invalid) or dry_run:
+        return result
+
+    for event in events:
+        apply_geocode(event, event.location, event.address, set_city=True)
+    with transaction.atomic():
+        result.created = Event.objects.bulk_create(events, batch_size=batch_size)
+    return result
+
+
+_CLONED_FIELDS = [
+    'title', 'description', 'category', 'location', 'address', 'city', 'latitude', 'longitude',
+    'geo_cell', 'capacity', 'allow_waitlist', 'cover_image', 'is_active', 'organizer_id',
+]
+
+
+def clone_event(event, rule, batch_size=500):
+    """
+    Copy ``event`` to every later occurrence of ``rule`` (the event itself
+    is the first occurrence). Returns the created events.
+    """
+    duration = event.end_date - event.date if event.end_date else None
+    existing = set(
+        Event.objects.filter(organizer_id=event.organizer_id, title=event.title).values_list('date', flat=True)
+    )
+    clones = []
+    for start in occurrences(rule, event.date):
+        if start == event.date or start in existing:
+            continue
+        clone = Event(**{field: getattr(event, field) for field in _CLONED_FIELDS})
+        clone.date = start
+        clone.end_date = start + duration if duration is not None else None
+        clones.append(clone)
+
+    with transaction.atomic():
+        return Event.objects.bulk_create(clones, batch_size=batch_size)
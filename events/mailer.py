@@ -0,0 +1,35 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.mail import send_mail
+
+from .metrics import EMAILS_FAILED, EMAILS_SENT
+from .tracing import run_in_context
+
+logger = logging.getLogger(__name__)
+
+# SMTP round trips happen here instead of on request/worker threads
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='greenevents-mail')
+
+
+def _log_failure(future):
+    exc = future.exception()
+    if exc is not None:
+        logger.error('Error sending email: %s', exc)
+        EMAILS_FAILED.inc(source='web')
+    elif future.result():
+        EMAILS_SENT.inc(future.result(), source='web')
+    else:
+        # fail_silently=True swallowed the error and reported 0 sent
+        EMAILS_FAILED.inc(source='web')
+
+
+def send_mail_in_background(subject, message, from_email, recipient_list, **kwargs):
+    """
+    Hand a send_mail() call to the mail thread pool and return immediately.
+    Works from both sync and async views; failures are logged, not raised.
+    The send continues the caller's trace (events.tracing), if any.
+    """
+    future = _executor.submit(run_in_context(send_mail), subject, message, from_email, recipient_list, **kwargs)
+    future.add_done_callback(_log_failure)
+    return future
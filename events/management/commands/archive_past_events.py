@@ -0,0 +1,39 @@
+"""
+Django Management Command: Archive Past Events
+Place this file in: events/management/commands/archive_past_events.py
+
+Moves every event that has ended off the home listing and onto the
+archive page (see events.archive). Past events stay in the database with
+their registrations and impact; the listing just stops reading them.
+Run it every few minutes or hourly (e.g. from cron). The first run
+archives the whole backlog, in batches.
+
+Usage: python manage.py archive_past_events
+       python manage.py archive_past_events --batch-size 500
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from events.archive import BATCH_SIZE, archive_finished_events, listed_events
+
+
+class Command(BaseCommand):
+    help = 'Archives events that have ended so the home listing only reads upcoming ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help=f'Events per UPDATE (default: {BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        start = time.perf_counter()
+
+        self.stdout.write('🗄️  Archiving finished events...')
+        archived = archive_finished_events(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Archived {archived} events in {time.perf_counter() - start:.2f}s; '
+            f'{listed_events().count()} upcoming events listed'
+        ))
@@ -0,0 +1,130 @@
+"""
+Django Management Command: Benchmark reminder email throughput
+Place this file in: events/management/commands/benchmark_reminders.py
+
+Seeds a throwaway test database with N events starting in 30 minutes and
+M confirmed registrations each, points Django's SMTP backend at a local
+SMTP sink (events.smtp_sink) and times send_event_reminders end to end.
+Every event is inside both the 12-hour and the 1-hour window, so one run
+sends 2 x N x M messages. Nothing leaves the machine.
+
+Usage: python manage.py benchmark_reminders --events 20 --registrations 50 --runs 3
+       python manage.py benchmark_reminders --smtp-delay-ms 5 --output reminders.json
+"""
+
+import io
+import platform
+import statistics
+import time
+
+import django
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from django.utils import timezone
+
+from events.benchmarks import (
+    QueryCounter, compare_results, is_regression, load_report, save_report, seed_reminder_events,
+)
+from events.smtp_sink import SMTPSink
+
+REMINDER_METRICS = ('seconds', 'messages_per_s', 'connections', 'queries')
+
+
+class Command(BaseCommand):
+    help = 'Times send_event_reminders against a local SMTP sink and reports messages/s, connections and queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=20,
+                            help='Events to seed (default: 20)')
+        parser.add_argument('--registrations', type=int, default=50,
+                            help='Confirmed registrations per event (default: 50)')
+        parser.add_argument('--runs', type=int, default=3,
+                            help='Times to run the reminder command; the median is reported (default: 3)')
+        parser.add_argument('--smtp-delay-ms', type=float, default=0,
+                            help='Simulated server time per message in the sink (default: 0)')
+        parser.add_argument('--output',
+                            help='Write the results to this JSON file')
+        parser.add_argument('--baseline',
+                            help='Compare against a JSON file from an earlier run')
+
+    def handle(self, *args, **options):
+        if options['events'] < 1 or options['registrations'] < 1 or options['runs'] < 1:
+            raise CommandError('--events, --registrations and --runs must be at least 1')
+        baseline = load_report(options['baseline']) if options['baseline'] else None
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            seed_reminder_events(options['events'], options['registrations'])
+            expected = 2 * options['events'] * options['registrations']
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Seeded {options["events"]} events x {options["registrations"]} registrations '
+                f'({expected} reminders per run)'
+            ))
+
+            counter = QueryCounter()
+            runs = []
+            with SMTPSink(delay=options['smtp_delay_ms'] / 1000) as sink:
+                self.stdout.write(f'📮 SMTP sink listening on {sink.host}:{sink.port}')
+                with override_settings(**sink.email_settings()):
+                    for number in range(1, options['runs'] + 1):
+                        sink.reset()
+                        start = time.perf_counter()
+                        with counter.measure():
+                            call_command('send_event_reminders', stdout=io.StringIO())
+                        elapsed = time.perf_counter() - start
+                        run = {
+                            'seconds': round(elapsed, 4),
+                            'messages': sink.messages,
+                            'messages_per_s': round(sink.messages / elapsed, 1),
+                            'connections': sink.connections,
+                            'queries': counter.last,
+                            'bytes': sink.bytes,
+                        }
+                        runs.append(run)
+                        self.stdout.write(
+                            f'⏱️  Run {number}: {run["messages"]} messages in {elapsed:.2f}s '
+                            f'({run["messages_per_s"]:.1f}/s), {run["connections"]} connections, '
+                            f'{run["queries"]} queries'
+                        )
+                        if sink.messages != expected:
+                            self.stdout.write(self.style.WARNING(
+                                f'⚠️  Expected {expected} messages, the sink received {sink.messages}'
+                            ))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        median = sorted(runs, key=lambda run: run['seconds'])[len(runs) // 2]
+        result = dict(median, seconds_stdev=round(statistics.pstdev(run['seconds'] for run in runs), 4))
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'events': options['events'],
+            'registrations_per_event': options['registrations'],
+            'smtp_delay_ms': options['smtp_delay_ms'],
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'runs': runs,
+            'journeys': {'send_event_reminders': result},
+        }
+
+        self.stdout.write(self.style.SUCCESS('\n' + '='*60))
+        self.stdout.write(f'📨 Messages:    {result["messages"]}')
+        self.stdout.write(f'⚡ Throughput:  {result["messages_per_s"]:.1f} messages/s')
+        self.stdout.write(f'🔌 Connections: {result["connections"]}')
+        self.stdout.write(f'🗃️  Queries:     {result["queries"]}')
+        self.stdout.write(self.style.SUCCESS('='*60 + '\n'))
+
+        if baseline is not None:
+            diff = compare_results(report, baseline, metrics=REMINDER_METRICS)
+            for metric, (before, after, change) in diff.get('send_event_reminders', {}).items():
+                text = f'📊 {metric}: {before:g} → {after:g} ({change:+.1f}%)'
+                self.stdout.write(self.style.WARNING(text) if is_regression(metric, change) else text)
+        if options['output']:
+            save_report(options['output'], report)
+            self.stdout.write(self.style.SUCCESS(f'💾 Results written to {options["output"]}'))
@@ -0,0 +1,204 @@
+"""
+Django Management Command: Benchmark event card rendering
+Place this file in: events/management/commands/benchmark_rendering.py
+
+Renders pages of 20 to 100 home-page event cards and reports the cost per
+page and per card. It compares the current card (category registry
+lookup, events/includes/event_card.html) with the previous card (an
+eight-branch {% if event.category == ... %} chain), each with and
+without the cached template loader. Events are built in memory, so no
+database time is included.
+
+Usage: python manage.py benchmark_rendering
+       python manage.py benchmark_rendering --cards 20 50 100 --runs 200 --output rendering.json
+"""
+
+import gc
+import platform
+import time
+from datetime import timedelta
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.template import Context, Engine, engines
+from django.utils import timezone
+
+from events.benchmarks import save_report
+from events.categories import CATEGORY_LIST
+from events.models import Event
+
+# The home page card before the category registry, kept for comparison
+LEGACY_CARD = """
+<div class="card fade-in">
+    <!-- Event Image with Unsplash placeholders -->
+    {% if event.cover_image %}
+        <img src="{{ event.cover_image.url }}" class="card-img-top" alt="{{ event.title }}">
+    {% else %}
+        {% if event.category == 'tree_planting' %}
+            <img src="https://images.unsplash.com/photo-1542601906990-b4d3fb778b09?w=500&h=280&fit=crop" class="card-img-top" alt="Tree Planting">
+        {% elif event.category == 'beach_cleanup' %}
+            <img src="https://images.unsplash.com/photo-1559827260-dc66d52bef19?w=500&h=280&fit=crop" class="card-img-top" alt="Beach Cleanup">
+        {% elif event.category == 'recycling' %}
+            <img src="https://images.unsplash.com/photo-1532996122724-e3c354a0b15b?w=500&h=280&fit=crop" class="card-img-top" alt="Recycling">
+        {% elif event.category == 'e_waste' %}
+            <img src="https://images.unsplash.com/photo-1550009158-9ebf69173e03?w=500&h=280&fit=crop" class="card-img-top" alt="E-Waste">
+        {% elif event.category == 'community_garden' %}
+            <img src="https://images.unsplash.com/photo-1464226184884-fa280b87c399?w=500&h=280&fit=crop" class="card-img-top" alt="Community Garden">
+        {% elif event.category == 'workshop' %}
+            <img src="https://images.unsplash.com/photo-1540575467063-178a50c2df87?w=500&h=280&fit=crop" class="card-img-top" alt="Workshop">
+        {% elif event.category == 'conservation' %}
+            <img src="https://images.unsplash.com/photo-1437622368342-7a3d73a34c8f?w=500&h=280&fit=crop" class="card-img-top" alt="Conservation">
+        {% else %}
+            <img src="https://images.unsplash.com/photo-1472214103451-9374bd1c798e?w=500&h=280&fit=crop" class="card-img-top" alt="Green Event">
+        {% endif %}
+    {% endif %}
+
+    <div class="card-body">
+        <div class="mb-3">
+            <span class="badge bg-success">{{ event.get_category_display }}</span>
+        </div>
+
+        <h5 class="card-title">{{ event.title }}</h5>
+        <p class="card-text">{{ event.description|truncatewords:22 }}</p>
+
+        <div class="mt-3" style="font-size: 0.9rem;">
+            <div class="mb-2">
+                <strong>📍</strong> {{ event.location }}
+                {% if near_label %}<small class="text-muted">· {{ event.distance_km|floatformat:1 }} km away</small>{% endif %}
+            </div>
+            <div class="mb-2">
+                <strong>📅</strong> {{ event.date|date:"M d, Y" }} at {{ event.date|date:"g:i A" }}
+            </div>
+            <div>
+                <strong>👥</strong>
+                {% if event.spots_remaining > 0 %}
+                    <span style="color: #00d084;">{{ event.spots_remaining }} spot{{ event.spots_remaining|pluralize }} left</span>
+                {% else %}
+                    <span style="color: #ef4444;">Event Full</span>
+                {% endif %}
+            </div>
+        </div>
+    </div>
+
+    <div class="card-footer bg-transparent border-0 p-3 pt-0">
+        <a href="{% url 'event_detail' event.id %}" class="btn btn-outline-success w-100">
+            View Details →
+        </a>
+    </div>
+</div>
+"""
+
+PAGES = {
+    'legacy': '{% for event in events %}' + LEGACY_CARD + '{% endfor %}',
+    'registry': "{% for event in events %}{% include 'events/includes/event_card.html' %}{% endfor %}",
+}
+
+
+def make_engine(cached):
+    """A template engine like the site's, with or without the cached loader"""
+    site = engines['django'].engine
+    loaders = [
+        ('django.template.loaders.locmem.Loader', {f'bench/{name}.html': source for name, source in PAGES.items()}),
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]
+    if cached:
+        loaders = [('django.template.loaders.cached.Loader', loaders)]
+    return Engine(dirs=site.dirs, loaders=loaders, libraries=site.libraries, builtins=site.builtins)
+
+
+def make_events(count):
+    now = timezone.now()
+    events = []
+    for i in range(count):
+        event = Event(
+            id=i + 1,
+            title=f'Benchmark Event {i + 1}',
+            description='Join us for a morning of hands-on work in the neighbourhood. ' * 4,
+            category=CATEGORY_LIST[i % len(CATEGORY_LIST)].key,
+            location='Windsor',
+            date=now + timedelta(days=i),
+            capacity=30,
+        )
+        # What the listing query annotates, so spots_remaining doesn't query
+        event.confirmed_count = i % 31
+        events.append(event)
+    return events
+
+
+def time_page(engine, name, events, runs):
+    """Fastest of ``runs`` loads and renders of one page, in seconds"""
+    context = {'events': events, 'near_label': None}
+    engine.get_template(name).render(Context(context))  # warm up
+    samples = []
+    # Keep collector pauses out of the samples
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            engine.get_template(name).render(Context(context))
+            samples.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return min(samples)
+
+
+class Command(BaseCommand):
+    help = 'Times event card rendering: category registry vs if-chain, cached vs uncached loader'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, nargs='+', default=[20, 50, 100],
+                            help='Cards per page to measure (default: 20 50 100)')
+        parser.add_argument('--runs', type=int, default=100,
+                            help='Renders per measurement; the fastest is reported (default: 100)')
+        parser.add_argument('--output',
+                            help='Write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1 or min(options['cards']) < 1:
+            raise CommandError('--cards and --runs must be at least 1')
+
+        engines_by_loader = {'uncached': make_engine(False), 'cached': make_engine(True)}
+        variants = [(card, loader) for card in PAGES for loader in engines_by_loader]
+        results = []
+
+        self.stdout.write('🎨 Rendering event cards...')
+        for count in options['cards']:
+            events = make_events(count)
+            for card, loader in variants:
+                seconds = time_page(engines_by_loader[loader], f'bench/{card}.html', events, options['runs'])
+                result = {
+                    'cards': count,
+                    'card': card,
+                    'loader': loader,
+                    'ms_per_page': round(seconds * 1000, 3),
+                    'us_per_card': round(seconds / count * 1e6, 2),
+                }
+                results.append(result)
+                self.stdout.write(
+                    f'   {count:>4} cards  {card:<8} {loader:<8}  '
+                    f'{result["ms_per_page"]:>8.2f} ms/page  {result["us_per_card"]:>7.1f} µs/card'
+                )
+
+        self.stdout.write(self.style.SUCCESS('\n' + '='*60))
+        for count in options['cards']:
+            by_variant = {(r['card'], r['loader']): r['us_per_card'] for r in results if r['cards'] == count}
+            before, after = by_variant[('legacy', 'uncached')], by_variant[('registry', 'cached')]
+            self.stdout.write(
+                f'⚡ {count} cards: {before:.1f} → {after:.1f} µs/card '
+                f'({(after - before) / before * 100:+.1f}%, if-chain uncached → registry cached)'
+            )
+        self.stdout.write(self.style.SUCCESS('='*60 + '\n'))
+
+        if options['output']:
+            save_report(options['output'], {
+                'created_at': timezone.now().isoformat(),
+                'runs': options['runs'],
+                'environment': {
+                    'python': platform.python_version(),
+                    'django': django.get_version(),
+                },
+                'results': results,
+            })
+            self.stdout.write(self.style.SUCCESS(f'💾 Results written to {options["output"]}'))
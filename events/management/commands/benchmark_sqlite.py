@@ -0,0 +1,180 @@
+"""
+Django Management Command: Benchmark SQLite under concurrent load
+Place this file in: events/management/commands/benchmark_sqlite.py
+
+Creates two throwaway database files in a temporary directory and runs
+the same mix on each. Writer threads register volunteers (capacity count,
+then insert a registration and a history row, in one transaction), and
+reader threads list events with their registration counts. Each thread
+handles its connection after every operation the way a request does
+(CONN_MAX_AGE). The 'default' file uses SQLite's and Django's defaults.
+The 'tuned' file uses this project's DATABASES options, SQLITE_PRAGMAS
+and events.sqlite.write_transaction. Reports throughput, latency and
+"database is locked" errors for each.
+
+Usage: python manage.py benchmark_sqlite --writers 8 --readers 8 --operations 100
+"""
+
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from events.benchmarks import percentile
+from events.models import Event, EventRegistration, UserHistory
+from events.sqlite import write_transaction
+
+MODES = ('default', 'tuned')
+
+
+class Command(BaseCommand):
+    help = 'Compares default and tuned SQLite settings under parallel writers and readers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8,
+                            help='Threads registering volunteers (default: 8)')
+        parser.add_argument('--readers', type=int, default=8,
+                            help='Threads listing events (default: 8)')
+        parser.add_argument('--operations', type=int, default=100,
+                            help='Operations per thread (default: 100)')
+        parser.add_argument('--events', type=int, default=20,
+                            help='Events to register for (default: 20)')
+
+    def handle(self, *args, **options):
+        if connections[DEFAULT_DB_ALIAS].vendor != 'sqlite':
+            raise CommandError('The default database is not SQLite')
+        if options['writers'] < 1 or options['operations'] < 1:
+            raise CommandError('--writers and --operations must be at least 1')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"🚀 {options['writers']} writers + {options['readers']} readers, "
+            f"{options['operations']} operations each"
+        ))
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for mode in MODES:
+                alias = f'benchmark_{mode}'
+                self.add_database(alias, mode, Path(directory) / f'{mode}.sqlite3')
+                try:
+                    self.stdout.write(f'🗄️  Migrating and seeding the {mode} database...')
+                    call_command('migrate', database=alias, verbosity=0)
+                    volunteers, events = self.seed(alias, options)
+                    self.stdout.write(f'⏱️  Running {mode}...')
+                    results[mode] = self.run(alias, mode, volunteers, events, options)
+                finally:
+                    connections[alias].close()
+                    del connections.settings[alias]
+
+        self.stdout.write(self.style.SUCCESS('\n' + '='*72))
+        for mode, (writes, reads, elapsed, locked) in results.items():
+            self.stdout.write(
+                f'{mode:>8}: {(len(writes) + len(reads)) / elapsed:8.1f} ops/s | '
+                f'write p50 {percentile(writes, 50) * 1000:6.1f} ms p95 {percentile(writes, 95) * 1000:7.1f} ms | '
+                f'read p95 {percentile(reads, 95) * 1000:7.1f} ms | '
+                f'locked {locked}'
+            )
+        self.stdout.write(self.style.SUCCESS('='*72 + '\n'))
+
+    def add_database(self, alias, mode, path):
+        if mode == 'tuned':
+            config = {**settings.DATABASES[DEFAULT_DB_ALIAS], 'NAME': str(path)}
+        else:
+            # SQLite and Django defaults: rollback journal, deferred
+            # transactions, 5 second timeout, a new connection per request
+            config = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path), 'PRAGMAS': {}}
+        for key, value in connections.settings[DEFAULT_DB_ALIAS].items():
+            if key not in ('NAME', 'OPTIONS', 'CONN_MAX_AGE', 'CONN_HEALTH_CHECKS', 'PRAGMAS'):
+                config.setdefault(key, value)
+        config.setdefault('OPTIONS', {})
+        config.setdefault('CONN_MAX_AGE', 0)
+        config.setdefault('CONN_HEALTH_CHECKS', False)
+        connections.settings[alias] = config
+
+    def seed(self, alias, options):
+        password = make_password(None)
+        organizer = User.objects.db_manager(alias).create(username='benchmark_organizer', password=password)
+        volunteers = User.objects.using(alias).bulk_create([
+            User(username=f'benchmark_volunteer_{i}', password=password)
+            for i in range(options['writers'] * options['operations'])
+        ], batch_size=1000)
+        # About half of each event's registrations end up on the waitlist
+        capacity = max(1, len(volunteers) // options['events'] // 2)
+        start = timezone.now() + timedelta(days=7)
+        events = Event.objects.using(alias).bulk_create([
+            Event(
+                title=f'Benchmark event {i}', description='', location='Benchmark Park',
+                date=start, category='cleanup', capacity=capacity, organizer=organizer,
+            )
+            for i in range(options['events'])
+        ])
+        return [user.id for user in volunteers], [(event.id, capacity) for event in events]
+
+    def run(self, alias, mode, volunteers, events, options):
+        writes, reads = [], []
+        locked = [0]
+        guard = threading.Lock()
+        writers, readers, operations = options['writers'], options['readers'], options['operations']
+        begin = threading.Barrier(writers + readers)
+        atomic = write_transaction if mode == 'tuned' else transaction.atomic
+
+        def register(volunteer_id, event):
+            event_id, capacity = event
+            with atomic(using=alias):
+                confirmed = EventRegistration.objects.using(alias).filter(
+                    event_id=event_id, status='confirmed',
+                ).count()
+                EventRegistration.objects.using(alias).create(
+                    event_id=event_id, volunteer_id=volunteer_id,
+                    status='confirmed' if confirmed < capacity else 'waitlist',
+                )
+                UserHistory.objects.using(alias).create(user_id=volunteer_id, event_id=event_id)
+
+        def listing():
+            list(
+                Event.objects.using(alias)
+                .annotate(confirmed=Count('registrations', filter=Q(registrations__status='confirmed')))
+                .order_by('date')[:50]
+            )
+
+        def worker(index):
+            is_writer = index < writers
+            samples = []
+            failures = 0
+            begin.wait()
+            for op in range(operations):
+                start = time.perf_counter()
+                try:
+                    if is_writer:
+                        register(volunteers[index * operations + op], events[(index + op) % len(events)])
+                    else:
+                        listing()
+                    samples.append(time.perf_counter() - start)
+                except OperationalError as exc:
+                    if 'locked' not in str(exc):
+                        raise
+                    failures += 1
+                # What request_finished does at the end of each request
+                connections[alias].close_if_unusable_or_obsolete()
+            connections[alias].close()
+            with guard:
+                (writes if is_writer else reads).extend(samples)
+                locked[0] += failures
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(writers + readers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        return writes, reads, elapsed, locked[0]
@@ -0,0 +1,31 @@
+"""
+Django Management Command: Build Recommendations
+Place this file in: events/management/commands/build_recommendations.py
+
+Rebuilds the precomputed "similar events" table from user history and
+registrations. Run it nightly (e.g. from cron).
+
+Usage: python manage.py build_recommendations [--top-k 10]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from events.recommendations import TOP_K, build_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the top-K similar events for every event'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=TOP_K,
+                            help=f'Recommendations stored per event (default: {TOP_K})')
+
+    def handle(self, *args, **options):
+        self.stdout.write('🧮 Building event co-occurrence matrix...')
+        start = time.perf_counter()
+        events, rows = build_recommendations(top_k=options['top_k'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Stored {rows} recommendations for {events} events in {elapsed:.2f}s'
+        ))
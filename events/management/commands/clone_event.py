@@ -0,0 +1,42 @@
+"""
+Django Management Command: Repeat an event on a schedule
+Place this file in: events/management/commands/clone_event.py
+
+Copies an event to every later date of an RRULE-style rule in one
+transaction (see events/recurrence.py for the supported subset).
+
+Usage: python manage.py clone_event 12 --rule "FREQ=WEEKLY;BYDAY=SA;COUNT=10"
+"""
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from events.importer import clone_event
+from events.models import Event
+from events.recurrence import parse_rule
+
+
+class Command(BaseCommand):
+    help = 'Clones an event across a recurring schedule'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_id', type=int)
+        parser.add_argument('--rule', required=True,
+                            help='e.g. "FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH;COUNT=8"')
+
+    def handle(self, *args, **options):
+        try:
+            event = Event.objects.get(pk=options['event_id'])
+        except Event.DoesNotExist:
+            raise CommandError(f"Event {options['event_id']} does not exist")
+        try:
+            rule = parse_rule(options['rule'])
+        except ValidationError as e:
+            raise CommandError('; '.join(e.messages))
+        if not rule.count and not rule.until:
+            raise CommandError('The rule needs COUNT or UNTIL')
+
+        clones = clone_event(event, rule)
+        self.stdout.write(self.style.SUCCESS(f'✅ Created {len(clones)} occurrences of "{event.title}" ({rule})'))
+        for clone in clones:
+            self.stdout.write(f'   📅 {clone.date:%a %b %d, %Y %H:%M}')
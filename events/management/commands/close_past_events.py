@@ -0,0 +1,56 @@
+"""
+Django Management Command: Close Past Events
+Place this file in: events/management/commands/close_past_events.py
+
+Records attendance for every event that has ended (door check-ins, or
+confirmed registrations when nobody was checked in) in the Attendance
+ledger, and updates the affected volunteers' total_events_attended.
+Run it nightly (e.g. from cron).
+
+Usage: python manage.py close_past_events
+       python manage.py close_past_events --event 42    (re-close one event, e.g. after a late check-in sync)
+       python manage.py close_past_events --recount     (also recount every volunteer from the ledger)
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from events.attendance import close_events, close_past_events, ended, refresh_totals
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Records attendance for finished events and updates volunteer totals'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int, action='append', default=[],
+                            help='Re-close this event even if it was closed before (repeatable)')
+        parser.add_argument('--recount', action='store_true',
+                            help='Recount total_events_attended for every volunteer')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        if options['event']:
+            event_ids = list(Event.objects.filter(
+                ended(timezone.now()), id__in=options['event'],
+            ).values_list('id', flat=True))
+            missing = set(options['event']) - set(event_ids)
+            if missing:
+                raise CommandError(f'No finished event with id {", ".join(map(str, sorted(missing)))}')
+            self.stdout.write(f'🔁 Re-closing {len(event_ids)} event(s)...')
+            recorded, volunteers = close_events(event_ids)
+            closed, volunteers = len(event_ids), len(volunteers)
+        else:
+            self.stdout.write('📒 Closing finished events...')
+            closed, recorded, volunteers = close_past_events()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Closed {closed} events: {recorded} attendances recorded, '
+            f'{volunteers} volunteer totals updated in {time.perf_counter() - start:.2f}s'
+        ))
+
+        if options['recount']:
+            self.stdout.write('🔢 Recounting every volunteer from the ledger...')
+            self.stdout.write(self.style.SUCCESS(f'✅ Recounted {refresh_totals()} volunteers'))
@@ -0,0 +1,112 @@
+"""
+Django Management Command: Compare WSGI and ASGI throughput
+Place this file in: events/management/commands/compare_wsgi_asgi.py
+
+Drives the same URLs through the WSGI handler (a thread pool of test
+clients) and the ASGI handler (asyncio tasks sharing one async client) and
+reports throughput and latency for each.
+
+Usage: python manage.py compare_wsgi_asgi --requests 200 --concurrency 16 --path / --path /event/1/
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+
+from events.benchmarks import percentile
+
+
+class Command(BaseCommand):
+    help = 'Load-tests the same views through the WSGI and ASGI handlers and compares throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='URL to request (repeatable, default: /)')
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Requests per handler (default: 200)')
+        parser.add_argument('--concurrency', type=int, default=16,
+                            help='Requests in flight at once (default: 16)')
+        parser.add_argument('--username',
+                            help='Log in as this user before measuring')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/']
+        total = options['requests']
+        concurrency = options['concurrency']
+
+        user = None
+        if options['username']:
+            try:
+                user = User.objects.get(username=options['username'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['username']}' does not exist")
+
+        urls = [paths[i % len(paths)] for i in range(total)]
+
+        # The test clients always send Host: testserver
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+        # Every request comes from one client IP; measure the views, not the throttle
+        settings.RATELIMIT_ENABLED = False
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 {total} requests over {len(paths)} URL(s), concurrency {concurrency}'
+        ))
+        results = {
+            'WSGI': self.run_wsgi(urls, concurrency, user),
+            'ASGI': asyncio.run(self.run_asgi(urls, concurrency, user)),
+        }
+
+        self.stdout.write(self.style.SUCCESS('\n' + '='*60))
+        for name, (latencies, elapsed, errors) in results.items():
+            self.stdout.write(
+                f'{name}: {len(latencies) / elapsed:8.1f} req/s | '
+                f'p50 {percentile(latencies, 50) * 1000:7.1f} ms | '
+                f'p95 {percentile(latencies, 95) * 1000:7.1f} ms | '
+                f'errors {errors}'
+            )
+        self.stdout.write(self.style.SUCCESS('='*60 + '\n'))
+
+    def run_wsgi(self, urls, concurrency, user):
+        """One test client per worker thread, like a threaded WSGI server"""
+        clients = []
+        for _ in range(concurrency):
+            client = Client()
+            if user is not None:
+                client.force_login(user)
+            clients.append(client)
+
+        def fetch(index):
+            client = clients[index % concurrency]
+            start = time.perf_counter()
+            response = client.get(urls[index])
+            return time.perf_counter() - start, response.status_code >= 400
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(fetch, range(len(urls))))
+        elapsed = time.perf_counter() - start
+        return [s[0] for s in samples], elapsed, sum(s[1] for s in samples)
+
+    async def run_asgi(self, urls, concurrency, user):
+        """Requests as tasks on one event loop, like a single ASGI worker"""
+        client = AsyncClient()
+        if user is not None:
+            await sync_to_async(client.force_login)(user)
+        slots = asyncio.Semaphore(concurrency)
+
+        async def fetch(url):
+            async with slots:
+                start = time.perf_counter()
+                response = await client.get(url)
+                return time.perf_counter() - start, response.status_code >= 400
+
+        start = time.perf_counter()
+        samples = await asyncio.gather(*(fetch(url) for url in urls))
+        elapsed = time.perf_counter() - start
+        return [s[0] for s in samples], elapsed, sum(s[1] for s in samples)
@@ -10,6 +10,7 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import timedelta
 import random
+from events.attendance import close_past_events
 from events.models import (
     VolunteerProfile, OrganizerProfile, Event, EventRegistration, UserHistory
 )
@@ -120,6 +121,11 @@ class Command(BaseCommand):
         registrations = self.create_registrations(volunteers, events, 300)
         self.stdout.write(self.style.SUCCESS(f'✅ Created {len(registrations)} registrations'))
 
+        # Record attendance for past events (same rule as the nightly job)
+        self.stdout.write('📒 Closing past events...')
+        closed, attended, _ = close_past_events()
+        self.stdout.write(self.style.SUCCESS(f'✅ Closed {closed} events with {attended} attendances'))
+
         # Generate User History
         self.stdout.write('📊 Creating user history...')
         history_count = self.create_user_history(volunteers, events)
@@ -296,12 +302,6 @@ class Command(BaseCommand):
 
             registrations.append(registration)
 
-            # Update volunteer's total events attended (for past events)
-            if event.date < timezone.now() and status == 'confirmed':
-                profile = volunteer.volunteer_profile
-                profile.total_events_attended += 1
-                profile.save()
-
         return registrations
 
     def create_user_history(self, volunteers, events):
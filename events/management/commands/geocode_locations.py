@@ -0,0 +1,58 @@
+"""
+Django Management Command: Geocode Locations
+Place this file in: events/management/commands/geocode_locations.py
+
+Backfills latitude/longitude (and the grid cell used by "near me" search)
+for events and volunteer profiles from the bundled city table. New and
+edited rows are geocoded on save; this is for existing data.
+
+Usage: python manage.py geocode_locations
+"""
+
+from django.core.management.base import BaseCommand
+from events.geo import apply_geocode
+from events.models import Event, VolunteerProfile
+
+
+class Command(BaseCommand):
+    help = 'Geocodes events and volunteer profiles from the bundled city table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Rows per bulk update (default: 500)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        located, total = self.geocode(
+            Event.objects.only('id', 'location', 'address'),
+            lambda event: apply_geocode(event, event.location, event.address, set_city=True),
+            ['city', 'latitude', 'longitude', 'geo_cell'],
+            batch_size,
+        )
+        self.stdout.write(self.style.SUCCESS(f'📍 Events: {located}/{total} located'))
+
+        located, total = self.geocode(
+            VolunteerProfile.objects.only('id', 'city'),
+            lambda profile: apply_geocode(profile, profile.city),
+            ['latitude', 'longitude'],
+            batch_size,
+        )
+        self.stdout.write(self.style.SUCCESS(f'📍 Volunteers: {located}/{total} located'))
+
+    def geocode(self, queryset, locate, fields, batch_size):
+        """Geocode every row of queryset, saving in bulk batches"""
+        model = queryset.model
+        located = total = 0
+        batch = []
+        for obj in queryset.iterator(chunk_size=batch_size):
+            total += 1
+            if locate(obj) is not None:
+                located += 1
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                model.objects.bulk_update(batch, fields)
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, fields)
+        return located, total
@@ -0,0 +1,71 @@
+"""
+Django Management Command: Bulk import events
+Place this file in: events/management/commands/import_events.py
+
+Validates every row of a CSV or JSONL file with EventForm, reports errors
+per row and creates the events with one bulk insert.
+
+Usage: python manage.py import_events events.csv --organizer organizer_1
+       python manage.py import_events events.jsonl --organizer organizer_1 --dry-run
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from events.importer import import_events, read_rows
+from events.roles import get_user_role
+
+
+class Command(BaseCommand):
+    help = 'Imports events for an organizer from a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with header) or JSONL file')
+        parser.add_argument('--organizer', required=True,
+                            help='Username of the organizer who will own the events')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Validate only, do not create events')
+        parser.add_argument('--skip-invalid', action='store_true',
+                            help='Create the valid rows even if some rows fail')
+
+    def handle(self, *args, **options):
+        try:
+            organizer = User.objects.get(username=options['organizer'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['organizer']}' does not exist")
+        if not get_user_role(organizer).is_organizer:
+            raise CommandError(f"User '{options['organizer']}' is not an organizer")
+
+        try:
+            with open(options['path'], 'rb') as handle:
+                rows = read_rows(handle, options['path'])
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            raise CommandError(f'Could not read {options["path"]}: {e}')
+
+        self.stdout.write(f'📄 Read {len(rows)} rows from {options["path"]}')
+        result = import_events(
+            rows,
+            organizer,
+            dry_run=options['dry_run'],
+            skip_invalid=options['skip_invalid'],
+        )
+
+        for error in result.file_errors:
+            self.stdout.write(self.style.ERROR(f'❌ {error}'))
+        for row, fields in sorted(result.errors.items()):
+            for field, field_errors in fields.items():
+                for error in field_errors:
+                    self.stdout.write(self.style.ERROR(f'❌ Row {row} [{field}]: {error}'))
+
+        valid = result.total - len(result.errors) if not result.file_errors else 0
+        if result.created:
+            self.stdout.write(self.style.SUCCESS(f'✅ Created {len(result.created)} events'))
+        elif options['dry_run'] and not result.file_errors:
+            self.stdout.write(self.style.SUCCESS(f'✅ {valid} of {result.total} rows are valid (dry run)'))
+        else:
+            self.stdout.write(self.style.WARNING('⚠️  No events were created'))
+
+        if result.file_errors:
+            raise CommandError('Invalid file')
+        if result.errors and not options['skip_invalid']:
+            raise CommandError(f'{len(result.errors)} invalid rows')
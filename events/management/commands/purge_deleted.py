@@ -0,0 +1,72 @@
+"""
+Django Management Command: Purge Deleted Events and Users
+Place this file in: events/management/commands/purge_deleted.py
+
+Works through the PurgeJob queue left by deleting events and users (see
+events.deletion). Dependent rows are deleted in short batches, so the
+site keeps writing in between. Progress is saved with every batch, and
+a job that is interrupted or runs out of time carries on next run. Run
+it every few minutes (e.g. from cron).
+
+Usage: python manage.py purge_deleted
+       python manage.py purge_deleted --max-seconds 60 --batch-size 500 --pause 0.05
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from events.deletion import BATCH_SIZE, Purger, pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Deletes the rows of soft-deleted events and users in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help=f'Rows per DELETE (default: {BATCH_SIZE})')
+        parser.add_argument('--max-seconds', type=float,
+                            help='Stop (and resume next run) after this long')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Seconds to sleep between batches (default: 0)')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        start = time.monotonic()
+        deadline = start + options['max_seconds'] if options['max_seconds'] else None
+
+        last_report = [start]
+
+        def progress(job):
+            # At most one line per second
+            if time.monotonic() - last_report[0] >= 1:
+                last_report[0] = time.monotonic()
+                self.stdout.write(f'   … {job.rows_deleted} rows deleted ({job.step})')
+
+        purger = Purger(options['batch_size'], deadline, options['pause'], progress)
+        finished = failed = 0
+        jobs = list(pending_jobs())
+        if not jobs:
+            self.stdout.write('✨ Nothing to purge')
+            return
+
+        for job in jobs:
+            self.stdout.write(f'🗑️  Purging {job.kind} "{job.label}" ({job.rows_deleted} rows deleted so far)...')
+            try:
+                done = purger.run(job)
+            except Exception as exc:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'❌ Failed: {exc!r} (retried next run)'))
+                continue
+            if not done:
+                self.stdout.write(self.style.WARNING(
+                    f'⏸️  Out of time after {job.rows_deleted} rows; resuming next run'
+                ))
+                break
+            finished += 1
+            self.stdout.write(self.style.SUCCESS(f'✅ Done: {job.rows_deleted} rows deleted'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n📊 {finished} of {len(jobs)} jobs finished, {failed} failed, '
+            f'in {time.monotonic() - start:.2f}s'
+        ))
@@ -0,0 +1,36 @@
+"""
+Django Management Command: Rebuild Impact Summary
+Place this file in: events/management/commands/rebuild_impact.py
+
+Recomputes platform, organizer, city and volunteer impact totals from
+the attendance ledger of closed events (per-category estimates and
+organizer reports) into the ImpactSummary table. Run it hourly or
+nightly (e.g. from cron), after close_past_events.
+
+Usage: python manage.py rebuild_impact
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from events.impact import rebuild_impact_summary, summary_query
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the precomputed environmental impact totals'
+
+    def handle(self, *args, **options):
+        self.stdout.write('🌍 Computing impact totals...')
+        start = time.perf_counter()
+        counts = rebuild_impact_summary()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            '✅ Stored ' + ', '.join(f'{count} {scope}' for scope, count in counts.items()) + f' rows in {elapsed:.2f}s'
+        ))
+
+        platform = summary_query('platform').first()
+        if platform is not None:
+            self.stdout.write(
+                f'   🌳 {platform.trees_planted:,.0f} trees • ☁️ {platform.co2_saved_kg:,.0f} kg CO₂ • '
+                f'♻️ {platform.waste_collected_kg:,.0f} kg waste • ⏰ {platform.hours_volunteered:,.0f} h'
+            )
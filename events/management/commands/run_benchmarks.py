@@ -0,0 +1,237 @@
+"""
+Django Management Command: Benchmark the core user journeys
+Place this file in: events/management/commands/run_benchmarks.py
+
+Seeds a throwaway test database at the requested scale (using the
+generate_dummy_data pools), drives the main journeys through the Django
+test client and reports p50/p95/p99 latency, queries per request and
+throughput for each. Results are written as JSON; pass a previous file
+with --baseline to print the change per metric.
+
+Usage: python manage.py run_benchmarks --scale 10 --iterations 100 --output bench.json
+       python manage.py run_benchmarks --scale 10 --baseline bench.json
+"""
+
+import itertools
+import platform
+import random
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from events.benchmarks import (
+    QueryCounter, Stopwatch, compare_results, is_regression, load_report, save_report, seed_dataset,
+)
+from events.models import Event, EventRegistration
+
+JOURNEYS = [
+    'home',
+    'home_search',
+    'home_paginate',
+    'home_near',
+    'event_detail',
+    'register_burst',
+    'volunteer_profile',
+    'organizer_profile',
+]
+
+
+class Command(BaseCommand):
+    help = 'Seeds a test database and benchmarks the home, event, registration and profile journeys'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1,
+                            help='Multiple of generate_dummy_data volumes to seed (default: 1)')
+        parser.add_argument('--iterations', type=int, default=50,
+                            help='Requests per journey (default: 50)')
+        parser.add_argument('--burst-size', type=int, default=10,
+                            help='Back-to-back registrations per event in register_burst (default: 10)')
+        parser.add_argument('--journey', action='append', dest='journeys', choices=JOURNEYS,
+                            help='Only run this journey (repeatable, default: all)')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Random seed for data and request mix (default: 0)')
+        parser.add_argument('--output',
+                            help='Write the results to this JSON file')
+        parser.add_argument('--baseline',
+                            help='Compare against a JSON file from an earlier run')
+        parser.add_argument('--current-db', action='store_true',
+                            help='Benchmark the configured database as-is instead of seeding a test database')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+        baseline = load_report(options['baseline']) if options['baseline'] else None
+        journeys = options['journeys'] or JOURNEYS
+
+        # locmem email backend, Host: testserver allowed
+        setup_test_environment()
+        # The journeys replay bursts from one client; measure the views, not the throttle
+        settings.RATELIMIT_ENABLED = False
+        old_config = None
+        try:
+            if not options['current_db']:
+                self.stdout.write('🗄️  Creating test database...')
+                old_config = setup_databases(verbosity=0, interactive=False)
+                counts = seed_dataset(scale=options['scale'], seed=options['seed'])
+                self.stdout.write(self.style.SUCCESS(
+                    '✅ Seeded ' + ', '.join(f'{count} {name}' for name, count in counts.items())
+                ))
+            else:
+                counts = {}
+
+            self.rng = random.Random(options['seed'])
+            self.counter = QueryCounter()
+            results = {}
+            for name in journeys:
+                self.stdout.write(f'⏱️  {name}...')
+                stopwatch = Stopwatch(self.counter)
+                getattr(self, f'journey_{name}')(stopwatch, options)
+                results[name] = stopwatch.summary()
+        finally:
+            if old_config is not None:
+                teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'scale': options['scale'],
+            'iterations': options['iterations'],
+            'seeded': counts,
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': settings.DATABASES['default']['ENGINE'],
+            },
+            'journeys': results,
+        }
+
+        self.print_results(results)
+        if baseline is not None:
+            self.print_comparison(compare_results(report, baseline))
+        if options['output']:
+            save_report(options['output'], report)
+            self.stdout.write(self.style.SUCCESS(f'💾 Results written to {options["output"]}'))
+
+    # ---- journeys ----
+
+    def _client(self, user=None):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        return client
+
+    def _volunteers(self):
+        return list(User.objects.filter(volunteer_profile__isnull=False).order_by('id')[:200])
+
+    def _organizers(self):
+        return list(User.objects.filter(organizer_profile__isnull=False).order_by('id')[:200])
+
+    def _upcoming_event_ids(self):
+        return list(Event.objects.filter(date__gte=timezone.now(), is_active=True).values_list('id', flat=True))
+
+    def journey_home(self, stopwatch, options):
+        client = self._client()
+        for _ in range(options['iterations']):
+            stopwatch.time(client.get, reverse('home'))
+
+    def journey_home_search(self, stopwatch, options):
+        client = self._client()
+        categories = [key for key, _ in Event.CATEGORY_CHOICES]
+        words = ['Cleanup', 'Workshop', 'Garden', 'Tree', 'Recycling']
+        for _ in range(options['iterations']):
+            params = {'query': self.rng.choice(words), 'category': self.rng.sample(categories, 2)}
+            stopwatch.time(client.get, reverse('home'), params)
+
+    def journey_home_paginate(self, stopwatch, options):
+        client = self._client()
+        for page in itertools.islice(itertools.cycle(range(1, 6)), options['iterations']):
+            stopwatch.time(client.get, reverse('home'), {'page': page})
+
+    def journey_home_near(self, stopwatch, options):
+        client = self._client()
+        places = ['Toronto', 'Vancouver', 'Montreal', 'Calgary', 'Halifax']
+        for _ in range(options['iterations']):
+            params = {'near': self.rng.choice(places), 'radius_km': self.rng.choice([25, 100, 250])}
+            stopwatch.time(client.get, reverse('home'), params)
+
+    def journey_event_detail(self, stopwatch, options):
+        volunteers = self._volunteers()
+        event_ids = self._upcoming_event_ids()
+        if not volunteers or not event_ids:
+            raise CommandError('event_detail needs at least one volunteer and one upcoming event')
+        client = self._client(self.rng.choice(volunteers))
+        for _ in range(options['iterations']):
+            stopwatch.time(client.get, reverse('event_detail', args=[self.rng.choice(event_ids)]))
+
+    def journey_register_burst(self, stopwatch, options):
+        """Many volunteers registering for the same event back to back"""
+        event_ids = self._upcoming_event_ids()
+        volunteers = self._volunteers()
+        if not volunteers or not event_ids:
+            raise CommandError('register_burst needs at least one volunteer and one upcoming event')
+        taken = set(EventRegistration.objects.values_list('volunteer_id', 'event_id'))
+        clients = {}
+        remaining = options['iterations']
+        while remaining > 0:
+            event_id = self.rng.choice(event_ids)
+            burst = [user for user in volunteers if (user.id, event_id) not in taken]
+            burst = burst[:min(options['burst_size'], remaining)]
+            if not burst:
+                event_ids.remove(event_id)
+                if not event_ids:
+                    break
+                continue
+            url = reverse('register_event', args=[event_id])
+            for user in burst:
+                if user.id not in clients:
+                    clients[user.id] = self._client(user)
+                stopwatch.time(clients[user.id].post, url)
+                taken.add((user.id, event_id))
+            remaining -= len(burst)
+
+    def journey_volunteer_profile(self, stopwatch, options):
+        self._profile_journey(stopwatch, options, self._volunteers())
+
+    def journey_organizer_profile(self, stopwatch, options):
+        self._profile_journey(stopwatch, options, self._organizers())
+
+    def _profile_journey(self, stopwatch, options, users):
+        if not users:
+            raise CommandError('No users with this profile type to benchmark')
+        clients = [self._client(user) for user in self.rng.sample(users, min(10, len(users)))]
+        for i in range(options['iterations']):
+            stopwatch.time(clients[i % len(clients)].get, reverse('my_profile'))
+
+    # ---- output ----
+
+    def print_results(self, results):
+        self.stdout.write(self.style.SUCCESS('\n' + '='*88))
+        self.stdout.write(
+            f'{"journey":<20}{"reqs":>6}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}'
+            f'{"queries":>10}{"req/s":>10}{"errors":>8}'
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<20}{result["requests"]:>6}{result["p50_ms"]:>10.1f}{result["p95_ms"]:>10.1f}'
+                f'{result["p99_ms"]:>10.1f}{result["queries_mean"]:>10.1f}{result["throughput_rps"]:>10.1f}'
+                f'{result["errors"]:>8}'
+            )
+        self.stdout.write(self.style.SUCCESS('='*88 + '\n'))
+
+    def print_comparison(self, diff):
+        if not diff:
+            self.stdout.write(self.style.WARNING('⚠️  No journeys in common with the baseline'))
+            return
+        self.stdout.write('📊 Change vs baseline (throughput: + is faster; others: + is slower)')
+        for name, metrics in diff.items():
+            parts = []
+            for metric, (before, after, change) in metrics.items():
+                text = f'{metric} {before:g} → {after:g} ({change:+.1f}%)'
+                parts.append(self.style.WARNING(text) if is_regression(metric, change) else text)
+            self.stdout.write(f'  {name:<20}' + ' | '.join(parts))
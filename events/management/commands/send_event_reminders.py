@@ -3,13 +3,20 @@ from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
+from events.metrics import EMAILS_FAILED, EMAILS_SENT, REMINDER_LAG
 from events.models import Event, EventRegistration
+from events.routers import replica_reads
 
 
 class Command(BaseCommand):
     help = 'Send email reminders to volunteers for upcoming events'
 
     def handle(self, *args, **kwargs):
+        # The scan only reads, so it can run against the replica
+        with replica_reads():
+            self.send_reminders()
+
+    def send_reminders(self):
         now = timezone.now()
 
         # Get events happening in the next 12 hours
@@ -59,17 +66,28 @@ Best regards,
 GreenEvents Team
                     """
 
-                    send_mail(
+                    sent = send_mail(
                         subject,
                         message,
                         settings.DEFAULT_FROM_EMAIL,
                         [registration.volunteer.email],
                         fail_silently=True,
                     )
+                    if not sent:
+                        EMAILS_FAILED.inc(source='reminder')
+                        self.stdout.write(self.style.ERROR(
+                            f'Reminder to {registration.volunteer.email} for {event.title} was not sent'
+                        ))
+                        continue
+                    EMAILS_SENT.inc(source='reminder')
+                    # How late this run is relative to when the reminder was due
+                    due = event.date - timedelta(hours=12)
+                    REMINDER_LAG.observe(max((timezone.now() - due).total_seconds(), 0), window='12h')
                     self.stdout.write(self.style.SUCCESS(
                         f'12h reminder sent to {registration.volunteer.email} for {event.title}'
                     ))
                 except Exception as e:
+                    EMAILS_FAILED.inc(source='reminder')
                     self.stdout.write(self.style.ERROR(f'Error: {str(e)}'))
 
         # Send 1-hour reminders
@@ -102,17 +120,28 @@ Best regards,
 GreenEvents Team
                     """
 
-                    send_mail(
+                    sent = send_mail(
                         subject,
                         message,
                         settings.DEFAULT_FROM_EMAIL,
                         [registration.volunteer.email],
                         fail_silently=True,
                     )
+                    if not sent:
+                        EMAILS_FAILED.inc(source='reminder')
+                        self.stdout.write(self.style.ERROR(
+                            f'Reminder to {registration.volunteer.email} for {event.title} was not sent'
+                        ))
+                        continue
+                    EMAILS_SENT.inc(source='reminder')
+                    # How late this run is relative to when the reminder was due
+                    due = event.date - timedelta(hours=1)
+                    REMINDER_LAG.observe(max((timezone.now() - due).total_seconds(), 0), window='1h')
                     self.stdout.write(self.style.SUCCESS(
                         f'1h reminder sent to {registration.volunteer.email} for {event.title}'
                     ))
                 except Exception as e:
+                    EMAILS_FAILED.inc(source='reminder')
                     self.stdout.write(self.style.ERROR(f'Error: {str(e)}'))
 
         self.stdout.write(self.style.SUCCESS('Reminder emails sent successfully!'))
\ No newline at end of file
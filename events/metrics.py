@@ -0,0 +1,374 @@
+"""
+Prometheus-style application metrics, served as text on /metrics.
+
+    REQUESTS.inc(view='home', method='GET', status='200')
+    REQUEST_LATENCY.observe(0.042, view='home')
+
+Counters and histograms are defined at module level below. Gauges that
+describe the database (registrations by status, waitlist size) are read
+at scrape time by collectors, one aggregate query each, so they are
+always current and never drift.
+
+Multi-process: with METRICS_DIR set (e.g. under gunicorn), each process
+keeps its values in its own mmap-backed file in that directory,
+``metrics_<pid>.db``, and a scrape sums all files. Whichever worker
+answers /metrics therefore reports the whole server. Management commands
+run as cron jobs (send_event_reminders) write into the same directory.
+Counters keep the totals of workers that have exited, as Prometheus
+expects of counters. Clear the directory when the server is restarted.
+Without METRICS_DIR the values live in this process only.
+"""
+
+import glob
+import ipaddress
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.models import Count
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils import timezone
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_INITIAL_SIZE = 1 << 16
+_HEADER = struct.Struct('i4x')       # bytes in use
+_KEY_LENGTH = struct.Struct('i')
+_VALUE = struct.Struct('d')
+
+
+class MmapValues:
+    """
+    A float per key in a file only this process writes. Entries are
+    appended (key length, key padded to 8 bytes, value) and the header's
+    used-bytes count is updated last, so a concurrent reader never sees a
+    half-written entry.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._positions = {}
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._capacity = max(os.fstat(fd).st_size, _INITIAL_SIZE)
+            os.ftruncate(fd, self._capacity)
+            self._map = mmap.mmap(fd, self._capacity)
+        finally:
+            os.close(fd)
+        self._used = _HEADER.unpack_from(self._map, 0)[0] or _HEADER.size
+        for key, _, position in _read_entries(self._map, self._used):
+            self._positions[key] = position
+
+    def _grow(self, needed):
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        self._map.close()
+        fd = os.open(self.path, os.O_RDWR)
+        try:
+            os.ftruncate(fd, capacity)
+            self._map = mmap.mmap(fd, capacity)
+        finally:
+            os.close(fd)
+        self._capacity = capacity
+
+    def _position(self, key):
+        position = self._positions.get(key)
+        if position is None:
+            encoded = key.encode('utf-8')
+            padded = len(encoded) + (8 - (_KEY_LENGTH.size + len(encoded)) % 8) % 8
+            size = _KEY_LENGTH.size + padded + _VALUE.size
+            if self._used + size > self._capacity:
+                self._grow(self._used + size)
+            _KEY_LENGTH.pack_into(self._map, self._used, len(encoded))
+            self._map[self._used + _KEY_LENGTH.size:self._used + _KEY_LENGTH.size + len(encoded)] = encoded
+            position = self._used + _KEY_LENGTH.size + padded
+            _VALUE.pack_into(self._map, position, 0.0)
+            self._used += size
+            _HEADER.pack_into(self._map, 0, self._used)
+            self._positions[key] = position
+        return position
+
+    def add(self, key, amount):
+        position = self._position(key)
+        value = _VALUE.unpack_from(self._map, position)[0]
+        _VALUE.pack_into(self._map, position, value + amount)
+
+
+def _read_entries(data, used):
+    position = _HEADER.size
+    while position < used:
+        length = _KEY_LENGTH.unpack_from(data, position)[0]
+        start = position + _KEY_LENGTH.size
+        key = bytes(data[start:start + length]).decode('utf-8')
+        value_position = start + length + (8 - (_KEY_LENGTH.size + length) % 8) % 8
+        yield key, _VALUE.unpack_from(data, value_position)[0], value_position
+        position = value_position + _VALUE.size
+
+
+def read_file(path):
+    """{key: value} from one process's metrics file"""
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    if len(data) < _HEADER.size:
+        return {}
+    used = min(_HEADER.unpack_from(data, 0)[0], len(data))
+    return {key: value for key, value, _ in _read_entries(data, used)}
+
+
+class Store:
+    """This process's values: an mmap file in METRICS_DIR, or a dict"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._values = None
+
+    def _directory(self):
+        return getattr(settings, 'METRICS_DIR', None)
+
+    def _open(self):
+        # Re-open after a fork: the child must not write into its parent's file
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            directory = self._directory()
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+                self._values = MmapValues(os.path.join(directory, f'metrics_{self._pid}.db'))
+            else:
+                self._values = defaultdict(float)
+        return self._values
+
+    def add(self, key, amount):
+        with self._lock:
+            values = self._open()
+            if isinstance(values, MmapValues):
+                values.add(key, amount)
+            else:
+                values[key] += amount
+
+    def collect(self):
+        """Values summed over every process"""
+        directory = self._directory()
+        if not directory:
+            with self._lock:
+                return dict(self._open())
+        totals = defaultdict(float)
+        for path in glob.glob(os.path.join(directory, 'metrics_*.db')):
+            try:
+                values = read_file(path)
+            except OSError:
+                continue
+            for key, value in values.items():
+                totals[key] += value
+        return totals
+
+
+store = Store()
+_metrics = []
+_collectors = []
+
+
+def _key(name, labels):
+    return json.dumps([name, sorted(labels.items())])
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = (
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _metrics.append(self)
+
+    def inc(self, amount=1, **labels):
+        store.add(_key(self.name, labels), amount)
+
+    def samples(self, values):
+        for key, value in values.get(self.name, ()):
+            yield self.name, key, value
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        _metrics.append(self)
+
+    def observe(self, value, **labels):
+        # Stored per bucket (not cumulative), so one observation is two writes
+        upper = next((bound for bound in self.buckets if value <= bound), float('inf'))
+        store.add(_key(f'{self.name}_bucket', {**labels, 'le': repr(float(upper))}), 1)
+        store.add(_key(f'{self.name}_sum', labels), value)
+
+    def samples(self, values):
+        series = defaultdict(dict)
+        for labels, value in values.get(f'{self.name}_bucket', ()):
+            labels = dict(labels)
+            upper = float(labels.pop('le'))
+            series[tuple(sorted(labels.items()))][upper] = value
+        sums = {labels: value for labels, value in values.get(f'{self.name}_sum', ())}
+        for labels, counts in series.items():
+            total = 0
+            for upper in (*self.buckets, float('inf')):
+                total += counts.get(upper, 0)
+                le = '+Inf' if upper == float('inf') else repr(float(upper))
+                yield f'{self.name}_bucket', (*labels, ('le', le)), total
+            yield f'{self.name}_sum', labels, sums.get(labels, 0)
+            yield f'{self.name}_count', labels, total
+
+
+def collector(name, documentation, kind='gauge'):
+    """Register ``func() -> [(labels dict, value)]``, called on every scrape"""
+    def register(func):
+        _collectors.append((name, documentation, kind, func))
+        return func
+    return register
+
+
+def render():
+    """Every metric in the Prometheus text exposition format"""
+    grouped = defaultdict(list)
+    for key, value in store.collect().items():
+        name, labels = json.loads(key)
+        grouped[name].append((tuple(tuple(pair) for pair in labels), value))
+
+    lines = []
+    for metric in _metrics:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        for name, labels, value in metric.samples(grouped):
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+    for name, documentation, kind, func in _collectors:
+        lines.append(f'# HELP {name} {documentation}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in func():
+            lines.append(f'{name}{_format_labels(sorted(labels.items()))} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+# ---- application metrics ----
+
+REQUESTS = Counter('greenevents_http_requests_total', 'Requests handled, by view, method and status', ['view', 'method', 'status'])
+REQUEST_LATENCY = Histogram('greenevents_http_request_duration_seconds', 'Time to produce a response, by view', ['view'])
+REGISTRATIONS = Counter('greenevents_registrations_created_total', 'Registrations created, by initial status', ['status'])
+EMAILS_SENT = Counter('greenevents_emails_sent_total', 'Emails handed to the mail server, by source', ['source'])
+EMAILS_FAILED = Counter('greenevents_emails_failed_total', 'Emails that could not be sent, by source', ['source'])
+REMINDER_LAG = Histogram(
+    'greenevents_reminder_lag_seconds', 'How long after its due time a reminder went out, by window',
+    ['window'], buckets=(60, 300, 900, 1800, 3600, 7200, 21600, 43200),
+)
+CACHE_REQUESTS = Counter('greenevents_cache_requests_total', 'Lookups in the app caches, by cache and hit/miss', ['cache', 'result'])
+
+
+def record_cache(cache_name, value):
+    """Count a cache lookup as a hit or miss and hand ``value`` back"""
+    CACHE_REQUESTS.inc(cache=cache_name, result='miss' if value is None else 'hit')
+    return value
+
+
+@collector('greenevents_upcoming_registrations', 'Registrations for upcoming active events, by status')
+def upcoming_registrations():
+    from .models import EventRegistration
+    rows = (
+        EventRegistration.objects.filter(event__date__gte=timezone.now(), event__is_active=True)
+        .values('status').annotate(count=Count('id')).order_by()
+    )
+    counts = {status: 0 for status, _ in EventRegistration.STATUS_CHOICES}
+    counts.update({row['status']: row['count'] for row in rows})
+    return [({'status': status}, count) for status, count in counts.items()]
+
+
+@collector('greenevents_waitlist_size', 'Volunteers on a waitlist for an upcoming active event')
+def waitlist_size():
+    from .models import EventRegistration
+    count = EventRegistration.objects.filter(
+        status='waitlist', event__date__gte=timezone.now(), event__is_active=True,
+    ).count()
+    return [({}, count)]
+
+
+# ---- exposition ----
+
+def scrape_allowed(request):
+    """
+    The METRICS_TOKEN bearer token, or a connection from METRICS_ALLOWED_IPS
+    (loopback by default). With neither configured, nobody can scrape.
+    REMOTE_ADDR is the peer address: behind a proxy, that is the proxy.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and request.headers.get('Authorization') == f'Bearer {token}':
+        return True
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in getattr(settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+    )
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, for the bearer token or internal addresses only"""
+    if not scrape_allowed(request):
+        return HttpResponseForbidden('Forbidden')
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """Counts requests and times them per view (URL name)"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _record(self, request, response, elapsed):
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match is not None else 'unmatched'
+        REQUESTS.inc(view=view, method=request.method, status=str(response.status_code))
+        REQUEST_LATENCY.observe(elapsed, view=view)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self._record(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self._record(request, response, time.perf_counter() - start)
+        return response
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_geo_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='events.event')),
+                ('recommended_event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommended_by', to='events.event')),
+            ],
+            options={
+                'ordering': ['event', 'rank'],
+                'unique_together': {('event', 'recommended_event')},
+            },
+        ),
+    ]
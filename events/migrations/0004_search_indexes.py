@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_recommendations'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='category',
+            field=models.CharField(choices=[('tree_planting', '🌳 Tree Planting'), ('beach_cleanup', '🏖️ Beach Cleanup'), ('recycling', '♻️ Recycling Drive'), ('e_waste', '💻 E-Waste Collection'), ('community_garden', '🌱 Community Garden'), ('workshop', '📚 Sustainability Workshop'), ('conservation', '🦋 Nature Conservation'), ('cleanup', '🧹 General Cleanup')], db_index=True, max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='date',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
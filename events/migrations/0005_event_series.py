@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_search_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeriesOccurrenceOverride',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_start', models.DateTimeField()),
+                ('cancelled', models.BooleanField(default=False)),
+                ('date', models.DateTimeField(blank=True, help_text='New start time, if moved', null=True)),
+                ('end_date', models.DateTimeField(blank=True, null=True)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('location', models.CharField(blank=True, max_length=300)),
+                ('address', models.TextField(blank=True)),
+                ('capacity', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['original_start'],
+            },
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='series_start',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='EventSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('category', models.CharField(choices=[('tree_planting', '🌳 Tree Planting'), ('beach_cleanup', '🏖️ Beach Cleanup'), ('recycling', '♻️ Recycling Drive'), ('e_waste', '💻 E-Waste Collection'), ('community_garden', '🌱 Community Garden'), ('workshop', '📚 Sustainability Workshop'), ('conservation', '🦋 Nature Conservation'), ('cleanup', '🧹 General Cleanup')], db_index=True, max_length=50)),
+                ('location', models.CharField(max_length=300)),
+                ('address', models.TextField(blank=True)),
+                ('city', models.CharField(blank=True, db_index=True, max_length=100)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('geo_cell', models.IntegerField(blank=True, null=True)),
+                ('first_start', models.DateTimeField(help_text='Start of the first occurrence')),
+                ('duration', models.DurationField(blank=True, null=True)),
+                ('recurrence', models.CharField(help_text='e.g. FREQ=WEEKLY;BYDAY=SA;UNTIL=20261231', max_length=200)),
+                ('last_start', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('capacity', models.IntegerField()),
+                ('allow_waitlist', models.BooleanField(default=True)),
+                ('cover_image', models.ImageField(blank=True, null=True, upload_to='event_covers/')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('organizer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_series', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'event series',
+                'ordering': ['first_start'],
+            },
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='events.eventseries'),
+        ),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.UniqueConstraint(fields=('series', 'series_start'), name='unique_series_occurrence'),
+        ),
+        migrations.AddField(
+            model_name='seriesoccurrenceoverride',
+            name='series',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='overrides', to='events.eventseries'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='seriesoccurrenceoverride',
+            unique_together={('series', 'original_start')},
+        ),
+    ]
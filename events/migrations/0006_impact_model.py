@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_series'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventImpactReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trees_planted', models.PositiveIntegerField(blank=True, null=True)),
+                ('co2_saved_kg', models.FloatField(blank=True, null=True)),
+                ('waste_collected_kg', models.FloatField(blank=True, null=True)),
+                ('hours_volunteered', models.FloatField(blank=True, null=True)),
+                ('reported_at', models.DateTimeField(auto_now=True)),
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='impact_report', to='events.event')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ImpactSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('platform', 'Platform'), ('organizer', 'Organizer'), ('city', 'City'), ('volunteer', 'Volunteer')], max_length=20)),
+                ('key', models.CharField(blank=True, max_length=100)),
+                ('events', models.PositiveIntegerField(default=0)),
+                ('attendees', models.PositiveIntegerField(default=0)),
+                ('trees_planted', models.FloatField(default=0)),
+                ('co2_saved_kg', models.FloatField(default=0)),
+                ('waste_collected_kg', models.FloatField(default=0)),
+                ('hours_volunteered', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'impact summaries',
+                'unique_together': {('scope', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_impact_model'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventregistration',
+            name='checked_in_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
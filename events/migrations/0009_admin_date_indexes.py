@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_attendance_ledger'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attendance',
+            name='recorded_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='eventregistration',
+            name='registered_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='userhistory',
+            name='viewed_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_soft_delete_purge_jobs'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('archived_at__isnull', True), ('is_active', True)), fields=['date'], name='event_listed_date'),
+        ),
+    ]
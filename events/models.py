@@ -1,7 +1,11 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+from .categories import CATEGORY_CHOICES
+from .recurrence import parse_rule
+
 
 # Profile for Event Organizers (Companies/Organizations)
 class OrganizerProfile(models.Model):
@@ -25,33 +29,47 @@ class VolunteerProfile(models.Model):
     interests = models.CharField(max_length=500, blank=True)
     phone = models.CharField(max_length=20, blank=True)
     city = models.CharField(max_length=100, blank=True)
+    # Filled from city by the offline geocoder (events.geo)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
     profile_picture = models.ImageField(upload_to='volunteer_pics/', blank=True, null=True)
-    total_events_attended = models.IntegerField(default=0)
+    # Count of Attendance rows, kept up to date by close_past_events
+    total_events_attended = models.IntegerField(default=0, db_index=True)
 
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
 
 # Green Events Model
+class EventManager(models.Manager):
+    """Leaves out deleted events that are waiting to be purged (events.deletion)"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+# Live events that haven't finished (archived_at is set by events.archive).
+# Deleted events are inactive, so they are left out too. The listing
+# filters on this, and a partial index covers exactly these rows.
+LISTED = models.Q(is_active=True, archived_at__isnull=True)
+
+
 class Event(models.Model):
-    CATEGORY_CHOICES = [
-        ('tree_planting', '🌳 Tree Planting'),
-        ('beach_cleanup', '🏖️ Beach Cleanup'),
-        ('recycling', '♻️ Recycling Drive'),
-        ('e_waste', '💻 E-Waste Collection'),
-        ('community_garden', '🌱 Community Garden'),
-        ('workshop', '📚 Sustainability Workshop'),
-        ('conservation', '🦋 Nature Conservation'),
-        ('cleanup', '🧹 General Cleanup'),
-    ]
+    # Labels, icons, colours and impact live in the registry (events.categories)
+    CATEGORY_CHOICES = CATEGORY_CHOICES
 
     title = models.CharField(max_length=200)
     description = models.TextField()
-    category = models.CharField(max_length=50, choices=CATEGORY_CHOICES)
+    category = models.CharField(max_length=50, choices=CATEGORY_CHOICES, db_index=True)
     organizer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='organized_events')
     location = models.CharField(max_length=300)
     address = models.TextField(blank=True)
-    date = models.DateTimeField()
+    # Filled from location/address by the offline geocoder (events.geo)
+    city = models.CharField(max_length=100, blank=True, db_index=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geo_cell = models.IntegerField(null=True, blank=True, db_index=True)
+    date = models.DateTimeField(db_index=True)
     end_date = models.DateTimeField(null=True, blank=True)
     capacity = models.IntegerField()
     allow_waitlist = models.BooleanField(default=True)
@@ -59,19 +77,102 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Set on occurrences of an EventSeries that were materialized (see events.series)
+    series = models.ForeignKey('EventSeries', on_delete=models.SET_NULL, null=True, blank=True, related_name='occurrences')
+    series_start = models.DateTimeField(null=True, blank=True)
+    # Set once attendance has been written to the ledger (close_past_events)
+    attendance_closed_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    # Soft delete: set when the event is deleted; purge_deleted removes the row later
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    # Set once the event has finished (archive_past_events); off the home listing from then on
+    archived_at = models.DateTimeField(null=True, blank=True)
+
+    objects = EventManager()
+    # Including deleted events
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['series', 'series_start'], name='unique_series_occurrence'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], condition=LISTED, name='event_listed_date'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def has_ended(self, now=None):
+        return (self.end_date or self.date) < (now or timezone.now())
+
     def spots_remaining(self):
-        confirmed = self.registrations.filter(status='confirmed').count()
-        return max(0, self.capacity - confirmed)
+        return max(0, self.capacity - self.total_registered())
 
     def total_registered(self):
-        return self.registrations.filter(status='confirmed').count()
+        # Listings annotate confirmed_count so cards don't query once per call
+        confirmed = getattr(self, 'confirmed_count', None)
+        if confirmed is None:
+            confirmed = self.registrations.filter(status='confirmed').count()
+        return confirmed
+
+
+# Recurring event: one row for the whole schedule. Occurrences are expanded
+# on the fly and only become Event rows once someone registers.
+class EventSeries(models.Model):
+    organizer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='event_series')
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    category = models.CharField(max_length=50, choices=Event.CATEGORY_CHOICES, db_index=True)
+    location = models.CharField(max_length=300)
+    address = models.TextField(blank=True)
+    city = models.CharField(max_length=100, blank=True, db_index=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geo_cell = models.IntegerField(null=True, blank=True)
+    first_start = models.DateTimeField(help_text='Start of the first occurrence')
+    duration = models.DurationField(null=True, blank=True)
+    recurrence = models.CharField(max_length=200, help_text='e.g. FREQ=WEEKLY;BYDAY=SA;UNTIL=20261231')
+    # Last possible start, derived from COUNT/UNTIL; null for open-ended series
+    last_start = models.DateTimeField(null=True, blank=True, db_index=True)
+    capacity = models.IntegerField()
+    allow_waitlist = models.BooleanField(default=True)
+    cover_image = models.ImageField(upload_to='event_covers/', blank=True, null=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['first_start']
+        verbose_name_plural = 'event series'
+
+    def __str__(self):
+        return f"{self.title} ({self.recurrence})"
+
+    def clean(self):
+        try:
+            parse_rule(self.recurrence)
+        except ValidationError as e:
+            raise ValidationError({'recurrence': e.messages})
+
+
+# Changes to a single occurrence of a series, keyed by its scheduled start
+class SeriesOccurrenceOverride(models.Model):
+    series = models.ForeignKey(EventSeries, on_delete=models.CASCADE, related_name='overrides')
+    original_start = models.DateTimeField()
+    cancelled = models.BooleanField(default=False)
+    date = models.DateTimeField(null=True, blank=True, help_text='New start time, if moved')
+    end_date = models.DateTimeField(null=True, blank=True)
+    title = models.CharField(max_length=200, blank=True)
+    location = models.CharField(max_length=300, blank=True)
+    address = models.TextField(blank=True)
+    capacity = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['original_start']
+        unique_together = ['series', 'original_start']
+
+    def __str__(self):
+        return f"{self.series.title} @ {self.original_start:%Y-%m-%d %H:%M}"
 
 
 # Event Registration
@@ -85,7 +186,8 @@ class EventRegistration(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='registrations')
     volunteer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='registrations')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='confirmed')
-    registered_at = models.DateTimeField(auto_now_add=True)
+    registered_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    checked_in_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         unique_together = ['event', 'volunteer']
@@ -94,14 +196,126 @@ class EventRegistration(models.Model):
         return f"{self.volunteer.username} - {self.event.title}"
 
 
+# Attendance ledger: one row per volunteer who attended a finished event,
+# written by close_past_events. VolunteerProfile.total_events_attended is
+# the count of these rows.
+class Attendance(models.Model):
+    SOURCE_CHOICES = [
+        ('check_in', 'Checked in at the door'),
+        ('registration', 'Confirmed registration'),
+    ]
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='attendances')
+    volunteer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='attendances')
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    recorded_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        unique_together = ['event', 'volunteer']
+
+    def __str__(self):
+        return f"{self.volunteer.username} attended {self.event.title}"
+
+
 # User Activity Tracking
 class UserHistory(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='history')
     event = models.ForeignKey(Event, on_delete=models.CASCADE)
-    viewed_at = models.DateTimeField(auto_now_add=True)
+    viewed_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         ordering = ['-viewed_at']
 
     def __str__(self):
-        return f"{self.user.username} viewed {self.event.title}"
\ No newline at end of file
+        return f"{self.user.username} viewed {self.event.title}"
+
+# Precomputed "similar events", rebuilt by the build_recommendations command
+class EventRecommendation(models.Model):
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='recommendations')
+    recommended_event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='recommended_by')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['event', 'rank']
+        unique_together = ['event', 'recommended_event']
+
+    def __str__(self):
+        return f"{self.event.title} → {self.recommended_event.title}"
+
+
+# Organizer-reported outcome of a finished event; any figure given here
+# replaces the per-category estimate in events.impact
+class EventImpactReport(models.Model):
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, related_name='impact_report')
+    trees_planted = models.PositiveIntegerField(null=True, blank=True)
+    co2_saved_kg = models.FloatField(null=True, blank=True)
+    waste_collected_kg = models.FloatField(null=True, blank=True)
+    hours_volunteered = models.FloatField(null=True, blank=True)
+    reported_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Impact of {self.event.title}"
+
+
+# Precomputed impact totals, rebuilt by the rebuild_impact command
+class ImpactSummary(models.Model):
+    SCOPE_CHOICES = [
+        ('platform', 'Platform'),
+        ('organizer', 'Organizer'),
+        ('city', 'City'),
+        ('volunteer', 'Volunteer'),
+    ]
+
+    scope = models.CharField(max_length=20, choices=SCOPE_CHOICES)
+    # User id for organizer/volunteer rows, city name for city rows, '' for platform
+    key = models.CharField(max_length=100, blank=True)
+    events = models.PositiveIntegerField(default=0)
+    attendees = models.PositiveIntegerField(default=0)
+    trees_planted = models.FloatField(default=0)
+    co2_saved_kg = models.FloatField(default=0)
+    waste_collected_kg = models.FloatField(default=0)
+    hours_volunteered = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['scope', 'key']
+        verbose_name_plural = 'impact summaries'
+
+    def __str__(self):
+        return f"{self.get_scope_display()} {self.key}".strip()
+
+
+# A deleted event or user whose rows are removed in batches by purge_deleted
+class PurgeJob(models.Model):
+    KIND_CHOICES = [
+        ('event', 'Event'),
+        ('user', 'User'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    # Title or username at deletion time, for the admin
+    label = models.CharField(max_length=200)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', db_index=True)
+    # Table being purged and rows removed so far
+    step = models.CharField(max_length=100, blank=True)
+    rows_deleted = models.PositiveBigIntegerField(default=0)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    requested_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['requested_at']
+        unique_together = ['kind', 'object_id']
+
+    def __str__(self):
+        return f"Purge {self.kind} {self.label}"
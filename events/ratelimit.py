@@ -0,0 +1,152 @@
+"""
+Token-bucket rate limiting for named views (settings.RATE_LIMITS).
+
+Each rule is keyed by URL name. A client gets ``burst`` requests up front,
+refilled at ``rate`` (e.g. '10/m'). Signed-in users are counted per user
+and anonymous clients per IP, so one bot cannot use up a shared quota.
+When the bucket is empty the request gets a 429 with Retry-After, before
+the view runs: no queries, no template, no SMTP.
+
+    RATE_LIMITS = {
+        'contact': {'rate': '5/h', 'burst': 3, 'methods': ['POST']},
+        'home': {'rate': '60/m', 'burst': 20, 'params': ['query', 'near']},
+    }
+
+``methods`` and ``params`` narrow a rule: above, only POSTs to contact
+count, and only home requests that actually search.
+
+Bucket state is (tokens, timestamp) in the cache (RATELIMIT_CACHE). With
+the local-memory cache that is one dict lookup per limited request, per
+process. With a shared cache the limit holds across processes, but the
+get/set is not atomic across them, so a burst spread over workers can go
+slightly over the limit. Views without a rule only pay for the URL-name
+lookup.
+"""
+
+import math
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse, JsonResponse
+
+_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Serializes the read-modify-write of a bucket within this process
+_lock = threading.Lock()
+
+
+class Rule:
+    def __init__(self, name, rate, burst=None, methods=None, params=None):
+        self.name = name
+        count, period = parse_rate(rate)
+        self.per_second = count / period
+        self.burst = burst or count
+        self.methods = {method.upper() for method in methods} if methods else None
+        self.params = tuple(params or ())
+
+    def applies_to(self, request):
+        if self.methods and request.method not in self.methods:
+            return False
+        if self.params:
+            return any(request.GET.get(param) for param in self.params)
+        return True
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60)"""
+    try:
+        count, _, unit = rate.partition('/')
+        return int(count), _PERIODS[unit.strip().lower()[:1]]
+    except (KeyError, ValueError):
+        raise ImproperlyConfigured(f'Invalid rate "{rate}"; use e.g. "10/m" (units: s, m, h, d)')
+
+
+_parsed = (None, {})
+
+
+def rules():
+    """settings.RATE_LIMITS as Rules, re-parsed only when the setting object changes"""
+    global _parsed
+    raw = getattr(settings, 'RATE_LIMITS', {})
+    if _parsed[0] is not raw:
+        _parsed = (raw, {name: Rule(name, **options) for name, options in raw.items()})
+    return _parsed[1]
+
+
+def matching_rule(request):
+    if not getattr(settings, 'RATELIMIT_ENABLED', True):
+        return None
+    match = request.resolver_match
+    rule = rules().get(match.url_name) if match is not None else None
+    if rule is None or not rule.applies_to(request):
+        return None
+    return rule
+
+
+def client_ip(request):
+    """The client address; RATELIMIT_IP_META must only name a header your proxy sets"""
+    value = request.META.get(getattr(settings, 'RATELIMIT_IP_META', 'REMOTE_ADDR'), '')
+    return value.split(',')[0].strip() or request.META.get('REMOTE_ADDR', 'unknown')
+
+
+def take(key, rule, now=None):
+    """Take one token from the bucket at ``key``; returns seconds to wait, 0 if allowed"""
+    now = time.time() if now is None else now
+    cache = caches[getattr(settings, 'RATELIMIT_CACHE', 'default')]
+    with _lock:
+        tokens, updated = cache.get(key) or (rule.burst, now)
+        tokens = min(rule.burst, tokens + (now - updated) * rule.per_second)
+        if tokens < 1:
+            return math.ceil((1 - tokens) / rule.per_second)
+        # A bucket idle this long is full again, so it can expire
+        cache.set(key, (tokens - 1, now), math.ceil(rule.burst / rule.per_second) + 1)
+    return 0
+
+
+def throttled(request, rule, retry_after):
+    message = f'Too many requests. Please try again in {retry_after} seconds.'
+    if request.path.startswith('/api/') or 'application/json' in request.headers.get('Accept', ''):
+        response = JsonResponse({'error': message}, status=429)
+    else:
+        response = HttpResponse(message, status=429, content_type='text/plain; charset=utf-8')
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+class RateLimitMiddleware:
+    """Applies RATE_LIMITS in process_view, once the URL name is known"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Async stacks get an async process_view, so unlimited views
+            # don't pay for a thread hop
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        rule = matching_rule(request)
+        if rule is None:
+            return None
+        user = request.user
+        ident = f'user:{user.pk}' if user.is_authenticated else f'ip:{client_ip(request)}'
+        retry_after = take(f'ratelimit:{rule.name}:{ident}', rule)
+        return throttled(request, rule, retry_after) if retry_after else None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        rule = matching_rule(request)
+        if rule is None:
+            return None
+        user = await request.auser()
+        ident = f'user:{user.pk}' if user.is_authenticated else f'ip:{client_ip(request)}'
+        retry_after = await sync_to_async(take)(f'ratelimit:{rule.name}:{ident}', rule)
+        return throttled(request, rule, retry_after) if retry_after else None
@@ -0,0 +1,200 @@
+"""
+Item-item event recommendations.
+
+build_recommendations() reads every view (UserHistory) and live
+registration once, weights each user's interactions (registrations count
+more than views, events in the user's interest categories count more
+again) and accumulates a sparse event x event co-occurrence matrix. Rows
+are cosine-normalised and the top K upcoming events per event are stored
+in EventRecommendation, so pages read recommendations with one indexed
+query instead of recomputing anything per request.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Case, FloatField, Q, Sum, Value, When
+from django.utils import timezone
+
+from .models import Event, EventRecommendation, EventRegistration, UserHistory, VolunteerProfile
+
+TOP_K = 10
+
+VIEW_WEIGHT = 1.0
+REGISTRATION_WEIGHT = 3.0
+INTEREST_BOOST = 1.5
+
+# Bounds the O(n^2) pair loop for very active users
+MAX_EVENTS_PER_USER = 50
+
+# Free-text interests (see generate_dummy_data) that map onto a category
+INTEREST_SYNONYMS = {
+    'beach cleaning': 'beach_cleanup',
+    'wildlife conservation': 'conservation',
+    'water conservation': 'conservation',
+    'climate action': 'conservation',
+    'urban gardening': 'community_garden',
+    'zero waste': 'recycling',
+    'sustainable living': 'workshop',
+    'environmental education': 'workshop',
+    'renewable energy': 'workshop',
+    'green technology': 'e_waste',
+}
+
+
+def _label_key(label):
+    return re.sub(r'[^a-z ]+', '', label.lower()).strip()
+
+
+def _interest_lookup():
+    lookup = dict(INTEREST_SYNONYMS)
+    for key, label in Event.CATEGORY_CHOICES:
+        lookup[_label_key(label)] = key
+        lookup[key.replace('_', ' ')] = key
+    return lookup
+
+
+def interest_categories(interests):
+    """Map a comma-separated interests string to a set of Event category keys"""
+    lookup = _interest_lookup()
+    categories = set()
+    for interest in (interests or '').split(','):
+        category = lookup.get(_label_key(interest))
+        if category:
+            categories.add(category)
+    return categories
+
+
+def _collect_interactions():
+    """Return {user_id: {event_id: weight}} from views and live registrations"""
+    interactions = defaultdict(dict)
+    views = UserHistory.objects.values_list('user_id', 'event_id').distinct()
+    for user_id, event_id in views.iterator():
+        interactions[user_id][event_id] = VIEW_WEIGHT
+
+    registrations = EventRegistration.objects.exclude(status='cancelled').values_list('volunteer_id', 'event_id')
+    for user_id, event_id in registrations.iterator():
+        interactions[user_id][event_id] = REGISTRATION_WEIGHT
+    return interactions
+
+
+def co_occurrence(interactions, categories, user_interests, candidates):
+    """
+    Accumulate the sparse co-occurrence matrix.
+    Returns ({event_id: Counter(candidate_id -> weight)}, {event_id: norm^2}).
+    Only candidate (upcoming) events are kept as columns.
+    """
+    matrix = defaultdict(Counter)
+    norms = Counter()
+    for user_id, weights in interactions.items():
+        liked = user_interests.get(user_id, ())
+        items = heapq.nlargest(MAX_EVENTS_PER_USER, weights.items(), key=lambda item: item[1])
+        items = [
+            (event_id, weight * INTEREST_BOOST if categories.get(event_id) in liked else weight)
+            for event_id, weight in items
+        ]
+        for event_id, weight in items:
+            norms[event_id] += weight * weight
+        for event_id, weight in items:
+            row = matrix[event_id]
+            for other_id, other_weight in items:
+                if other_id != event_id and other_id in candidates:
+                    row[other_id] += weight * other_weight
+    return matrix, norms
+
+
+def build_recommendations(top_k=TOP_K, now=None, batch_size=1000):
+    """Rebuild the EventRecommendation table; returns (events, rows) written"""
+    now = now or timezone.now()
+
+    categories = dict(Event.objects.values_list('id', 'category'))
+    upcoming = list(
+        Event.objects.filter(date__gte=now, is_active=True).order_by('date').values_list('id', 'category')
+    )
+    candidates = {event_id for event_id, _ in upcoming}
+
+    # Soonest upcoming events per category, used to top up sparse rows
+    by_category = defaultdict(list)
+    for event_id, category in upcoming:
+        by_category[category].append(event_id)
+
+    user_interests = {
+        user_id: interest_categories(interests)
+        for user_id, interests in VolunteerProfile.objects.values_list('user_id', 'interests').iterator()
+    }
+
+    matrix, norms = co_occurrence(_collect_interactions(), categories, user_interests, candidates)
+
+    rows = []
+    for event_id, category in categories.items():
+        scored = [
+            (count / math.sqrt(norms[event_id] * norms[other_id]), other_id)
+            for other_id, count in matrix.get(event_id, {}).items()
+        ]
+        best = heapq.nlargest(top_k, scored)
+        chosen = {other_id for _, other_id in best}
+
+        # Not enough co-occurrence data: fall back to the same category
+        for other_id in by_category.get(category, ()):
+            if len(best) >= top_k:
+                break
+            if other_id != event_id and other_id not in chosen:
+                best.append((0.0, other_id))
+                chosen.add(other_id)
+
+        rows.extend(
+            EventRecommendation(event_id=event_id, recommended_event_id=other_id, score=score, rank=rank)
+            for rank, (score, other_id) in enumerate(best, start=1)
+        )
+
+    with transaction.atomic():
+        EventRecommendation.objects.all().delete()
+        EventRecommendation.objects.bulk_create(rows, batch_size=batch_size)
+    return len(categories), len(rows)
+
+
+def similar_events(event, limit=5, now=None):
+    """Upcoming events most similar to ``event``, in one query"""
+    now = now or timezone.now()
+    return Event.objects.filter(
+        recommended_by__event=event,
+        date__gte=now,
+        is_active=True,
+    ).order_by('recommended_by__rank')[:limit]
+
+
+def recommended_for_user(user, interests='', limit=5, now=None):
+    """
+    Upcoming events recommended from everything ``user`` viewed or
+    registered for, summed over those seeds and boosted for the user's
+    interest categories. Seeds are subqueries, so this is a single query.
+    """
+    now = now or timezone.now()
+    seeds = (
+        Q(recommended_by__event__in=EventRegistration.objects.filter(volunteer=user).values('event'))
+        | Q(recommended_by__event__in=UserHistory.objects.filter(user=user).values('event'))
+    )
+    boost = Case(
+        When(category__in=interest_categories(interests), then=Value(INTEREST_BOOST)),
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+    return (
+        Event.objects.filter(seeds, date__gte=now, is_active=True)
+        .exclude(registrations__volunteer=user)
+        .annotate(recommendation_score=Sum('recommended_by__score') * boost)
+        .order_by('-recommendation_score', 'date')[:limit]
+    )
+
+
+def interest_fallback(user, interests='', limit=5, now=None):
+    """Soonest upcoming events in the user's interest categories (cold start)"""
+    now = now or timezone.now()
+    return (
+        Event.objects.filter(category__in=interest_categories(interests), date__gte=now, is_active=True)
+        .exclude(registrations__volunteer=user)
+        .order_by('date')[:limit]
+    )
@@ -0,0 +1,198 @@
+"""
+A small RRULE (RFC 5545) subset for recurring events.
+
+Supported: FREQ=DAILY|WEEKLY|MONTHLY, INTERVAL, COUNT, UNTIL (YYYYMMDD or
+YYYYMMDDTHHMMSS[Z]) and BYDAY for weekly rules (e.g. BYDAY=TU,SA). That
+covers "every Saturday", "every other Tuesday and Thursday" and "the 3rd
+of every month" without adding python-dateutil as a dependency.
+
+    rule = parse_rule('FREQ=WEEKLY;BYDAY=SA;COUNT=10')
+    dates = list(occurrences(rule, first_start))
+"""
+
+import calendar
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY')
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+
+# Hard stop for rules without COUNT/UNTIL, and the largest COUNT accepted
+MAX_OCCURRENCES = 366
+
+
+class RecurrenceRule:
+    def __init__(self, freq, interval=1, count=None, until=None, byday=()):
+        self.freq = freq
+        self.interval = interval
+        self.count = count
+        self.until = until
+        self.byday = tuple(sorted(set(byday)))
+
+    def __str__(self):
+        parts = [f'FREQ={self.freq}']
+        if self.interval != 1:
+            parts.append(f'INTERVAL={self.interval}')
+        if self.byday:
+            parts.append('BYDAY=' + ','.join(WEEKDAYS[day] for day in self.byday))
+        if self.count:
+            parts.append(f'COUNT={self.count}')
+        if self.until:
+            parts.append('UNTIL=' + self.until.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ'))
+        return ';'.join(parts)
+
+    def __repr__(self):
+        return f'<RecurrenceRule {self}>'
+
+
+def _parse_until(value):
+    for fmt in ('%Y%m%dT%H%M%SZ', '%Y%m%dT%H%M%S', '%Y%m%d'):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if fmt == '%Y%m%d':
+            # A date-only UNTIL includes the whole day
+            parsed = datetime.combine(parsed.date(), time.max)
+        if fmt.endswith('Z'):
+            return parsed.replace(tzinfo=dt_timezone.utc)
+        return timezone.make_aware(parsed)
+    raise ValidationError(f'Invalid UNTIL value "{value}"')
+
+
+def parse_rule(text):
+    """Parse 'FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH;COUNT=8' into a RecurrenceRule"""
+    text = (text or '').strip()
+    if text.upper().startswith('RRULE:'):
+        text = text[6:]
+    values = {}
+    for part in filter(None, text.split(';')):
+        key, sep, value = part.partition('=')
+        if not sep:
+            raise ValidationError(f'Invalid rule part "{part}"')
+        values[key.strip().upper()] = value.strip().upper()
+
+    freq = values.pop('FREQ', None)
+    if freq not in FREQUENCIES:
+        raise ValidationError(f'FREQ must be one of {", ".join(FREQUENCIES)}')
+    try:
+        interval = int(values.pop('INTERVAL', 1))
+        count = int(values['COUNT']) if 'COUNT' in values else None
+    except ValueError:
+        raise ValidationError('INTERVAL and COUNT must be whole numbers')
+    values.pop('COUNT', None)
+    if interval < 1 or (count is not None and count < 1):
+        raise ValidationError('INTERVAL and COUNT must be at least 1')
+    if count is not None and count > MAX_OCCURRENCES:
+        raise ValidationError(f'COUNT must be at most {MAX_OCCURRENCES}')
+
+    until = _parse_until(values.pop('UNTIL')) if 'UNTIL' in values else None
+
+    byday = []
+    for day in filter(None, values.pop('BYDAY', '').split(',')):
+        if day not in WEEKDAYS:
+            raise ValidationError(f'Unknown BYDAY value "{day}"')
+        byday.append(WEEKDAYS.index(day))
+    if byday and freq != 'WEEKLY':
+        raise ValidationError('BYDAY is only supported for weekly rules')
+
+    if values:
+        raise ValidationError(f'Unsupported rule parts: {", ".join(sorted(values))}')
+    return RecurrenceRule(freq, interval, count, until, byday)
+
+
+def _add_months(value, months):
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    if value.day > calendar.monthrange(year, month)[1]:
+        return None  # e.g. the 31st in a 30-day month: skipped, as in RFC 5545
+    return value.replace(year=year, month=month)
+
+
+def _first_step(rule, start, skip_to):
+    """
+    Step of _candidates() to resume from so that no date at or after
+    ``skip_to`` is missed: the period holding it, less one for safety.
+    """
+    if rule.freq == 'DAILY':
+        step = (skip_to - start) // timedelta(days=rule.interval)
+    elif rule.freq == 'WEEKLY':
+        step = (skip_to - start + timedelta(days=start.weekday())) // timedelta(weeks=rule.interval)
+    else:
+        step = ((skip_to.year - start.year) * 12 + skip_to.month - start.month) // rule.interval
+    return max(step - 1, 0)
+
+
+def _candidates(rule, start, step=0):
+    """Every date the rule produces from ``start``, in order, without limits"""
+    while True:
+        if rule.freq == 'DAILY':
+            yield start + timedelta(days=step * rule.interval)
+        elif rule.freq == 'WEEKLY':
+            week_start = start - timedelta(days=start.weekday()) + timedelta(weeks=step * rule.interval)
+            for day in rule.byday or (start.weekday(),):
+                candidate = week_start + timedelta(days=day)
+                if candidate >= start:
+                    yield candidate
+        else:
+            candidate = _add_months(start, step * rule.interval)
+            if candidate is not None:
+                yield candidate
+        step += 1
+
+
+def occurrences(rule, start, window_start=None, window_end=None, limit=MAX_OCCURRENCES):
+    """
+    Start datetimes of the series beginning at ``start`` (the first
+    occurrence), optionally restricted to [window_start, window_end).
+    COUNT and UNTIL are applied to the whole series, before windowing.
+    Wall-clock time is kept across DST changes.
+
+    Without COUNT nothing before the window changes what falls in it, so
+    the walk starts at window_start: the cost is the window's, however
+    old the series is (and ``limit`` counts from there). COUNT rules are
+    walked from the start, at most MAX_OCCURRENCES dates.
+    """
+    tz = start.tzinfo
+    local_start = timezone.localtime(start).replace(tzinfo=None) if tz else start
+    step = 0
+    if window_start and not rule.count and window_start > start:
+        local_window_start = timezone.localtime(window_start).replace(tzinfo=None) if tz else window_start
+        step = _first_step(rule, local_start, local_window_start)
+    produced = 0
+    for local in _candidates(rule, local_start, step):
+        value = timezone.make_aware(local) if tz else local
+        if rule.until and value > rule.until:
+            return
+        if rule.count and produced >= rule.count:
+            return
+        if limit is not None and produced >= limit:
+            return
+        produced += 1
+        if window_end and value >= window_end:
+            return
+        if window_start and value < window_start:
+            continue
+        yield value
+
+
+def last_occurrence(rule, start):
+    """Latest start of a COUNT/UNTIL series, None for open-ended ones"""
+    if rule.count:
+        last = None
+        for last in occurrences(rule, start, limit=None):
+            pass
+        return last
+    if not rule.until:
+        return None
+    # Look back from UNTIL over a widening window rather than walking the
+    # whole series (monthly rules can skip months, e.g. the 31st)
+    lookback = timedelta(days=32)
+    while True:
+        window_start = max(start, rule.until - lookback)
+        found = list(occurrences(rule, start, window_start, limit=None))
+        if found or window_start == start:
+            return found[-1] if found else None
+        lookback *= 2
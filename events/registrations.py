@@ -0,0 +1,70 @@
+"""
+Set-based bulk changes to registrations (used by the admin actions).
+
+Each operation is a handful of UPDATEs, however many rows it touches. It
+never loads and saves registrations one at a time. Because UPDATE skips
+the post_save signal, the affected events' availability is published
+here, once per event, after the transaction commits.
+
+promote_waitlist() fills an event's free spots from its waitlist in
+registration order (first come, first served). It runs one aggregate
+query for all the events, then one UPDATE per event that has free spots.
+"""
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .availability import publish_availability
+from .models import Event, EventRegistration
+from .sqlite import write_transaction
+
+BATCH_SIZE = 500
+
+
+def publish_on_commit(event_ids):
+    """Publish availability for event_ids once the transaction commits"""
+    def publish():
+        for event_id in event_ids:
+            publish_availability(event_id)
+    transaction.on_commit(publish)
+
+
+def cancel(registrations):
+    """Cancel every active registration in the queryset; returns (cancelled, event ids)"""
+    active = registrations.filter(status__in=['confirmed', 'waitlist'])
+    with write_transaction():
+        event_ids = set(active.order_by().values_list('event_id', flat=True).distinct())
+        cancelled = active.update(status='cancelled')
+        publish_on_commit(event_ids)
+    return cancelled, event_ids
+
+
+def promote_waitlist(event_ids):
+    """Confirm waitlisted volunteers into free spots; returns the number promoted"""
+    event_ids = list(event_ids)
+    promoted = 0
+    for start in range(0, len(event_ids), BATCH_SIZE):
+        batch = event_ids[start:start + BATCH_SIZE]
+        with write_transaction():
+            free = (
+                Event.objects.filter(id__in=batch)
+                .annotate(
+                    confirmed=Count('registrations', filter=Q(registrations__status='confirmed')),
+                    waiting=Count('registrations', filter=Q(registrations__status='waitlist')),
+                )
+                .filter(waiting__gt=0)
+                .values_list('id', 'capacity', 'confirmed')
+            )
+            changed = []
+            for event_id, capacity, confirmed in free:
+                if confirmed >= capacity:
+                    continue
+                first_waiting = (
+                    EventRegistration.objects.filter(event_id=event_id, status='waitlist')
+                    .order_by('registered_at', 'id')
+                    .values('id')[:capacity - confirmed]
+                )
+                promoted += EventRegistration.objects.filter(id__in=first_waiting).update(status='confirmed')
+                changed.append(event_id)
+            publish_on_commit(changed)
+    return promoted
@@ -0,0 +1,100 @@
+from django.db.models import aprefetch_related_objects, prefetch_related_objects
+
+# Reverse one-to-one accessors on User that decide what kind of account it is
+PROFILE_RELATIONS = ('volunteer_profile', 'organizer_profile')
+
+
+class UserRole:
+    """Resolved account type and profile for a single user instance"""
+
+    VOLUNTEER = 'volunteer'
+    ORGANIZER = 'organizer'
+
+    def __init__(self, volunteer_profile=None, organizer_profile=None):
+        self.volunteer_profile = volunteer_profile
+        self.organizer_profile = organizer_profile
+
+    @property
+    def is_volunteer(self):
+        return self.volunteer_profile is not None
+
+    @property
+    def is_organizer(self):
+        return self.organizer_profile is not None
+
+    @property
+    def has_profile(self):
+        return self.is_volunteer or self.is_organizer
+
+    @property
+    def name(self):
+        if self.is_volunteer:
+            return self.VOLUNTEER
+        if self.is_organizer:
+            return self.ORGANIZER
+        return None
+
+    @property
+    def profile(self):
+        return self.volunteer_profile or self.organizer_profile
+
+
+ANONYMOUS_ROLE = UserRole()
+
+
+def prime_user_profiles(user):
+    """
+    Make sure both profile relations are cached on ``user``.
+    Users loaded by ``events.backends`` already carry them; anyone else
+    (fresh logins, signals) costs at most one query per missing relation.
+    """
+    missing = _missing_relations(user)
+    if missing:
+        prefetch_related_objects([user], *missing)
+
+
+async def aprime_user_profiles(user):
+    """prime_user_profiles() for async views"""
+    missing = _missing_relations(user)
+    if missing:
+        await aprefetch_related_objects([user], *missing)
+
+
+def _missing_relations(user):
+    return [
+        name for name in PROFILE_RELATIONS
+        if not user._meta.get_field(name).is_cached(user)
+    ]
+
+
+def get_user_role(user):
+    """Return the UserRole for ``user``, resolving it at most once per instance"""
+    if user is None or not user.is_authenticated:
+        return ANONYMOUS_ROLE
+
+    role = getattr(user, '_user_role', None)
+    if role is None:
+        prime_user_profiles(user)
+        role = UserRole(
+            volunteer_profile=getattr(user, 'volunteer_profile', None),
+            organizer_profile=getattr(user, 'organizer_profile', None),
+        )
+        user._user_role = role
+    return role
+
+
+async def aget_user_role(user):
+    """
+    get_user_role() for async views: any profile the backend didn't
+    preload (e.g. a session from before events.backends) is fetched
+    without blocking the event loop.
+    """
+    if user is not None and user.is_authenticated and getattr(user, '_user_role', None) is None:
+        await aprime_user_profiles(user)
+    return get_user_role(user)
+
+
+def clear_user_role(user):
+    """Forget the cached role after a profile has been created or removed"""
+    if hasattr(user, '_user_role'):
+        del user._user_role
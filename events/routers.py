@@ -0,0 +1,135 @@
+"""
+Read replica routing with read-your-writes.
+
+When DATABASES has a 'replica' alias (settings: DATABASE_REPLICA_URL),
+PrimaryReplicaRouter sends reads to it, but only inside replica_reads().
+The read-heavy paths opt in: the home listing and event detail views
+(@reads_from_replica), the dashboard analytics queries and the reminder
+scan. Everything else, and every write, uses the primary ('default').
+Sessions are always read from the primary.
+
+A replica lags behind the primary, so a user who has just registered
+could reload the event page and not see their registration. To avoid
+that, ReadYourWritesMiddleware sets a short-lived cookie after any POST
+(or other unsafe method). While the cookie is present, and for the POST
+itself, that user's requests read from the primary. Incidental writes
+on a GET (view history, session updates) don't pin anything: nothing
+on the page reads them back.
+
+Without a replica the router and middleware change nothing.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = 'replica'
+PRIMARY_ONLY_APPS = {'sessions'}
+PIN_COOKIE = 'primary_reads'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+_use_replica = ContextVar('use_replica', default=False)
+_pinned = ContextVar('primary_pinned', default=False)
+
+
+def has_replica():
+    return REPLICA in connections.settings
+
+
+@contextmanager
+def replica_reads():
+    """Send reads inside the block to the replica (unless pinned to the primary)"""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def reads_from_replica(view):
+    """Run a (sync or async) view inside replica_reads()"""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            with replica_reads():
+                return await view(*args, **kwargs)
+    else:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with replica_reads():
+                return view(*args, **kwargs)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _use_replica.get() or _pinned.get() or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return None
+        return REPLICA if has_replica() else None
+
+    def db_for_write(self, model, **hints):
+        # Objects stay on the alias they came from (e.g. benchmark databases);
+        # anything read from the replica is written back to the primary
+        instance = hints.get('instance')
+        db = instance._state.db if instance is not None else None
+        if db == REPLICA:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if obj1._state.db == obj2._state.db:
+            return True
+        # Both aliases hold the same data
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # The replica gets its schema through replication
+        return False if db == REPLICA else None
+
+
+class ReadYourWritesMiddleware:
+    """Pins a user's reads to the primary for REPLICA_PIN_SECONDS after they write"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not has_replica():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = _pinned.set(self.pinned(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _pinned.reset(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        token = _pinned.set(self.pinned(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _pinned.reset(token)
+        return self.pin(request, response)
+
+    def pinned(self, request):
+        return request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES
+
+    def pin(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 500:
+            response.set_cookie(PIN_COOKIE, '1', max_age=self.pin_seconds, httponly=True, samesite='Lax')
+        return response
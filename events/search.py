@@ -0,0 +1,153 @@
+"""
+Faceted event search for the home page.
+
+Filters combine across facets (AND) and within a facet (OR), e.g.
+category in (recycling, e_waste) AND city = Toronto AND this week. Each
+facet's counts are computed over the set filtered by every *other* facet,
+so the options a user hasn't picked yet show how many results they would
+add. That is one grouped aggregate per facet (category, city) plus one
+conditional-count aggregate for all date buckets, each running on indexed
+columns, and the result is cached briefly per filter combination.
+
+The listing only holds upcoming events (events.archive), so there is no
+past bucket; finished events are on the archive page.
+"""
+
+import asyncio
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .metrics import record_cache
+from .models import Event
+
+DATE_BUCKETS = [
+    ('now', 'Happening now'),
+    ('week', 'This week'),
+    ('month', 'Later this month'),
+    ('later', 'Later'),
+]
+
+# Number of cities listed in the city facet (selected cities always show)
+CITY_FACET_LIMIT = 12
+
+
+def date_bucket_filters(now):
+    """
+    Disjoint Q filters per date bucket, using calendar week/month ends.
+    Together they cover every listed (not yet ended) event: 'now' holds
+    the ones that have started but run until end_date.
+    """
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_end = today + timedelta(days=7 - today.weekday())
+    next_month = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+    month_end = max(next_month, week_end)
+    return {
+        'now': Q(date__lt=now, end_date__gte=now),
+        'week': Q(date__gte=now, date__lt=week_end),
+        'month': Q(date__gte=week_end, date__lt=month_end),
+        'later': Q(date__gte=month_end),
+    }
+
+
+def facet_filters(categories, cities, buckets, now):
+    """{facet name: Q} for the selected values of each facet"""
+    bucket_filters = date_bucket_filters(now)
+    filters = {}
+    if categories:
+        filters['category'] = Q(category__in=categories)
+    if cities:
+        filters['city'] = Q(city__in=cities)
+    if buckets:
+        when = Q()
+        for bucket in buckets:
+            when |= bucket_filters[bucket]
+        filters['when'] = when
+    return filters
+
+
+def apply_filters(events, filters, exclude=None):
+    """Apply every facet filter except ``exclude``"""
+    for name, condition in filters.items():
+        if name != exclude:
+            events = events.filter(condition)
+    return events
+
+
+def facet_queries(events, filters, now):
+    """The three facet aggregates, as unevaluated querysets/arguments"""
+    bucket_filters = date_bucket_filters(now)
+    return {
+        'category': apply_filters(events, filters, exclude='category')
+            .order_by().values('category').annotate(count=Count('id')),
+        'city': apply_filters(events, filters, exclude='city')
+            .exclude(city='').order_by().values('city').annotate(count=Count('id')).order_by('-count', 'city'),
+        'when': (
+            apply_filters(events, filters, exclude='when').order_by(),
+            {name: Count('id', filter=condition) for name, condition in bucket_filters.items()},
+        ),
+    }
+
+
+def build_facets(category_rows, city_rows, bucket_counts, categories, cities, buckets):
+    """Shape raw aggregate rows into template-friendly option lists"""
+    category_counts = {row['category']: row['count'] for row in category_rows}
+    category_facet = [
+        {'value': key, 'label': label, 'count': category_counts.get(key, 0), 'selected': key in categories}
+        for key, label in Event.CATEGORY_CHOICES
+    ]
+
+    city_counts = {row['city']: row['count'] for row in city_rows}
+    shown = [row['city'] for row in city_rows[:CITY_FACET_LIMIT]]
+    shown += [city for city in cities if city not in shown]
+    city_facet = [
+        {'value': city, 'label': city, 'count': city_counts.get(city, 0), 'selected': city in cities}
+        for city in shown
+    ]
+
+    when_facet = [
+        {'value': key, 'label': label, 'count': bucket_counts.get(key, 0), 'selected': key in buckets}
+        for key, label in DATE_BUCKETS
+    ]
+    return {'category': category_facet, 'city': city_facet, 'when': when_facet}
+
+
+async def _alist(qs):
+    return [row async for row in qs]
+
+
+def facet_cache_key(*parts):
+    digest = hashlib.md5(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+    return f'event-facets:{digest}'
+
+
+def facet_cache_timeout():
+    return getattr(settings, 'FACET_CACHE_SECONDS', 60)
+
+
+async def acompute_facets(events, categories, cities, buckets, now, cache_key_parts=()):
+    """
+    Facet counts for the current search. ``events`` is the queryset after
+    the non-facet filters (keyword, distance). Cached per filter combination
+    and calendar day for FACET_CACHE_SECONDS.
+    """
+    key = facet_cache_key(now.date(), sorted(categories), sorted(cities), sorted(buckets), *cache_key_parts)
+    facets = record_cache('facets', await cache.aget(key))
+    if facets is not None:
+        return facets
+
+    queries = facet_queries(events, facet_filters(categories, cities, buckets, now), now)
+    when_queryset, when_aggregates = queries['when']
+    category_rows, city_rows, bucket_counts = await asyncio.gather(
+        _alist(queries['category']),
+        _alist(queries['city']),
+        when_queryset.aaggregate(**when_aggregates),
+    )
+
+    facets = build_facets(category_rows, city_rows, bucket_counts, categories, cities, buckets)
+    await cache.aset(key, facets, facet_cache_timeout())
+    return facets
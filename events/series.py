@@ -0,0 +1,189 @@
+"""
+Lazy expansion of recurring events (EventSeries).
+
+A series is stored once, with its recurrence rule and a handful of
+per-occurrence overrides. expand_series() turns the series that overlap
+a date window into Occurrence objects for that window only. Storage and
+listing cost grow with the window, not with how long the series runs:
+open-ended and UNTIL rules are expanded from the window start, and COUNT
+rules are capped at MAX_OCCURRENCES dates.
+
+An occurrence becomes a real Event row (Event.series / series_start)
+the first time someone registers for it; materialize() is idempotent.
+From then on it is an ordinary Event: listed by the normal queries,
+counted, reminded and recommended. expand_series() skips it so it is
+never shown twice.
+"""
+
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.urls import reverse
+
+from .categories import category_label
+from .models import Event, EventSeries, SeriesOccurrenceOverride
+from .recurrence import last_occurrence, occurrences, parse_rule
+
+# Series fields copied onto each materialized Event
+_SERIES_FIELDS = [
+    'title', 'description', 'category', 'location', 'address', 'city', 'latitude', 'longitude',
+    'geo_cell', 'capacity', 'allow_waitlist', 'cover_image', 'is_active', 'organizer_id',
+]
+_OVERRIDE_FIELDS = ['title', 'location', 'address', 'capacity']
+
+# How far ahead the home page lists not-yet-materialized occurrences
+LISTING_WINDOW_DAYS = 14
+
+
+class Occurrence:
+    """One not-yet-materialized date of a series; quacks like an Event in listings"""
+    is_virtual = True
+
+    def __init__(self, series, original_start, override=None):
+        self.series = series
+        self.original_start = original_start
+        for field in _SERIES_FIELDS:
+            setattr(self, field, getattr(series, field))
+        self.date = original_start
+        self.end_date = original_start + series.duration if series.duration else None
+        if override is not None:
+            for field in _OVERRIDE_FIELDS:
+                value = getattr(override, field)
+                if value not in (None, ''):
+                    setattr(self, field, value)
+            if override.date:
+                self.date = override.date
+                self.end_date = override.date + series.duration if series.duration else None
+            if override.end_date:
+                self.end_date = override.end_date
+
+    def __repr__(self):
+        return f'<Occurrence {self.title} @ {self.date:%Y-%m-%d %H:%M}>'
+
+    @property
+    def key(self):
+        """URL-safe id of the occurrence (its scheduled start as a Unix timestamp)"""
+        return int(self.original_start.timestamp())
+
+    def get_absolute_url(self):
+        return reverse('series_occurrence', args=[self.series.pk, self.key])
+
+    def get_category_display(self):
+        return category_label(self.category)
+
+    def total_registered(self):
+        return 0
+
+    def spots_remaining(self):
+        return max(0, self.capacity)
+
+
+def series_rule(series):
+    rule = getattr(series, '_rule', None)
+    if rule is None:
+        rule = series._rule = parse_rule(series.recurrence)
+    return rule
+
+
+def compute_last_start(series):
+    """Latest scheduled start for COUNT/UNTIL rules, None for open-ended ones"""
+    return last_occurrence(series_rule(series), series.first_start)
+
+
+def series_in_window(window_start, window_end):
+    """Active series that can have an occurrence in [window_start, window_end)"""
+    return EventSeries.objects.filter(
+        Q(last_start__isnull=True) | Q(last_start__gte=window_start) | Q(overrides__date__gte=window_start),
+        is_active=True,
+        first_start__lt=window_end,
+    ).distinct()
+
+
+def expand_series(series_list, window_start, window_end):
+    """
+    Occurrences of the given series starting in [window_start, window_end),
+    with overrides applied and materialized ones left out, soonest first.
+    Two queries however many series: overrides and materialized starts.
+    """
+    series_list = list(series_list)
+    if not series_list:
+        return []
+    by_id = {series.pk: series for series in series_list}
+
+    overrides = {}
+    for override in SeriesOccurrenceOverride.objects.filter(series_id__in=by_id):
+        overrides[(override.series_id, override.original_start)] = override
+    # Deleted occurrences count too, so they don't come back as virtual ones
+    materialized = set(
+        Event.all_objects.filter(
+            Q(series_start__gte=window_start, series_start__lt=window_end) | Q(date__gte=window_start, date__lt=window_end),
+            series_id__in=by_id,
+        ).values_list('series_id', 'series_start')
+    )
+
+    found = []
+    for series in series_list:
+        starts = set(occurrences(series_rule(series), series.first_start, window_start, window_end, limit=None))
+        # Occurrences moved into the window from outside it
+        starts.update(
+            original for (series_id, original), override in overrides.items()
+            if series_id == series.pk and override.date and window_start <= override.date < window_end
+        )
+        for original in starts:
+            if (series.pk, original) in materialized:
+                continue
+            override = overrides.get((series.pk, original))
+            if override is not None and override.cancelled:
+                continue
+            occurrence = Occurrence(series, original, override)
+            if window_start <= occurrence.date < window_end:
+                found.append(occurrence)
+    found.sort(key=lambda occurrence: occurrence.date)
+    return found
+
+
+def upcoming_occurrences(window_start, window_end, categories=(), cities=(), limit=None):
+    """Virtual occurrences for listings, filtered like the home page facets"""
+    series = series_in_window(window_start, window_end)
+    if categories:
+        series = series.filter(category__in=categories)
+    if cities:
+        series = series.filter(city__in=cities)
+    found = expand_series(series, window_start, window_end)
+    return found[:limit] if limit else found
+
+
+def find_occurrence(series, original_start):
+    """The Occurrence scheduled at ``original_start``, or None if the rule has no such date"""
+    override = series.overrides.filter(original_start=original_start).first()
+    if override is None:
+        window_end = original_start + timedelta(seconds=1)
+        scheduled = next(occurrences(series_rule(series), series.first_start, original_start, window_end, limit=None), None)
+        if scheduled != original_start:
+            return None
+    elif override.cancelled:
+        return None
+    return Occurrence(series, original_start, override)
+
+
+def materialize(occurrence):
+    """Get or create the Event row for an occurrence (safe under concurrent calls)"""
+    series = occurrence.series
+    # A deleted occurrence still holds its slot until it is purged
+    existing = Event.all_objects.filter(series=series, series_start=occurrence.original_start).first()
+    if existing is not None:
+        return existing
+    event = Event(
+        series=series,
+        series_start=occurrence.original_start,
+        date=occurrence.date,
+        end_date=occurrence.end_date,
+        **{field: getattr(occurrence, field) for field in _SERIES_FIELDS},
+    )
+    try:
+        with transaction.atomic():
+            event.save()
+    except IntegrityError:
+        return Event.all_objects.get(series=series, series_start=occurrence.original_start)
+    return event
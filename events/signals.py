@@ -1,6 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from allauth.socialaccount.signals import social_account_added
-from .models import VolunteerProfile, OrganizerProfile
+from .models import Event, EventRegistration, EventSeries, VolunteerProfile, OrganizerProfile
+from .availability import publish_availability
+from .metrics import REGISTRATIONS
+from .geo import apply_geocode
+from .series import compute_last_start
+from .roles import get_user_role, clear_user_role
 
 
 @receiver(social_account_added)
@@ -9,15 +16,55 @@ def create_profile_on_google_signup(sender, request, sociallogin, **kwargs):
     account_type = request.session.get('pending_account_type', 'volunteer')
 
     # Create appropriate profile
+    role = get_user_role(user)
     if account_type == 'volunteer':
-        if not hasattr(user, 'volunteer_profile'):
+        if not role.is_volunteer:
             VolunteerProfile.objects.create(user=user)
+            clear_user_role(user)
     elif account_type == 'organizer':
-        if not hasattr(user, 'organizer_profile'):
+        if not role.is_organizer:
             # Get organization name from Google or use username
             org_name = user.get_full_name() or user.username
             OrganizerProfile.objects.create(user=user, organization_name=org_name)
+            clear_user_role(user)
 
     # Clear session
     if 'pending_account_type' in request.session:
-        del request.session['pending_account_type']
\ No newline at end of file
+        del request.session['pending_account_type']
+
+
+@receiver(pre_save, sender=Event)
+def geocode_event(sender, instance, **kwargs):
+    apply_geocode(instance, instance.location, instance.address, set_city=True)
+
+
+@receiver(pre_save, sender=EventSeries)
+def prepare_series(sender, instance, **kwargs):
+    apply_geocode(instance, instance.location, instance.address, set_city=True)
+    instance._rule = None
+    instance.last_start = compute_last_start(instance)
+
+
+@receiver(pre_save, sender=VolunteerProfile)
+def geocode_volunteer(sender, instance, **kwargs):
+    apply_geocode(instance, instance.city)
+
+
+@receiver(post_save, sender=EventRegistration)
+@receiver(post_delete, sender=EventRegistration)
+def push_registration_change(sender, instance, **kwargs):
+    event_id = instance.event_id
+    transaction.on_commit(lambda: publish_availability(event_id))
+
+
+@receiver(post_save, sender=EventRegistration)
+def count_registration(sender, instance, created, **kwargs):
+    if created:
+        REGISTRATIONS.inc(status=instance.status)
+
+
+@receiver(post_save, sender=Event)
+def push_capacity_change(sender, instance, created, **kwargs):
+    if not created:
+        event_id = instance.pk
+        transaction.on_commit(lambda: publish_availability(event_id))
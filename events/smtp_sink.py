@@ -0,0 +1,119 @@
+"""
+A minimal in-process SMTP server for benchmarks and local testing.
+
+SMTPSink accepts connections on localhost, speaks just enough SMTP for
+Django's SMTP backend (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT) and
+throws the messages away after counting them. An optional per-message
+delay stands in for a remote server's round trip.
+
+    with SMTPSink() as sink:
+        with override_settings(**sink.email_settings()):
+            send_mail(...)
+        print(sink.messages, sink.connections)
+"""
+
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode('ascii'))
+
+    def handle(self):
+        sink = self.server.sink
+        sink._record('connections')
+        self.reply('220 localhost GreenEvents SMTP sink')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip().upper()
+            verb = command.split(' ', 1)[0]
+            if verb == 'EHLO':
+                self.wfile.write(b'250-localhost\r\n250-8BITMIME\r\n250 SMTPUTF8\r\n')
+            elif verb in ('HELO', 'MAIL', 'RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                sink._record('recipients')
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                size = 0
+                for data in self.rfile:
+                    if data in (b'.\r\n', b'.\n'):
+                        break
+                    size += len(data)
+                if sink.delay:
+                    time.sleep(sink.delay)
+                sink._record('messages', size)
+                self.reply('250 OK: queued')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class _ThreadingSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPSink:
+    """Counts connections, recipients, messages and bytes received"""
+
+    def __init__(self, host='127.0.0.1', port=0, delay=0.0):
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connections = 0
+            self.recipients = 0
+            self.messages = 0
+            self.bytes = 0
+
+    def _record(self, counter, size=0):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            self.bytes += size
+
+    def start(self):
+        self._server = _ThreadingSMTPServer((self.host, self.port), _SMTPHandler)
+        self._server.sink = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='smtp-sink', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def email_settings(self):
+        """Settings that point Django's SMTP backend at this sink"""
+        return {
+            'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+            'EMAIL_HOST': self.host,
+            'EMAIL_PORT': self.port,
+            'EMAIL_USE_SSL': False,
+            'EMAIL_USE_TLS': False,
+            'EMAIL_HOST_USER': '',
+            'EMAIL_HOST_PASSWORD': '',
+        }
@@ -0,0 +1,91 @@
+"""
+SQLite tuning for running the site on a single database file.
+
+tune_connection() runs for every new SQLite connection (it is connected to
+connection_created in EventsConfig.ready) and applies SQLITE_PRAGMAS:
+
+    journal_mode=WAL      readers no longer block the writer or each other
+    synchronous=NORMAL    no fsync per commit in WAL mode (still crash-safe)
+    busy_timeout          wait for a lock instead of failing at once
+    cache_size/mmap_size  keep hot pages in memory
+    temp_store=MEMORY     sorts and temp indexes never touch the disk
+
+DATABASES[alias]['PRAGMAS'] overrides the setting for one alias ({}
+leaves that connection at SQLite's defaults). journal_mode is skipped
+for in-memory databases such as the test database.
+
+SQLite still allows only one writer at a time. A transaction that starts
+by reading and then writes (check capacity, then insert a registration)
+can deadlock against another one doing the same, and SQLite then fails
+one of them with "database is locked" without waiting. settings sets
+OPTIONS['transaction_mode'] to IMMEDIATE, so every atomic() takes the
+write lock up front and waits for it instead. write_transaction() wraps
+the hot write paths: it queues threads of this process on a lock first,
+so they hand the database over directly rather than each polling in
+SQLite's busy handler.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 20000,
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+
+_write_locks = {}
+_write_locks_guard = threading.Lock()
+
+
+def pragmas_for(connection):
+    pragmas = connection.settings_dict.get('PRAGMAS')
+    if pragmas is None:
+        pragmas = getattr(settings, 'SQLITE_PRAGMAS', DEFAULT_PRAGMAS)
+    if connection.is_in_memory_db():
+        pragmas = {name: value for name, value in pragmas.items() if name != 'journal_mode'}
+    return pragmas
+
+
+def tune_connection(sender, connection, **kwargs):
+    """connection_created receiver: apply the pragmas to a new SQLite connection"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas_for(connection).items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def install():
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(tune_connection, dispatch_uid='events.sqlite.tune')
+
+
+def _write_lock(using):
+    with _write_locks_guard:
+        return _write_locks.setdefault(using, threading.RLock())
+
+
+@contextmanager
+def write_transaction(using=DEFAULT_DB_ALIAS, lock=None):
+    """
+    atomic() for hot write paths. On SQLite, threads of this process take
+    turns before BEGIN, so only one of them at a time waits on the file lock.
+    Elsewhere (PostgreSQL) the row of the ``lock`` instance, if given, is
+    locked with SELECT ... FOR UPDATE instead.
+    """
+    if connections[using].vendor != 'sqlite':
+        with transaction.atomic(using=using):
+            if lock is not None:
+                list(type(lock)._base_manager.using(using).select_for_update().filter(pk=lock.pk).values_list('pk'))
+            yield
+        return
+    with _write_lock(using), transaction.atomic(using=using):
+        yield
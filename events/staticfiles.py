@@ -0,0 +1,225 @@
+"""
+Hashed, precompressed static files served straight from the app.
+
+At build time ``collectstatic`` uses CompressedManifestStaticFilesStorage.
+It copies every asset under a content-hashed name (style.css becomes
+style.3f2a9c1e4b7d.css, and {% static %} points at that name). It also
+writes .gz and, when the Brotli package is installed, .br copies of each
+compressible file, at maximum compression. Doing this once at build time
+means requests never pay for compression.
+
+At run time StaticFilesMiddleware answers requests under STATIC_URL from
+STATIC_ROOT before the rest of the stack runs: no session, no user, no
+URL resolving. It picks the smallest variant the client accepts (br, then
+gzip, then the plain file). Hashed names can never change content, so
+they are sent with a one-year immutable Cache-Control; browsers and CDNs
+then never re-validate them. Unhashed names get STATIC_MAX_AGE and an
+ETag. Small files are kept in memory after the first request.
+
+Without a collected STATIC_ROOT (e.g. in development, where runserver
+serves STATICFILES_DIRS itself) the middleware just passes requests on.
+"""
+
+import gzip
+import mimetypes
+import os
+import posixpath
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+
+try:
+    import brotli
+except ImportError:  # .br variants are skipped without it
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ico', '.ttf', '.otf', '.eot',
+}
+MIN_COMPRESS_SIZE = 256
+# A variant must save at least this much to be worth serving
+MAX_COMPRESSED_RATIO = 0.95
+# Files up to this size are served from memory after the first request
+MAX_MEMORY_SIZE = 1024 * 1024
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Preferred first
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+def compress(data):
+    """{encoding suffix: compressed bytes} for the variants worth keeping"""
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return {
+        suffix: compressed for suffix, compressed in variants.items()
+        if len(compressed) <= len(data) * MAX_COMPRESSED_RATIO
+    }
+
+
+def compressible(name):
+    return posixpath.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest (hashed names) storage that also writes .gz/.br variants"""
+
+    # Fall back to the plain name for files collected before the manifest
+    # existed, rather than erroring in {% static %}
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(self.hashed_files) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if compressible(name) and self.exists(name):
+                self.write_variants(name)
+
+    def write_variants(self, name):
+        with self.open(name) as handle:
+            data = handle.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compressed in compress(data).items():
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
+
+
+def accepted_encodings(header):
+    """Content codings the client accepts (ignoring any with q=0)"""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        if re.search(r'q\s*=\s*0(\.0*)?\s*$', params):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticFile:
+    """One collected file and its precompressed variants"""
+
+    def __init__(self, path, immutable):
+        stat = os.stat(path)
+        self.path = path
+        self.mtime = stat.st_mtime
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type in ('application/javascript', 'image/svg+xml'):
+            self.content_type += '; charset=utf-8'
+        self.cache_control = (
+            IMMUTABLE_CACHE_CONTROL if immutable
+            else f'public, max-age={getattr(settings, "STATIC_MAX_AGE", 60)}'
+        )
+        self.last_modified = http_date(stat.st_mtime)
+        etag = f'{int(stat.st_mtime):x}-{stat.st_size:x}'
+
+        # encoding -> (file path, size, etag)
+        self.variants = {None: (path, stat.st_size, f'"{etag}"')}
+        for encoding, suffix in ENCODINGS:
+            if os.path.isfile(path + suffix):
+                self.variants[encoding] = (path + suffix, os.path.getsize(path + suffix), f'"{etag}-{encoding}"')
+        self._bodies = {}
+
+    def choose(self, accept_encoding):
+        if len(self.variants) > 1 and accept_encoding:
+            accepted = accepted_encodings(accept_encoding)
+            for encoding, _ in ENCODINGS:
+                if encoding in self.variants and encoding in accepted:
+                    return encoding
+        return None
+
+    def body(self, encoding):
+        path, size, _ = self.variants[encoding]
+        if size > MAX_MEMORY_SIZE:
+            return None
+        if encoding not in self._bodies:
+            with open(path, 'rb') as handle:
+                self._bodies[encoding] = handle.read()
+        return self._bodies[encoding]
+
+    def response(self, request):
+        encoding = self.choose(request.headers.get('Accept-Encoding', ''))
+        path, size, etag = self.variants[encoding]
+
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            body = self.body(encoding)
+            if body is None:
+                response = FileResponse(open(path, 'rb'), content_type=self.content_type)
+            else:
+                response = HttpResponse(body, content_type=self.content_type)
+            response['Content-Length'] = str(size)
+            response['Last-Modified'] = self.last_modified
+            if encoding:
+                response['Content-Encoding'] = encoding
+
+        response['ETag'] = etag
+        response['Cache-Control'] = self.cache_control
+        if len(self.variants) > 1:
+            response['Vary'] = 'Accept-Encoding'
+        return response
+
+
+class StaticFilesMiddleware:
+    """Serves collected static files (hashed, precompressed) ahead of the rest of the stack"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        prefix = settings.STATIC_URL or ''
+        if not settings.STATIC_ROOT or not prefix.startswith('/'):
+            # Nothing collected, or static files live on another host
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = prefix
+        self.root = str(settings.STATIC_ROOT)
+        self.files = {}
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.serve(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        # A cached file is a dict lookup; only its first request touches the disk
+        return self.serve(request) or await self.get_response(request)
+
+    def immutable(self, name):
+        return name in getattr(staticfiles_storage, 'hashed_files', {}).values()
+
+    def find(self, name):
+        if not name:
+            return None
+        static_file = self.files.get(name)
+        if static_file is not None and not settings.DEBUG:
+            return static_file
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+        if static_file is None or static_file.mtime != os.path.getmtime(path):
+            static_file = self.files[name] = StaticFile(path, self.immutable(name))
+        return static_file
+
+    def serve(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith(self.prefix):
+            return None
+        static_file = self.find(request.path[len(self.prefix):])
+        return static_file.response(request) if static_file is not None else None
@@ -0,0 +1,11 @@
+from django import template
+
+from events.categories import get_category
+
+register = template.Library()
+
+
+@register.filter
+def category(key):
+    """The registry entry for a category key: {{ event.category|category }}"""
+    return get_category(key)
@@ -0,0 +1,92 @@
+import csv
+import io
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from events.admin import EstimatedCountPaginator
+from events.models import EventRegistration
+
+from .utils import make_event, make_volunteer, plain_static_files
+
+
+@plain_static_files
+class RegistrationAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        organizer = User.objects.create_user('organizer', password='pw')
+        cls.event = make_event(organizer, capacity=2)
+        cls.other_event = make_event(organizer, title='Other')
+        volunteers = [make_volunteer(name) for name in ['ada', 'bob', 'cy', 'dee']]
+        cls.confirmed = EventRegistration.objects.create(event=cls.event, volunteer=volunteers[0])
+        cls.waiting = [
+            EventRegistration.objects.create(event=cls.event, volunteer=volunteer, status='waitlist')
+            for volunteer in volunteers[1:]
+        ]
+        # Waited longest last, so the promotion order can't come from the ids
+        for minutes, registration in enumerate(cls.waiting):
+            EventRegistration.objects.filter(pk=registration.pk).update(
+                registered_at=timezone.now() - timedelta(minutes=minutes),
+            )
+        cls.elsewhere = EventRegistration.objects.create(event=cls.other_event, volunteer=volunteers[0])
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        patcher = mock.patch('events.registrations.publish_availability')
+        self.published = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def act(self, action, selected, model='eventregistration'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse(f'admin:events_{model}_changelist'), {
+                'action': action, '_selected_action': [obj.pk for obj in selected],
+            })
+
+    def statuses(self):
+        return dict(EventRegistration.objects.values_list('volunteer__username', 'status').filter(event=self.event))
+
+    def test_cancel(self):
+        self.act('cancel_registrations', [self.confirmed, self.elsewhere])
+        self.assertEqual(self.statuses()['ada'], 'cancelled')
+        self.elsewhere.refresh_from_db()
+        self.assertEqual(self.elsewhere.status, 'cancelled')
+        self.assertEqual(sorted(call.args[0] for call in self.published.call_args_list),
+                         [self.event.pk, self.other_event.pk])
+
+    def test_promote_fills_free_spots_first_come_first_served(self):
+        self.act('promote_waitlist', [self.confirmed])
+        self.assertEqual(self.statuses(), {'ada': 'confirmed', 'bob': 'waitlist', 'cy': 'waitlist', 'dee': 'confirmed'})
+        self.published.assert_called_once_with(self.event.pk)
+
+        # Full now: promoting again changes nothing
+        self.act('promote_waitlist', [self.confirmed])
+        self.assertEqual(list(self.statuses().values()).count('confirmed'), 2)
+
+    def test_cancelling_makes_room_for_the_event_action(self):
+        self.act('cancel_registrations', [self.confirmed])
+        self.act('promote_waitlist', [self.event], model='event')
+        self.assertEqual(self.statuses(), {'ada': 'cancelled', 'bob': 'waitlist', 'cy': 'confirmed', 'dee': 'confirmed'})
+
+    def test_export_streams_csv(self):
+        response = self.act('export_registrations', [self.confirmed, *self.waiting])
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:3], ['Registration ID', 'Event ID', 'Event'])
+        self.assertEqual([row[4] for row in rows[1:]], ['ada', 'bob', 'cy', 'dee'])
+
+    def test_big_unfiltered_lists_show_an_estimate(self):
+        EventRegistration.objects.filter(pk=self.waiting[0].pk).delete()
+        registrations = EventRegistration.objects.all()
+        with mock.patch('events.admin.ESTIMATE_THRESHOLD', 1):
+            self.assertEqual(EstimatedCountPaginator(registrations.order_by('pk'), 10).count,
+                             self.elsewhere.pk - self.confirmed.pk + 1)
+            self.assertEqual(EstimatedCountPaginator(registrations.filter(status='waitlist'), 10).count, 2)
+            response = self.client.get(reverse('admin:events_eventregistration_changelist'))
+        self.assertEqual(response.status_code, 200)
+        # The pk span, not a COUNT(*): one row was deleted
+        self.assertEqual(response.context['cl'].result_count, 5)
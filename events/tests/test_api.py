@@ -0,0 +1,38 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .utils import make_event
+
+
+class ApiCursorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create_user('organizer', password='pw')
+        start = timezone.now() + timedelta(days=1)
+        # Pairs share a date, so the id breaks ties
+        cls.events = [make_event(organizer, title=f'Event {i}', date=start + timedelta(hours=i // 2)) for i in range(7)]
+        make_event(organizer, title='Finished', date=timezone.now() - timedelta(days=1))
+
+    def test_pages_cover_every_event_once_in_order(self):
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 2, 'fields': 'id'}
+            if cursor:
+                params['cursor'] = cursor
+            body = json.loads(self.client.get(reverse('api_event_list'), params).content)
+            self.assertLessEqual(len(body['data']), 2)
+            seen += [row['id'] for row in body['data']]
+            cursor = body['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(seen, [event.pk for event in self.events])
+
+    def test_bad_cursor(self):
+        response = self.client.get(reverse('api_event_list'), {'cursor': 'nonsense'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content), {'error': 'Invalid cursor'})
@@ -0,0 +1,71 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from events.archive import archive_finished_events, archived_events, listed_events
+from events.models import Event
+
+from .utils import make_event, make_organizer, plain_static_files
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = make_organizer('organizer', organization_name='Green Team')
+        now = timezone.now()
+        cls.upcoming = make_event(cls.organizer, title='Upcoming')
+        cls.running = make_event(cls.organizer, title='Running', date=now - timedelta(days=1), end_date=now + timedelta(hours=3))
+        cls.finished = [
+            make_event(cls.organizer, title=f'Finished {i}', category='recycling' if i else 'workshop',
+                       date=now - timedelta(days=i + 1))
+            for i in range(3)
+        ]
+        cls.cancelled = make_event(cls.organizer, title='Cancelled', date=now - timedelta(days=2), is_active=False)
+
+    def test_listing_only_holds_events_still_to_come(self):
+        # Finished events drop off before the job archives them
+        self.assertEqual(list(listed_events()), [self.running, self.upcoming])
+        archive_finished_events()
+        self.assertEqual(list(listed_events()), [self.running, self.upcoming])
+
+    def test_archive_in_batches(self):
+        self.assertEqual(archive_finished_events(batch_size=2), 3)
+        self.assertEqual(list(archived_events()), self.finished)
+        self.assertEqual(archive_finished_events(), 0)
+        self.assertIsNone(Event.all_objects.get(pk=self.cancelled.pk).archived_at)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('archive_past_events', batch_size=1, stdout=out)
+        self.assertIn('Archived 3 events', out.getvalue())
+        self.assertIn('2 upcoming events listed', out.getvalue())
+
+    @plain_static_files
+    def test_archive_page_search(self):
+        archive_finished_events()
+
+        def titles(**params):
+            response = self.client.get(reverse('event_archive'), params)
+            return [event.title for event in response.context['events']]
+
+        self.assertEqual(titles(), ['Finished 0', 'Finished 1', 'Finished 2'])
+        self.assertEqual(titles(category='recycling', query='2'), ['Finished 2'])
+        self.assertEqual(titles(category='nonsense'), ['Finished 0', 'Finished 1', 'Finished 2'])
+
+    def test_moving_an_archived_event_forward_lists_it_again(self):
+        archive_finished_events()
+        event = self.finished[0]
+        self.client.force_login(self.organizer)
+        later = timezone.localtime() + timedelta(days=10)
+        response = self.client.post(reverse('edit_event', args=[event.pk]), {
+            'title': event.title, 'description': event.description, 'category': event.category,
+            'location': event.location, 'date': later.strftime('%Y-%m-%d %H:%M'), 'capacity': event.capacity,
+        })
+        self.assertEqual(response.status_code, 302)
+        event.refresh_from_db()
+        self.assertIsNone(event.archived_at)
+        self.assertIn(event, listed_events())
@@ -0,0 +1,49 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from events.models import Attendance, Event, EventRegistration, VolunteerProfile
+
+from .utils import make_event, make_volunteer
+
+
+class ClosePastEventsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user('organizer', password='pw')
+        cls.ada, cls.bob = make_volunteer('ada'), make_volunteer('bob')
+        past = timezone.now() - timedelta(days=2)
+        cls.door = make_event(cls.organizer, date=past)
+        cls.no_door = make_event(cls.organizer, date=past)
+        cls.multi_day = make_event(cls.organizer, date=past, end_date=timezone.now() + timedelta(days=1))
+        cls.cancelled = make_event(cls.organizer, date=past, is_active=False)
+        for event in (cls.door, cls.no_door, cls.multi_day, cls.cancelled):
+            for volunteer in (cls.ada, cls.bob):
+                EventRegistration.objects.create(event=event, volunteer=volunteer)
+        cls.door.registrations.filter(volunteer=cls.ada).update(checked_in_at=past)
+
+    def close(self):
+        call_command('close_past_events', stdout=StringIO())
+
+    def attendees(self, event):
+        return set(Attendance.objects.filter(event=event).values_list('volunteer__username', 'source'))
+
+    def test_ledger(self):
+        self.close()
+        self.assertEqual(self.attendees(self.door), {('ada', 'check_in')})
+        self.assertEqual(self.attendees(self.no_door), {('ada', 'registration'), ('bob', 'registration')})
+        self.assertEqual(self.attendees(self.multi_day), set())
+        self.assertEqual(self.attendees(self.cancelled), set())
+        self.assertEqual(VolunteerProfile.objects.get(user=self.ada).total_events_attended, 2)
+        self.assertEqual(VolunteerProfile.objects.get(user=self.bob).total_events_attended, 1)
+
+    def test_closing_again_only_looks_at_new_events(self):
+        self.close()
+        self.assertEqual(Event.objects.filter(attendance_closed_at__isnull=False).count(), 3)
+        Attendance.objects.filter(event=self.no_door).delete()
+        self.close()
+        self.assertEqual(self.attendees(self.no_door), set())
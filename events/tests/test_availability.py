@@ -0,0 +1,12 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from .utils import make_event
+
+
+class AvailabilityStreamTests(TestCase):
+    def test_no_stream_under_wsgi(self):
+        event = make_event(User.objects.create_user('organizer', password='pw'))
+        response = self.client.get(reverse('event_availability_stream', args=[event.pk]))
+        self.assertEqual(response.status_code, 204)
@@ -0,0 +1,44 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from events import calendar as ical
+from events.models import Event
+
+from .utils import make_event
+
+
+class FeedEtagTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice', password='pw')
+        cls.bob = User.objects.create_user('bob', password='pw')
+
+    def setUp(self):
+        cache.clear()
+
+    def feed(self, user, **headers):
+        url = reverse('organizer_calendar_feed', args=[ical.feed_token(user, 'organizer')])
+        response = self.client.get(url, headers=headers)
+        if response.streaming:
+            response.body = b''.join(response.streaming_content)
+        return response
+
+    def test_same_contents_different_owners(self):
+        alice, bob = self.feed(self.alice), self.feed(self.bob)
+        self.assertNotEqual(alice['ETag'], bob['ETag'])
+        self.assertEqual(self.feed(self.bob, if_none_match=alice['ETag']).status_code, 200)
+
+    def test_not_modified_until_an_event_changes(self):
+        etag = self.feed(self.alice)['ETag']
+        self.assertEqual(self.feed(self.alice, if_none_match=etag).status_code, 304)
+        make_event(self.alice)
+        response = self.feed(self.alice, if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Beach cleanup', response.body)
+
+    def test_etag_covers_the_scope(self):
+        events = Event.objects.none()
+        self.assertEqual(ical.feed_etag('organizer:1@x', 'Feed', events), ical.feed_etag('organizer:1@x', 'Feed', events))
+        self.assertNotEqual(ical.feed_etag('organizer:1@x', 'Feed', events), ical.feed_etag('organizer:2@x', 'Feed', events))
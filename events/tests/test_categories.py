@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.template import Context, Template
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, TestCase
+
+from events.categories import CATEGORIES, CATEGORY_CHOICES, UNKNOWN, category_label, get_category
+from events.models import Event
+
+from .utils import make_event
+
+
+class CategoryRegistryTests(SimpleTestCase):
+    def test_choices_come_from_the_registry(self):
+        self.assertIs(Event.CATEGORY_CHOICES, CATEGORY_CHOICES)
+        self.assertEqual([key for key, _ in CATEGORY_CHOICES], list(CATEGORIES))
+        self.assertEqual(category_label('recycling'), '♻️ Recycling Drive')
+
+    def test_unknown_keys(self):
+        self.assertIs(get_category('knitting'), UNKNOWN)
+        self.assertEqual(category_label('knitting'), 'knitting')
+
+    def test_every_category_has_full_impact_coefficients(self):
+        for category in [*CATEGORIES.values(), UNKNOWN]:
+            self.assertEqual(set(category.impact), set(UNKNOWN.impact), category)
+
+    def test_filter(self):
+        template = Template('{% load event_categories %}{% with cat=key|category %}{{ cat.icon }} {{ cat.name }}{% endwith %}')
+        self.assertEqual(template.render(Context({'key': 'tree_planting'})), '🌳 Tree Planting')
+        self.assertEqual(template.render(Context({'key': ''})), '🌿 Green Event')
+
+
+class CategoryCardTests(TestCase):
+    def test_card_shows_the_registry_entry(self):
+        organizer = User.objects.create_user('organizer', password='pw')
+        for key in ['e_waste', 'no_longer_offered']:
+            event = make_event(organizer, category=key)
+            event.confirmed_count = 0
+            html = render_to_string('events/includes/event_card.html', {'event': event})
+            category = get_category(key)
+            self.assertIn(f'background-color: {category.color};', html)
+            self.assertIn(category.label, html)
+            self.assertIn(category.image.replace('&', '&amp;'), html)
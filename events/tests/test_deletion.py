@@ -0,0 +1,59 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from events.deletion import Purger, soft_delete_event, soft_delete_user
+from events.models import Event, EventRegistration, UserHistory
+
+from .utils import make_event, make_volunteer
+
+
+class PurgeDeletedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user('organizer', password='pw')
+        cls.event = make_event(cls.organizer)
+        cls.volunteers = [make_volunteer(f'volunteer{i}') for i in range(5)]
+        for volunteer in cls.volunteers:
+            EventRegistration.objects.create(event=cls.event, volunteer=volunteer)
+            UserHistory.objects.create(event=cls.event, user=volunteer)
+
+    def purge(self, **options):
+        call_command('purge_deleted', stdout=StringIO(), **options)
+
+    def test_soft_delete_hides_the_event_and_queues_a_job(self):
+        job = soft_delete_event(self.event, requested_by=self.organizer)
+        self.assertFalse(Event.objects.filter(pk=self.event.pk).exists())
+        self.assertTrue(Event.all_objects.filter(pk=self.event.pk, is_active=False).exists())
+        self.assertEqual(job.status, 'pending')
+        self.assertEqual(soft_delete_event(self.event), job)
+
+    def test_purge_in_batches(self):
+        job = soft_delete_event(self.event)
+        self.purge(batch_size=2)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.rows_deleted), ('done', 10))
+        self.assertFalse(Event.all_objects.filter(pk=self.event.pk).exists())
+        self.assertFalse(EventRegistration.objects.filter(event_id=self.event.pk).exists())
+        self.assertEqual(User.objects.filter(pk__in=[v.pk for v in self.volunteers]).count(), 5)
+
+    def test_out_of_time_resumes(self):
+        job = soft_delete_event(self.event)
+        self.assertFalse(Purger(batch_size=2, deadline=0).run(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'running')
+        self.assertTrue(Event.all_objects.filter(pk=self.event.pk).exists())
+        self.purge()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+
+    def test_user_purge_takes_their_events(self):
+        soft_delete_user(self.organizer)
+        self.organizer.refresh_from_db()
+        self.assertFalse(self.organizer.is_active)
+        self.assertFalse(Event.objects.filter(organizer=self.organizer).exists())
+        self.purge()
+        self.assertFalse(User.objects.filter(pk=self.organizer.pk).exists())
+        self.assertFalse(Event.all_objects.filter(pk=self.event.pk).exists())
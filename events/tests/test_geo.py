@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from events.geo import (
+    bbox_filter, bounding_box, geocode, grid_cell, haversine_km, parse_point, radius_filter, sort_by_distance,
+)
+from events.models import Event
+
+from .utils import make_event, plain_static_files
+
+
+class GeocodeTests(SimpleTestCase):
+    def test_names_and_addresses(self):
+        self.assertEqual(geocode('Montréal').name, 'Montreal')
+        self.assertEqual(geocode('Saint John’s').name, "St. John's")
+        self.assertEqual(geocode('Ville de Québec').name, 'Quebec City')
+        # The city comes last in an address; longer names win ties
+        self.assertEqual(geocode('12 Victoria Park Ave, Toronto').name, 'Toronto')
+        self.assertEqual(geocode('Old Port, Quebec City').name, 'Quebec City')
+        self.assertEqual(geocode('Main beach', 'Ottawa').name, 'Ottawa')
+        self.assertIsNone(geocode('Atlantis', ''))
+
+    def test_parse_point(self):
+        self.assertEqual(parse_point('43.65, -79.38'), (43.65, -79.38, '43.6500, -79.3800'))
+        self.assertEqual(parse_point('Toronto')[2], 'Toronto')
+        self.assertIsNone(parse_point('91,0'))
+        self.assertIsNone(parse_point('nowhere'))
+
+    def test_grid_wraps_at_the_antimeridian(self):
+        self.assertEqual(grid_cell(0, 180), grid_cell(0, -180))
+        min_lat, max_lat, min_lng, max_lng = bounding_box(0, 179.95, 20)
+        self.assertGreater(max_lng, 180)
+        self.assertLess(min_lat, 0)
+
+
+class NearSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create_user('organizer', password='pw')
+        cls.toronto = make_event(organizer, title='Toronto cleanup', location='Harbourfront, Toronto')
+        cls.mississauga = make_event(organizer, title='Mississauga cleanup', location='Mississauga')
+        cls.ottawa = make_event(organizer, title='Ottawa cleanup', location='Ottawa')
+        cls.nowhere = make_event(organizer, title='Online talk', location='Zoom')
+
+    def test_events_are_geocoded_on_save(self):
+        self.assertEqual((self.toronto.city, self.toronto.geo_cell), ('Toronto', grid_cell(43.6532, -79.3832)))
+        self.assertIsNone(self.nowhere.geo_cell)
+
+    def test_radius_filter_then_distance(self):
+        candidates = Event.objects.filter(radius_filter(43.6532, -79.3832, 50))
+        self.assertEqual(set(candidates), {self.toronto, self.mississauga})
+        nearest = sort_by_distance(list(candidates), 43.6532, -79.3832, 50)
+        self.assertEqual(nearest, [self.toronto, self.mississauga])
+        self.assertAlmostEqual(nearest[1].distance_km, haversine_km(43.6532, -79.3832, 43.5890, -79.6441))
+
+    def test_box_across_the_antimeridian(self):
+        Event.objects.filter(pk=self.nowhere.pk).update(latitude=0.0, longitude=-179.95, geo_cell=grid_cell(0, -179.95))
+        self.assertEqual(list(Event.objects.filter(radius_filter(0, 179.95, 20))), [self.nowhere])
+        self.assertFalse(Event.objects.filter(bbox_filter(-1, 1, 170, 179)).exists())
+
+    def test_sort_drops_the_box_corners(self):
+        corner = SimpleNamespace(latitude=43.6532 + 0.4, longitude=-79.3832 + 0.55)
+        self.assertEqual(sort_by_distance([corner], 43.6532, -79.3832, 50), [])
+
+    @plain_static_files
+    def test_home_near_me(self):
+        response = self.client.get(reverse('home'), {'near': 'Toronto', 'radius_km': 50})
+        self.assertEqual([event.title for event in response.context['events']], ['Toronto cleanup', 'Mississauga cleanup'])
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from events.impact import aplatform_impact, compute_impact, rebuild_impact_summary, summary_query
+from events.models import Attendance, EventImpactReport, ImpactSummary
+
+from .utils import make_event, make_volunteer
+
+
+class ImpactTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user('organizer', password='pw')
+        cls.ada, cls.bob = make_volunteer('ada'), make_volunteer('bob')
+        past = timezone.now() - timedelta(days=3)
+        closed = {'date': past, 'attendance_closed_at': past + timedelta(days=1)}
+        cls.planting = make_event(cls.organizer, category='tree_planting', location='Toronto', **closed)
+        cls.cleanup = make_event(cls.organizer, category='beach_cleanup', **closed)
+        cls.cancelled = make_event(cls.organizer, category='tree_planting', is_active=False, **closed)
+        cls.open = make_event(cls.organizer, category='tree_planting', date=past)
+        for event, volunteers in [(cls.planting, [cls.ada, cls.bob]), (cls.cleanup, [cls.ada]),
+                                  (cls.cancelled, [cls.ada]), (cls.open, [cls.ada, cls.bob])]:
+            for volunteer in volunteers:
+                Attendance.objects.create(event=event, volunteer=volunteer, source='registration')
+        # Reported figures replace the estimate; the rest stay estimated
+        EventImpactReport.objects.create(event=cls.cleanup, waste_collected_kg=50)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_totals_per_scope(self):
+        totals = compute_impact()
+        platform = totals[('platform', '')]
+        self.assertEqual((platform['events'], platform['attendees']), (2, 3))
+        self.assertEqual(platform['trees_planted'], 20)
+        self.assertEqual(platform['waste_collected_kg'], 50)
+        self.assertEqual(platform['hours_volunteered'], 2 * 4 + 3)
+        self.assertEqual(totals[('city', 'Toronto')]['events'], 1)
+        self.assertEqual(totals[('organizer', str(self.organizer.pk))], platform)
+        # Each attendee gets an equal share of the event's figures
+        ada = totals[('volunteer', str(self.ada.pk))]
+        self.assertEqual((ada['events'], ada['trees_planted'], ada['waste_collected_kg']), (2, 10, 50))
+        self.assertEqual(totals[('volunteer', str(self.bob.pk))]['trees_planted'], 10)
+
+    @override_settings(IMPACT_COEFFICIENTS={'tree_planting': {'trees_planted': 1}})
+    def test_coefficients_can_be_adjusted(self):
+        self.assertEqual(compute_impact()[('platform', '')]['trees_planted'], 2)
+
+    def test_summary_table_and_banner(self):
+        counts = rebuild_impact_summary()
+        self.assertEqual(counts, {'platform': 1, 'organizer': 1, 'city': 1, 'volunteer': 2})
+        self.assertEqual(summary_query('volunteer', self.bob.pk).get().attendees, 1)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(async_to_sync(aplatform_impact)().trees_planted, 20)
+        with self.assertNumQueries(0):
+            async_to_sync(aplatform_impact)()
+
+        rebuild_impact_summary(now=timezone.now() - timedelta(days=30))
+        self.assertFalse(ImpactSummary.objects.exists())
+        self.assertIsNone(async_to_sync(aplatform_impact)())
@@ -0,0 +1,75 @@
+import io
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from events.importer import clone_event, import_events, read_rows
+from events.models import Event
+from events.recurrence import parse_rule
+
+from .utils import make_event
+
+CSV = '''title,description,category,location,date,capacity,allow_waitlist
+Tree day,Planting,tree_planting,Toronto,2030-05-02 10:00,20,yes
+Shore sweep,Litter,beach_cleanup,Main beach,2030-05-03 09:00,15,
+'''
+
+
+class ImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user('organizer', password='pw')
+
+    def test_csv_and_jsonl(self):
+        rows = read_rows(io.BytesIO(CSV.encode('utf-8-sig')), 'events.csv')
+        self.assertEqual([row['title'] for row in rows], ['Tree day', 'Shore sweep'])
+        jsonl = '{"title": "Tree day", "capacity": 20}\n\n{"title": "Shore sweep"}\n'
+        self.assertEqual(read_rows(io.StringIO(jsonl), 'events.jsonl')[1], {'title': 'Shore sweep'})
+        with self.assertRaisesMessage(ValueError, 'Line 2'):
+            read_rows(io.StringIO('{"title": "x"}\n{oops\n'), 'events.jsonl')
+
+    def test_valid_rows_are_created_geocoded_in_one_go(self):
+        with self.assertNumQueries(4):  # duplicate check, savepoint, insert, release
+            result = import_events(read_rows(io.StringIO(CSV), 'events.csv'), self.organizer)
+        self.assertTrue(result.ok)
+        self.assertEqual(len(result.created), 2)
+        tree_day = Event.objects.get(title='Tree day')
+        self.assertEqual((tree_day.city, tree_day.allow_waitlist), ('Toronto', True))
+        self.assertIsNotNone(tree_day.latitude)
+        self.assertFalse(Event.objects.get(title='Shore sweep').allow_waitlist)
+
+    def test_nothing_is_written_if_a_row_is_invalid(self):
+        rows = read_rows(io.StringIO(CSV + 'Bad,x,not_a_category,Here,someday,-1,\n'), 'events.csv')
+        result = import_events(rows, self.organizer)
+        self.assertFalse(result.ok)
+        self.assertEqual(sorted(result.errors[3]), ['category', 'date'])
+        self.assertFalse(Event.objects.exists())
+
+        result = import_events(rows, self.organizer, skip_invalid=True)
+        self.assertEqual(len(result.created), 2)
+
+    def test_duplicates_in_the_file_and_the_database(self):
+        rows = read_rows(io.StringIO(CSV), 'events.csv')
+        import_events(rows[:1], self.organizer)
+        result = import_events(rows + rows[1:], self.organizer, dry_run=True)
+        self.assertIn('already have', result.errors[1]['title'][0])
+        self.assertEqual(result.errors[3]['title'], ['Duplicate of row 2.'])
+
+    def test_file_level_errors_are_reported_once(self):
+        result = import_events([{'title': 'x', 'colour': 'green'}] * 3, self.organizer)
+        self.assertEqual(len(result.file_errors), 2)
+        self.assertEqual(result.errors, {})
+
+
+class CloneEventTests(TestCase):
+    def test_clone_keeps_duration_and_skips_existing_dates(self):
+        organizer = User.objects.create_user('organizer', password='pw')
+        start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        event = make_event(organizer, date=start, end_date=start + timedelta(hours=3))
+        make_event(organizer, date=start + timedelta(weeks=2))
+        clones = clone_event(event, parse_rule('FREQ=WEEKLY;COUNT=4'))
+        self.assertEqual([clone.date for clone in clones], [start + timedelta(weeks=1), start + timedelta(weeks=3)])
+        self.assertTrue(all(clone.end_date - clone.date == timedelta(hours=3) for clone in clones))
+        self.assertEqual(Event.objects.filter(title=event.title).count(), 4)
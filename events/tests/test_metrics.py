@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from events import metrics
+from events.metrics import Counter, Histogram, MmapValues, Store, read_file
+from events.models import EventRegistration
+
+from .utils import make_event, make_volunteer
+
+
+class MetricsStoreTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_mmap_file_round_trip_and_growth(self):
+        path = os.path.join(self.directory, 'metrics_1.db')
+        values = MmapValues(path)
+        for i in range(5000):
+            values.add(f'key-{i}', i)
+        values.add('key-1', 0.5)
+        self.assertGreater(os.path.getsize(path), 1 << 16)
+        on_disk = read_file(path)
+        self.assertEqual((len(on_disk), on_disk['key-1'], on_disk['key-4999']), (5000, 1.5, 4999))
+        # A restarted process with the same pid carries on from the file
+        MmapValues(path).add('key-1', 1)
+        self.assertEqual(read_file(path)['key-1'], 2.5)
+
+    def test_scrape_sums_every_process(self):
+        MmapValues(os.path.join(self.directory, 'metrics_999999.db')).add('exited-worker', 3)
+        store = Store()
+        with override_settings(METRICS_DIR=self.directory):
+            store.add('exited-worker', 2)
+            store.add('this-worker', 1)
+            self.assertEqual(dict(store.collect()), {'exited-worker': 5, 'this-worker': 1})
+            self.assertTrue(os.path.exists(os.path.join(self.directory, f'metrics_{os.getpid()}.db')))
+
+
+class ExpositionTests(TestCase):
+    def setUp(self):
+        patchers = [
+            mock.patch('events.metrics.store', Store()),
+            mock.patch('events.metrics._metrics', []),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_text_format(self):
+        requests = Counter('test_requests_total', 'Requests', ['view'])
+        latency = Histogram('test_latency_seconds', 'Latency', ['view'], buckets=(0.1, 1))
+        requests.inc(view='home')
+        requests.inc(2, view='say "hi"\n')
+        for seconds in (0.05, 0.5, 0.7, 3):
+            latency.observe(seconds, view='home')
+        text = metrics.render()
+        self.assertIn('# TYPE test_requests_total counter\n', text)
+        self.assertIn('test_requests_total{view="home"} 1\n', text)
+        self.assertIn('test_requests_total{view="say \\"hi\\"\\n"} 2\n', text)
+        self.assertIn('test_latency_seconds_bucket{view="home",le="0.1"} 1\n', text)
+        self.assertIn('test_latency_seconds_bucket{view="home",le="1.0"} 3\n', text)
+        self.assertIn('test_latency_seconds_bucket{view="home",le="+Inf"} 4\n', text)
+        self.assertIn('test_latency_seconds_sum{view="home"} 4.25\n', text)
+        self.assertIn('test_latency_seconds_count{view="home"} 4\n', text)
+
+    def test_gauges_are_read_at_scrape_time(self):
+        organizer = User.objects.create_user('organizer', password='pw')
+        upcoming, past = make_event(organizer), make_event(organizer, date=timezone.now() - timedelta(days=1))
+        EventRegistration.objects.create(event=upcoming, volunteer=make_volunteer('ada'))
+        EventRegistration.objects.create(event=upcoming, volunteer=make_volunteer('bob'), status='waitlist')
+        EventRegistration.objects.create(event=past, volunteer=make_volunteer('cy'), status='waitlist')
+        text = metrics.render()
+        self.assertIn('greenevents_upcoming_registrations{status="confirmed"} 1\n', text)
+        self.assertIn('greenevents_upcoming_registrations{status="cancelled"} 0\n', text)
+        self.assertIn('greenevents_waitlist_size 1\n', text)
+
+    def test_middleware_counts_by_view(self):
+        metrics._metrics.extend([metrics.REQUESTS, metrics.REQUEST_LATENCY])
+        self.client.get(reverse('api_event_list'))
+        self.client.get('/no-such-page/')
+        text = metrics.render()
+        self.assertIn('greenevents_http_requests_total{method="GET",status="200",view="api_event_list"} 1\n', text)
+        self.assertIn('greenevents_http_requests_total{method="GET",status="404",view="unmatched"} 1\n', text)
+        self.assertIn('greenevents_http_request_duration_seconds_count{view="api_event_list"} 1\n', text)
+
+
+class ScrapeAccessTests(TestCase):
+    def scrape(self, address, **headers):
+        return self.client.get(reverse('metrics'), REMOTE_ADDR=address, headers=headers).status_code
+
+    @override_settings(METRICS_TOKEN='', METRICS_ALLOWED_IPS=['127.0.0.1', '::1'])
+    def test_loopback_only_by_default(self):
+        self.assertEqual(self.scrape('127.0.0.1'), 200)
+        self.assertEqual(self.scrape('::1'), 200)
+        self.assertEqual(self.scrape('203.0.113.9'), 403)
+        self.assertEqual(self.scrape('203.0.113.9', authorization='Bearer '), 403)
+
+    @override_settings(METRICS_TOKEN='s3cret', METRICS_ALLOWED_IPS=['10.0.0.0/8'])
+    def test_token_or_allowed_network(self):
+        self.assertEqual(self.scrape('10.1.2.3'), 200)
+        self.assertEqual(self.scrape('127.0.0.1'), 403)
+        self.assertEqual(self.scrape('203.0.113.9', authorization='Bearer s3cret'), 200)
+        self.assertEqual(self.scrape('203.0.113.9', authorization='Bearer wrong'), 403)
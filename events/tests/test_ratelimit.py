@@ -0,0 +1,32 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from events.ratelimit import Rule, take
+
+from .utils import plain_static_files
+
+
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bucket_empties_and_refills(self):
+        rule = Rule('test', '60/m', burst=2)
+        now = 1000.0
+        self.assertEqual(take('bucket', rule, now), 0)
+        self.assertEqual(take('bucket', rule, now), 0)
+        self.assertEqual(take('bucket', rule, now), 1)
+        self.assertEqual(take('bucket', rule, now + 1), 0)
+
+    @plain_static_files
+    @override_settings(RATELIMIT_ENABLED=True, RATE_LIMITS={'contact': {'rate': '2/h', 'methods': ['POST']}})
+    def test_middleware_throttles_the_rule_only(self):
+        url = reverse('contact')
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, {}).status_code, 200)
+        response = self.client.post(url, {})
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        # GETs aren't counted by this rule
+        self.assertEqual(self.client.get(url).status_code, 200)
@@ -0,0 +1,65 @@
+import math
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from events.models import EventRecommendation, EventRegistration, UserHistory
+from events.recommendations import (
+    build_recommendations, interest_categories, interest_fallback, recommended_for_user, similar_events,
+)
+
+from .utils import make_event, make_volunteer
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create_user('organizer', password='pw')
+        soon = timezone.now() + timedelta(days=3)
+        cls.past = make_event(organizer, title='Past cleanup', date=timezone.now() - timedelta(days=3))
+        cls.cleanup = make_event(organizer, title='Cleanup', date=soon)
+        cls.other_cleanup = make_event(organizer, title='Other cleanup', date=soon + timedelta(days=1))
+        cls.workshop = make_event(organizer, title='Workshop', category='workshop', date=soon)
+        for name in ['ada', 'bob']:
+            volunteer = make_volunteer(name)
+            for event in (cls.past, cls.cleanup):
+                EventRegistration.objects.create(event=event, volunteer=volunteer)
+        viewer = make_volunteer('cy')
+        for event in (cls.past, cls.workshop):
+            UserHistory.objects.create(user=viewer, event=event)
+        build_recommendations()
+
+    def test_interest_categories(self):
+        self.assertEqual(interest_categories('Beach Cleaning, ♻️ Recycling Drive,e waste, knitting'),
+                         {'beach_cleanup', 'recycling', 'e_waste'})
+
+    def test_co_registrations_outweigh_views(self):
+        similar = list(similar_events(self.past))
+        # Co-occurrence first, then the same category to fill the row
+        self.assertEqual(similar, [self.cleanup, self.workshop, self.other_cleanup])
+        scores = dict(EventRecommendation.objects.filter(event=self.past).values_list('recommended_event', 'score'))
+        # Both registered (weight 3) for cleanup; one viewer (weight 1) of the workshop
+        self.assertAlmostEqual(scores[self.cleanup.pk], 18 / math.sqrt(19 * 18))
+        self.assertAlmostEqual(scores[self.workshop.pk], 1 / math.sqrt(19 * 1))
+        self.assertEqual(scores[self.other_cleanup.pk], 0)
+
+    def test_finished_events_are_never_recommended(self):
+        self.assertFalse(EventRecommendation.objects.filter(recommended_event=self.past).exists())
+
+    def test_for_a_user(self):
+        newcomer = make_volunteer('dee', interests='Sustainability Workshop')
+        EventRegistration.objects.create(event=self.past, volunteer=newcomer)
+        with self.assertNumQueries(1):
+            recommended = list(recommended_for_user(newcomer, 'Sustainability Workshop'))
+        self.assertEqual(recommended, [self.cleanup, self.workshop, self.other_cleanup])
+        self.assertAlmostEqual(recommended[1].recommendation_score, 1.5 / math.sqrt(19))
+
+        EventRegistration.objects.create(event=self.cleanup, volunteer=newcomer)
+        self.assertNotIn(self.cleanup, recommended_for_user(newcomer))
+
+    def test_cold_start(self):
+        newcomer = make_volunteer('dee')
+        self.assertEqual(list(recommended_for_user(newcomer, 'workshop')), [])
+        self.assertEqual(list(interest_fallback(newcomer, 'workshop')), [self.workshop])
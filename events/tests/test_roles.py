@@ -0,0 +1,38 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from events.roles import get_user_role
+
+from .utils import make_organizer, make_volunteer, plain_static_files
+
+
+@plain_static_files
+class UserRoleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.volunteer = make_volunteer('ada')
+        cls.organizer = make_organizer('greenteam', organization_name='Green Team')
+
+    def test_session_user_comes_with_its_profiles(self):
+        self.client.force_login(self.organizer)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('my_profile'))
+        self.assertEqual(response.status_code, 200)
+        # Loaded with the user; nothing asks for them again
+        profile_queries = [q['sql'] for q in queries if q['sql'].startswith('SELECT "events_organizerprofile"')]
+        self.assertEqual(profile_queries, [])
+        role = get_user_role(response.wsgi_request.user)
+        self.assertTrue(role.is_organizer)
+        self.assertFalse(role.is_volunteer)
+
+    def test_sessions_from_the_previous_backends_stay_logged_in(self):
+        for backend in ['django.contrib.auth.backends.ModelBackend',
+                        'allauth.account.auth_backends.AuthenticationBackend']:
+            with self.subTest(backend=backend):
+                self.client.force_login(self.volunteer, backend=backend)
+                # The async profile page loads the profiles itself for these users
+                response = self.client.get(reverse('my_profile'))
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(get_user_role(response.wsgi_request.user).is_volunteer)
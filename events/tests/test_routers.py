@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import router
+from django.test import SimpleTestCase
+
+from events.models import Event
+from events.routers import REPLICA, PrimaryReplicaRouter, _pinned, replica_reads
+
+
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        patcher = mock.patch('events.routers.has_replica', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def on(self, alias):
+        return SimpleNamespace(_state=SimpleNamespace(db=alias))
+
+    def test_reads_use_the_replica_only_when_asked(self):
+        self.assertIsNone(self.router.db_for_read(Event))
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Event), REPLICA)
+
+    def test_pinned_requests_and_sessions_read_the_primary(self):
+        from django.contrib.sessions.models import Session
+        with replica_reads():
+            self.assertIsNone(self.router.db_for_read(Session))
+            token = _pinned.set(True)
+            try:
+                self.assertIsNone(self.router.db_for_read(Event))
+            finally:
+                _pinned.reset(token)
+
+    def test_objects_read_from_the_replica_are_written_to_the_primary(self):
+        self.assertEqual(self.router.db_for_write(Event, instance=self.on(REPLICA)), 'default')
+
+    def test_writes_stay_on_other_aliases(self):
+        self.assertIsNone(self.router.db_for_write(Event))
+        self.assertIsNone(self.router.db_for_write(Event, instance=self.on('benchmark')))
+        event = Event()
+        event._state.db = 'benchmark'
+        self.assertEqual(router.db_for_write(Event, instance=event), 'benchmark')
+
+    def test_relations(self):
+        self.assertTrue(self.router.allow_relation(self.on('benchmark'), self.on('benchmark')))
+        self.assertTrue(self.router.allow_relation(self.on('default'), self.on(REPLICA)))
+        self.assertIsNone(self.router.allow_relation(self.on('default'), self.on('benchmark')))
+
+    def test_replica_is_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate(REPLICA, 'events'))
+        self.assertIsNone(self.router.allow_migrate('default', 'events'))
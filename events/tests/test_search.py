@@ -0,0 +1,78 @@
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from events.archive import listed_events
+from events.models import Event
+from events.search import acompute_facets, date_bucket_filters
+
+from .utils import make_event, plain_static_files
+
+
+def counts(facet):
+    return {option['value']: option['count'] for option in facet}
+
+
+class FacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create_user('organizer', password='pw')
+        cls.now = timezone.now()
+        make_event(organizer, category='recycling', location='Toronto',
+                   date=cls.now - timedelta(hours=1), end_date=cls.now + timedelta(hours=2))
+        make_event(organizer, category='recycling', location='Toronto', date=cls.now + timedelta(days=1))
+        make_event(organizer, category='e_waste', location='Ottawa', date=cls.now + timedelta(days=20))
+        make_event(organizer, category='beach_cleanup', location='Toronto', date=cls.now + timedelta(days=90))
+        # Not listed: finished, or cancelled
+        make_event(organizer, category='recycling', location='Toronto', date=cls.now - timedelta(days=3))
+        make_event(organizer, category='recycling', location='Toronto', date=cls.now + timedelta(days=1), is_active=False)
+
+    def setUp(self):
+        cache.clear()
+
+    def facets(self, categories=(), cities=(), buckets=()):
+        return async_to_sync(acompute_facets)(listed_events(self.now), list(categories), list(cities), list(buckets), self.now)
+
+    def test_date_buckets_split_the_listing(self):
+        listed = listed_events(self.now)
+        per_bucket = [set(listed.filter(condition).values_list('pk', flat=True))
+                      for condition in date_bucket_filters(self.now).values()]
+        self.assertEqual(sum(len(pks) for pks in per_bucket), listed.count())
+        self.assertEqual(set().union(*per_bucket), set(listed.values_list('pk', flat=True)))
+
+    def test_counts_cover_the_listing(self):
+        facets = self.facets()
+        self.assertEqual(sum(counts(facets['category']).values()), 4)
+        self.assertEqual(sum(counts(facets['when']).values()), 4)
+        self.assertEqual(counts(facets['city']), {'Toronto': 3, 'Ottawa': 1})
+
+    def test_a_facet_ignores_its_own_selection(self):
+        facets = self.facets(categories=['recycling'], cities=['Toronto'])
+        # Other categories still say what picking them would add (within Toronto)
+        self.assertEqual(counts(facets['category'])['beach_cleanup'], 1)
+        self.assertEqual(counts(facets['category'])['e_waste'], 0)
+        self.assertEqual(counts(facets['city']), {'Toronto': 2})
+        self.assertEqual(sum(counts(facets['when']).values()), 2)
+        self.assertEqual([o['value'] for o in facets['category'] if o['selected']], ['recycling'])
+
+    def test_counts_are_cached_per_selection(self):
+        self.facets()
+        Event.objects.update(city='Ottawa')
+        self.assertEqual(counts(self.facets()['city']), {'Toronto': 3, 'Ottawa': 1})
+        self.assertEqual(counts(self.facets(cities=['Ottawa'])['city']), {'Ottawa': 4})
+
+
+@plain_static_files
+class HomeSearchTests(TestCase):
+    def test_cache_key_ignores_an_invalid_search(self):
+        with mock.patch('events.views.acompute_facets', wraps=acompute_facets) as compute:
+            for query in ['one', 'two']:
+                response = self.client.get(reverse('home'), {'query': query, 'radius_km': 'far'})
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual([call.kwargs['cache_key_parts'][0] for call in compute.call_args_list], ['', ''])
@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+from itertools import takewhile
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from events import recurrence
+from events.models import Event, EventSeries, SeriesOccurrenceOverride
+from events.recurrence import MAX_OCCURRENCES, occurrences, parse_rule
+from events.series import expand_series, find_occurrence, materialize, series_in_window, upcoming_occurrences
+
+UTC = ZoneInfo('UTC')
+TORONTO = ZoneInfo('America/Toronto')
+
+
+def at(*args, tz=UTC):
+    return datetime(*args, tzinfo=tz)
+
+
+class RecurrenceTests(SimpleTestCase):
+    def dates(self, rule, start, *window, **kwargs):
+        return list(occurrences(parse_rule(rule), start, *window, **kwargs))
+
+    def test_count(self):
+        dates = self.dates('FREQ=WEEKLY;BYDAY=TU,SA;COUNT=5', at(2026, 1, 6, 18))
+        self.assertEqual([d.day for d in dates], [6, 10, 13, 17, 20])
+        # COUNT applies to the series, not to the window
+        self.assertEqual(self.dates('FREQ=DAILY;COUNT=5', at(2026, 1, 1), at(2026, 1, 4), at(2026, 2, 1)),
+                         [at(2026, 1, 4), at(2026, 1, 5)])
+
+    def test_until_includes_the_whole_day(self):
+        dates = self.dates('FREQ=DAILY;INTERVAL=2;UNTIL=20260107', at(2026, 1, 1, 18))
+        self.assertEqual([d.day for d in dates], [1, 3, 5, 7])
+
+    def test_monthly_skips_missing_days(self):
+        dates = self.dates('FREQ=MONTHLY;COUNT=4', at(2026, 1, 31, 9))
+        self.assertEqual([(d.month, d.day) for d in dates], [(1, 31), (3, 31), (5, 31), (7, 31)])
+
+    def test_wall_clock_kept_across_dst(self):
+        with timezone.override(TORONTO):
+            dates = self.dates('FREQ=WEEKLY;COUNT=3', at(2026, 10, 24, 10, tz=TORONTO))
+        self.assertEqual([d.astimezone(TORONTO).hour for d in dates], [10, 10, 10])
+        self.assertEqual([d.astimezone(UTC).hour for d in dates], [14, 14, 15])
+
+    def test_window_of_an_old_series_matches_a_full_walk(self):
+        start = at(1990, 3, 14, 9, 30)
+        window = at(2026, 3, 29, 12), at(2026, 5, 2)
+        for rule in ['FREQ=DAILY;INTERVAL=3', 'FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,FR',
+                     'FREQ=MONTHLY', 'FREQ=WEEKLY;UNTIL=20260420']:
+            with self.subTest(rule=rule):
+                every = occurrences(parse_rule(rule), start, limit=None)
+                walked = [d for d in takewhile(lambda d: d < window[1], every) if d >= window[0]]
+                self.assertTrue(walked)
+                self.assertEqual(self.dates(rule, start, *window), walked)
+
+    def test_window_cost_does_not_grow_with_age(self):
+        generated = []
+
+        def candidates(*args):
+            for value in real_candidates(*args):
+                generated.append(value)
+                yield value
+
+        real_candidates = recurrence._candidates
+        with mock.patch('events.recurrence._candidates', candidates):
+            dates = self.dates('FREQ=DAILY', at(1950, 1, 1), at(2026, 1, 1), at(2026, 1, 8), limit=None)
+        self.assertEqual(len(dates), 7)
+        self.assertLess(len(generated), 10)
+
+    def test_last_occurrence(self):
+        self.assertEqual(recurrence.last_occurrence(parse_rule('FREQ=WEEKLY;COUNT=3'), at(2026, 1, 1)), at(2026, 1, 15))
+        self.assertEqual(recurrence.last_occurrence(parse_rule('FREQ=MONTHLY;UNTIL=20270101'), at(2026, 1, 31)),
+                         at(2026, 12, 31))
+        self.assertIsNone(recurrence.last_occurrence(parse_rule('FREQ=DAILY'), at(2026, 1, 1)))
+
+    def test_invalid_rules(self):
+        for rule in ['', 'FREQ=YEARLY', 'FREQ=DAILY;COUNT=0', f'FREQ=DAILY;COUNT={MAX_OCCURRENCES + 1}',
+                     'FREQ=MONTHLY;BYDAY=MO', 'FREQ=DAILY;BYHOUR=9', 'FREQ=DAILY;UNTIL=tomorrow']:
+            with self.subTest(rule=rule), self.assertRaises(ValidationError):
+                parse_rule(rule)
+
+
+class SeriesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user('organizer', password='pw')
+        cls.start = timezone.now().replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        cls.series = cls.make_series('FREQ=DAILY')
+
+    @classmethod
+    def make_series(cls, rule, **fields):
+        return EventSeries.objects.create(
+            organizer=cls.organizer, title='Morning litter pick', description='Daily', category='recycling',
+            location='Toronto', first_start=fields.pop('first_start', cls.start), duration=timedelta(hours=2),
+            recurrence=rule, capacity=5, **fields,
+        )
+
+    def expand(self, days=7):
+        return expand_series([self.series], self.start, self.start + timedelta(days=days))
+
+    def test_last_start_is_kept_on_save(self):
+        self.assertIsNone(self.series.last_start)
+        counted = self.make_series('FREQ=WEEKLY;COUNT=4')
+        self.assertEqual(counted.last_start, self.start + timedelta(weeks=3))
+        counted.recurrence = 'FREQ=WEEKLY;COUNT=2'
+        counted.save()
+        self.assertEqual(counted.last_start, self.start + timedelta(weeks=1))
+
+    def test_window_finds_only_series_that_can_occur(self):
+        ended = self.make_series('FREQ=DAILY;COUNT=2', first_start=self.start - timedelta(days=30))
+        later = self.make_series('FREQ=DAILY', first_start=self.start + timedelta(days=60))
+        found = series_in_window(self.start, self.start + timedelta(days=7))
+        self.assertIn(self.series, found)
+        self.assertNotIn(ended, found)
+        self.assertNotIn(later, found)
+
+    def test_expansion_applies_overrides(self):
+        second, third = self.start + timedelta(days=1), self.start + timedelta(days=2)
+        SeriesOccurrenceOverride.objects.create(series=self.series, original_start=second, cancelled=True)
+        SeriesOccurrenceOverride.objects.create(series=self.series, original_start=third, title='Moved',
+                                                date=self.start + timedelta(days=10))
+        dates = [occurrence.date for occurrence in self.expand()]
+        self.assertEqual(len(dates), 5)
+        self.assertNotIn(second, dates)
+        self.assertNotIn(third, dates)
+        moved = self.expand(days=14)[-4]
+        self.assertEqual((moved.title, moved.date, moved.original_start), ('Moved', self.start + timedelta(days=10), third))
+
+    def test_materialized_occurrences_are_not_listed_twice(self):
+        occurrence = self.expand()[0]
+        event = materialize(occurrence)
+        self.assertEqual(materialize(occurrence), event)
+        self.assertEqual(Event.objects.filter(series=self.series).count(), 1)
+        self.assertEqual((event.date, event.end_date, event.capacity), (self.start, self.start + timedelta(hours=2), 5))
+        self.assertNotIn(self.start, [occurrence.date for occurrence in self.expand()])
+
+    def test_find_occurrence(self):
+        self.assertEqual(find_occurrence(self.series, self.start + timedelta(days=400)).date, self.start + timedelta(days=400))
+        self.assertIsNone(find_occurrence(self.series, self.start + timedelta(hours=1)))
+
+    def test_listing_filters_like_the_facets(self):
+        self.assertEqual(len(upcoming_occurrences(self.start, self.start + timedelta(days=7), limit=3)), 3)
+        self.assertEqual(upcoming_occurrences(self.start, self.start + timedelta(days=7), categories=['e_waste']), [])
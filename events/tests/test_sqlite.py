@@ -0,0 +1,97 @@
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from events import sqlite
+from events.models import Event
+
+from .utils import make_event, make_organizer
+
+
+def fake_connection(vendor='sqlite', in_memory=False, cursor=None, **settings_dict):
+    return SimpleNamespace(vendor=vendor, settings_dict=settings_dict, is_in_memory_db=lambda: in_memory, cursor=cursor)
+
+
+class PragmasTests(SimpleTestCase):
+    @override_settings(SQLITE_PRAGMAS={'journal_mode': 'wal', 'busy_timeout': 1000})
+    def test_setting_applies_to_file_databases(self):
+        self.assertEqual(sqlite.pragmas_for(fake_connection()), {'journal_mode': 'wal', 'busy_timeout': 1000})
+
+    @override_settings(SQLITE_PRAGMAS={'journal_mode': 'wal', 'busy_timeout': 1000})
+    def test_in_memory_databases_keep_their_journal_mode(self):
+        self.assertEqual(sqlite.pragmas_for(fake_connection(in_memory=True)), {'busy_timeout': 1000})
+
+    def test_alias_override(self):
+        self.assertEqual(sqlite.pragmas_for(fake_connection(PRAGMAS={'synchronous': 'full'})), {'synchronous': 'full'})
+        self.assertEqual(sqlite.pragmas_for(fake_connection(PRAGMAS={})), {})
+
+    def test_other_vendors_are_left_alone(self):
+        other = fake_connection(vendor='postgresql', cursor=mock.Mock())
+        sqlite.tune_connection(None, other)
+        other.cursor.assert_not_called()
+
+
+class TuneConnectionTests(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    # synchronous can't change inside the test's transaction
+    @override_settings(SQLITE_PRAGMAS={'busy_timeout': 1234, 'temp_store': 'memory'})
+    def test_pragmas_reach_the_connection(self):
+        restore = {name: self.pragma(name) for name in ('busy_timeout', 'temp_store')}
+        self.addCleanup(sqlite.tune_connection, None, fake_connection(PRAGMAS=restore, cursor=connection.cursor))
+        sqlite.tune_connection(None, connection)
+        self.assertEqual(self.pragma('busy_timeout'), 1234)
+        self.assertEqual(self.pragma('temp_store'), 2)
+
+    def test_new_connections_are_tuned(self):
+        self.assertEqual(self.pragma('busy_timeout'), 20000)
+
+
+class WriteTransactionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = make_organizer('organizer')
+
+    def lock_is_free(self):
+        # Asked from another thread: the lock is reentrant for this one
+        free = []
+
+        def probe():
+            lock = sqlite._write_lock('default')
+            free.append(lock.acquire(blocking=False))
+            if free[0]:
+                lock.release()
+
+        thread = threading.Thread(target=probe)
+        thread.start()
+        thread.join()
+        return free[0]
+
+    def test_threads_take_turns(self):
+        with sqlite.write_transaction():
+            self.assertFalse(self.lock_is_free())
+            # Nested write paths don't wait on themselves
+            with sqlite.write_transaction():
+                pass
+        self.assertTrue(self.lock_is_free())
+
+    def test_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with sqlite.write_transaction():
+                make_event(self.organizer, title='Rolled back')
+                raise RuntimeError
+        self.assertFalse(Event.all_objects.filter(title='Rolled back').exists())
+        self.assertTrue(self.lock_is_free())
+
+    def test_other_databases_lock_the_row_instead(self):
+        event = make_event(self.organizer)
+        connections = {'default': SimpleNamespace(vendor='postgresql')}
+        with mock.patch.object(sqlite, 'connections', connections):
+            with sqlite.write_transaction(lock=event):
+                self.assertTrue(self.lock_is_free())
@@ -0,0 +1,77 @@
+import gzip
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from events.staticfiles import IMMUTABLE_CACHE_CONTROL, StaticFilesMiddleware, accepted_encodings
+
+
+class StaticFilesMiddlewareTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.root)
+        cls.enterClassContext(override_settings(STATIC_ROOT=cls.root, DEBUG=False))
+        call_command('collectstatic', interactive=False, verbosity=0, stdout=StringIO())
+        cls.hashed = staticfiles_storage.stored_name('css/style.css')
+
+    def setUp(self):
+        self.middleware = StaticFilesMiddleware(lambda request: HttpResponse('from the app'))
+        self.factory = RequestFactory()
+
+    def get(self, path, **headers):
+        return self.middleware(self.factory.get(path, headers=headers))
+
+    def test_collectstatic_writes_compressed_copies(self):
+        self.assertNotEqual(self.hashed, 'css/style.css')
+        with open(os.path.join(self.root, self.hashed), 'rb') as plain, \
+                open(os.path.join(self.root, self.hashed + '.gz'), 'rb') as compressed:
+            self.assertEqual(gzip.decompress(compressed.read()), plain.read())
+
+    def test_hashed_files_are_immutable_and_compressed(self):
+        response = self.get(f'/static/{self.hashed}', accept_encoding='gzip, deflate')
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertTrue(response['Content-Type'].startswith('text/css'))
+
+        plain = self.get(f'/static/{self.hashed}', accept_encoding='gzip;q=0')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertGreater(len(plain.content), len(response.content))
+
+    def test_unhashed_names_revalidate(self):
+        response = self.get('/static/css/style.css')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+        self.assertEqual(self.get('/static/css/style.css', if_none_match=response['ETag']).status_code, 304)
+
+    def test_everything_else_goes_to_the_app(self):
+        for path in ['/static/missing.css', '/static/../manage.py', '/', '/static/']:
+            self.assertEqual(self.get(path).content, b'from the app', path)
+        request = self.factory.post(f'/static/{self.hashed}')
+        self.assertEqual(self.middleware(request).content, b'from the app')
+
+    def test_async_stack(self):
+        async def get_response(request):
+            return HttpResponse('from the app')
+
+        middleware = StaticFilesMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = async_to_sync(middleware)(self.factory.get(f'/static/{self.hashed}'))
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+
+    def test_off_without_collected_files(self):
+        with override_settings(STATIC_ROOT=None), self.assertRaises(MiddlewareNotUsed):
+            StaticFilesMiddleware(lambda request: None)
+
+    def test_accepted_encodings(self):
+        self.assertEqual(accepted_encodings('br;q=0, gzip;q=0.5, identity'), {'gzip', 'identity'})
@@ -0,0 +1,97 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from events import tickets
+from events.models import EventRegistration
+
+from .utils import make_event, make_volunteer
+
+
+class TicketTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user('organizer', password='pw')
+        cls.event = make_event(cls.organizer)
+        cls.other_event = make_event(cls.organizer, title='Other')
+        cls.confirmed = EventRegistration.objects.create(event=cls.event, volunteer=make_volunteer('ada'))
+        cls.waiting = EventRegistration.objects.create(
+            event=cls.event, volunteer=make_volunteer('bob'), status='waitlist',
+        )
+
+    def test_token_round_trip(self):
+        token = tickets.ticket_token(self.confirmed)
+        self.assertEqual(tickets.verify_token(token), (self.event.pk, self.confirmed.pk))
+
+    def test_tampered_or_malformed_tokens_are_rejected(self):
+        token = tickets.ticket_token(self.confirmed)
+        forged = f'{self.event.pk}.{self.waiting.pk}.{token.rsplit(".", 1)[1]}'
+        for bad in [forged, token[:-1], 'not-a-ticket', '', None]:
+            self.assertIsNone(tickets.verify_token(bad), bad)
+
+    def test_check_in_once(self):
+        token = tickets.ticket_token(self.confirmed)
+        self.assertEqual(tickets.check_in(self.event.pk, token), (tickets.CHECKED_IN, self.confirmed.pk))
+        self.assertEqual(tickets.check_in(self.event.pk, token), (tickets.ALREADY_CHECKED_IN, self.confirmed.pk))
+        self.confirmed.refresh_from_db()
+        self.assertIsNotNone(self.confirmed.checked_in_at)
+
+    def test_check_in_failures(self):
+        token = tickets.ticket_token(self.confirmed)
+        self.assertEqual(tickets.check_in(self.other_event.pk, token)[0], tickets.WRONG_EVENT)
+        self.assertEqual(tickets.check_in(self.event.pk, tickets.ticket_token(self.waiting))[0], tickets.NOT_CONFIRMED)
+        self.assertEqual(tickets.check_in(self.event.pk, 'garbage'), (tickets.INVALID, None))
+
+    def test_bulk_check_in_keeps_the_earliest_scan(self):
+        token = tickets.ticket_token(self.confirmed)
+        early = timezone.now() - timedelta(hours=1)
+        recorded, rejected = tickets.bulk_check_in(self.event.pk, [
+            (token, timezone.now()), (token, early), ('garbage', early),
+            (tickets.ticket_token(self.waiting), early),
+        ])
+        self.assertEqual((recorded, rejected), (1, 1))
+        self.confirmed.refresh_from_db()
+        self.assertEqual(self.confirmed.checked_in_at, early)
+
+    def test_roster_is_signed(self):
+        roster = tickets.roster(self.event)
+        self.assertEqual([entry[1] for entry in roster['tickets']], [self.confirmed.pk])
+        self.assertEqual(roster['tickets'][0][0], tickets.token_digest(tickets.ticket_token(self.confirmed)))
+        self.assertTrue(tickets.verify_roster(roster))
+        roster['tickets'][0][3] = True
+        self.assertFalse(tickets.verify_roster(roster))
+
+
+class CheckInSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user('organizer', password='pw')
+        cls.event = make_event(cls.organizer)
+        cls.registration = EventRegistration.objects.create(event=cls.event, volunteer=make_volunteer('ada'))
+
+    def setUp(self):
+        self.client.force_login(self.organizer)
+        self.roster = json.loads(self.client.get(reverse('check_in_roster', args=[self.event.pk])).content)
+
+    def sync(self, roster):
+        scans = [[tickets.ticket_token(self.registration), timezone.now().isoformat()]]
+        return self.client.post(
+            reverse('check_in_sync', args=[self.event.pk]),
+            json.dumps({'roster': roster, 'scans': scans}), content_type='application/json',
+        )
+
+    def test_scans_checked_against_an_issued_roster_are_recorded(self):
+        response = self.sync(self.roster)
+        self.assertEqual(json.loads(response.content), {'recorded': 1, 'rejected': 0, 'received': 1})
+
+    def test_altered_rosters_are_refused(self):
+        other_event = make_event(self.organizer, title='Other')
+        altered = {**self.roster, 'tickets': [[*self.roster['tickets'][0][:3], False], ['beef', 0, 'Mallory', False]]}
+        for roster in [altered, tickets.roster(other_event), {**self.roster, 'signature': ''}, None]:
+            self.assertEqual(self.sync(roster).status_code, 400)
+        self.registration.refresh_from_db()
+        self.assertIsNone(self.registration.checked_in_at)
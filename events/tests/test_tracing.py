@@ -0,0 +1,137 @@
+import json
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from events import tracing
+from events.tracing import NULL_SPAN, TracingMiddleware, current_span, root_span, run_in_context, span, traced
+
+from .utils import make_event, make_volunteer
+
+
+class TracingTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.trace_file = Path(directory) / 'traces.jsonl'
+        settings_override = override_settings(TRACING_ENABLED=True, TRACING_FILE=self.trace_file)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def spans(self):
+        if not self.trace_file.exists():
+            return []
+        return [json.loads(line) for line in self.trace_file.read_text().splitlines()]
+
+    def test_spans_outside_a_trace_cost_nothing(self):
+        self.assertIs(span('anything'), NULL_SPAN)
+        with span('anything') as child:
+            child.set(ignored=True)
+        self.assertEqual(self.spans(), [])
+
+    def test_children_and_errors(self):
+        @traced('decorated')
+        def work():
+            with span('inner', rows=3):
+                pass
+
+        with root_span('request', sample=True) as root:
+            work()
+            with self.assertRaises(ValueError), span('failing'):
+                raise ValueError('boom')
+            self.assertIs(current_span(), root)
+        spans = {record['name']: record for record in self.spans()}
+        self.assertEqual(set(spans), {'request', 'decorated', 'inner', 'failing'})
+        self.assertEqual(len({record['trace_id'] for record in spans.values()}), 1)
+        self.assertEqual(spans['inner']['parent_id'], spans['decorated']['span_id'])
+        self.assertEqual(spans['decorated']['parent_id'], spans['request']['span_id'])
+        self.assertEqual(spans['inner']['attributes'], {'rows': 3})
+        self.assertIn('boom', spans['failing']['error'])
+
+    def test_sampling_and_fast_requests(self):
+        with root_span('skipped', sample=False) as root:
+            self.assertIs(root, NULL_SPAN)
+        with override_settings(TRACING_MIN_DURATION_MS=60_000), root_span('fast', sample=True):
+            pass
+        self.assertEqual(self.spans(), [])
+
+    def test_work_on_other_threads_joins_the_trace(self):
+        @traced('fetch')
+        async def fetch():
+            pass
+
+        def pooled():
+            with span('pooled'):
+                pass
+
+        with root_span('request', sample=True), ThreadPoolExecutor(1) as pool:
+            async_to_sync(fetch)()
+            pool.submit(run_in_context(pooled)).result()
+        spans = {record['name']: record for record in self.spans()}
+        self.assertEqual(spans['fetch']['parent_id'], spans['request']['span_id'])
+        self.assertEqual(spans['pooled']['parent_id'], spans['request']['span_id'])
+
+    @override_settings(TRACING_EXPORT='otlp')
+    def test_otlp_export(self):
+        with root_span('request', sample=True):
+            with span('child', 'client', count=2, ratio=0.5, cached=False):
+                pass
+        request, = self.spans()
+        spans = request['resourceSpans'][0]['scopeSpans'][0]['spans']
+        child = next(item for item in spans if item['name'] == 'child')
+        self.assertEqual(child['kind'], 3)
+        self.assertEqual(child['attributes'], [
+            {'key': 'count', 'value': {'intValue': '2'}},
+            {'key': 'ratio', 'value': {'doubleValue': 0.5}},
+            {'key': 'cached', 'value': {'boolValue': False}},
+        ])
+
+    def test_middleware_is_removed_when_off(self):
+        with override_settings(TRACING_ENABLED=False), self.assertRaises(MiddlewareNotUsed):
+            TracingMiddleware(lambda request: HttpResponse())
+
+    def test_middleware_async(self):
+        async def view(request):
+            with span('view.work'):
+                return HttpResponse(status=201)
+
+        middleware = TracingMiddleware(view)
+        async_to_sync(middleware)(RequestFactory().post('/somewhere/'))
+        root = next(record for record in self.spans() if record['parent_id'] is None)
+        self.assertEqual((root['name'], root['attributes']), ('POST /somewhere/', {'http.method': 'POST', 'http.status_code': 201}))
+
+    def test_registration_trace(self):
+        tracing.install()
+        tracing._add_sql_wrapper(None, connection)
+        self.addCleanup(connection.execute_wrappers.remove, tracing._trace_sql)
+
+        organizer = User.objects.create_user('organizer', 'organizer@example.com', 'pw')
+        event = make_event(organizer)
+        self.client.force_login(make_volunteer('ada'))
+        with mock.patch('events.views.send_mail_in_background', side_effect=lambda *args, **kwargs: mail.send_mail(*args, **kwargs)):
+            self.client.post(reverse('register_event', args=[event.pk]))
+
+        spans = self.spans()
+        by_id = {record['span_id']: record for record in spans}
+        root = next(record for record in spans if record['parent_id'] is None)
+        self.assertEqual(root['name'], 'POST event/<int:event_id>/register/')
+        names = {record['name'] for record in spans}
+        self.assertTrue({'registration.capacity_count', 'registration.create', 'email.send', 'db.query'} <= names)
+        # The organizer email reuses the count taken under the lock
+        email_queries = [
+            record['attributes']['db.statement'] for record in spans
+            if record['name'] == 'db.query' and by_id[record['parent_id']]['name'] == 'registration.organizer_email'
+        ]
+        self.assertTrue(email_queries)  # the organizer is loaded here
+        self.assertEqual([sql for sql in email_queries if 'COUNT(' in sql], [])
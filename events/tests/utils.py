@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.utils import timezone
+
+from events.models import Event, OrganizerProfile, VolunteerProfile
+
+# Pages render {% static %} through the manifest, which tests don't build
+plain_static_files = override_settings(STORAGES={
+    **settings.STORAGES,
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+
+
+def make_event(organizer, **fields):
+    defaults = {
+        'title': 'Beach cleanup',
+        'description': 'Bring gloves',
+        'category': 'beach_cleanup',
+        'location': 'Main beach',
+        'date': timezone.now() + timedelta(days=7),
+        'capacity': 10,
+    }
+    return Event.objects.create(organizer=organizer, **{**defaults, **fields})
+
+
+def make_volunteer(username, **fields):
+    user = User.objects.create_user(username, f'{username}@example.com', 'pw')
+    VolunteerProfile.objects.create(user=user, **fields)
+    return user
+
+
+def make_organizer(username, **fields):
+    user = User.objects.create_user(username, f'{username}@example.com', 'pw')
+    OrganizerProfile.objects.create(user=user, **fields)
+    return user
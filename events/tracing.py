@@ -0,0 +1,341 @@
+"""
+Lightweight request tracing: spans for views, SQL, templates and email.
+
+TracingMiddleware opens a root span per sampled request. Anything that
+runs inside it can add child spans:
+
+    with span('registration.capacity_count', event_id=event.id):
+        ...
+
+    @traced('recommendations.rebuild')
+    def rebuild(...):
+        ...
+
+install() (called from EventsConfig.ready when TRACING_ENABLED) adds
+automatic spans. Every SQL statement is wrapped via an execute_wrapper
+added to each new connection. Django template renders and
+EmailMessage.send are wrapped too, which covers send_mail and the mail
+thread pool. The current span lives in a ContextVar, so it follows the
+request into sync_to_async threads and into mailer tasks.
+
+Finished traces are appended to TRACING_FILE, either as one JSON object
+per span ('jsonl') or as one OTLP/JSON ExportTraceServiceRequest per trace
+('otlp'). An OpenTelemetry collector's otlpjsonfile receiver can read the
+latter. TRACING_SAMPLE_RATE picks which requests are traced.
+TRACING_MIN_DURATION_MS drops traced requests that turned out fast.
+
+When TRACING_ENABLED is off the middleware removes itself
+(MiddlewareNotUsed) and nothing is installed. span() then costs one
+ContextVar lookup.
+"""
+
+import contextvars
+import functools
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+SERVICE_NAME = 'greenevents'
+MAX_STATEMENT_LENGTH = 500
+
+_current = contextvars.ContextVar('events_tracing_span', default=None)
+_write_lock = threading.Lock()
+
+
+def tracing_enabled():
+    return getattr(settings, 'TRACING_ENABLED', False)
+
+
+class Trace:
+    """The spans of one request, written out together when the root span ends"""
+
+    def __init__(self):
+        self.trace_id = f'{random.getrandbits(128):032x}'
+        self.spans = []
+        self.flushed = False
+        self.kept = False
+
+
+class Span:
+    __slots__ = ('trace', 'span_id', 'parent_id', 'name', 'kind', 'attributes', 'start_ns', 'end_ns', 'error')
+
+    def __init__(self, trace, name, parent_id=None, kind='internal', attributes=None):
+        self.trace = trace
+        self.span_id = f'{random.getrandbits(64):016x}'
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def finish(self):
+        self.end_ns = time.time_ns()
+        trace = self.trace
+        trace.spans.append(self)
+        if trace.flushed:
+            # Finished after the request (e.g. mail sent from the pool)
+            if trace.kept:
+                export([self])
+        elif self.parent_id is None:
+            trace.flushed = True
+            trace.kept = self.duration_ms >= getattr(settings, 'TRACING_MIN_DURATION_MS', 0)
+            if trace.kept:
+                export(trace.spans)
+
+
+class _NullSpan:
+    """Stand-in when the request isn't traced, so callers never need to check"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+@contextmanager
+def _child_span(parent, name, kind, attributes):
+    child = Span(parent.trace, name, parent.span_id, kind, attributes)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.error = repr(exc)
+        raise
+    finally:
+        _current.reset(token)
+        child.finish()
+
+
+def span(name, kind='internal', **attributes):
+    """Context manager timing a child of the current span (no-op outside a trace)"""
+    parent = _current.get()
+    if parent is None:
+        return NULL_SPAN
+    return _child_span(parent, name, kind, attributes)
+
+
+def traced(name=None, **attributes):
+    """Decorator form of span(); works on sync and async functions"""
+    def decorate(func):
+        span_name = name or f'{func.__module__}.{func.__qualname__}'
+        if iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def current_span():
+    return _current.get() or NULL_SPAN
+
+
+def run_in_context(func):
+    """Bind ``func`` to the current context, so an executor thread continues this trace"""
+    context = contextvars.copy_context()
+    return functools.partial(context.run, func)
+
+
+@contextmanager
+def root_span(name, sample=None, **attributes):
+    """Start a new trace if this call is sampled (TRACING_SAMPLE_RATE)"""
+    if sample is None:
+        sample = random.random() < getattr(settings, 'TRACING_SAMPLE_RATE', 1.0)
+    if not sample:
+        yield NULL_SPAN
+        return
+    root = Span(Trace(), name, kind='server', attributes=attributes)
+    token = _current.set(root)
+    try:
+        yield root
+    except BaseException as exc:
+        root.error = repr(exc)
+        raise
+    finally:
+        _current.reset(token)
+        root.finish()
+
+
+# ---- exporters ----
+
+def _span_record(item):
+    record = {
+        'trace_id': item.trace.trace_id,
+        'span_id': item.span_id,
+        'parent_id': item.parent_id,
+        'name': item.name,
+        'kind': item.kind,
+        'start_ns': item.start_ns,
+        'duration_ms': round(item.duration_ms, 3),
+        'attributes': item.attributes,
+    }
+    if item.error:
+        record['error'] = item.error
+    return record
+
+
+_OTLP_KINDS = {'internal': 1, 'server': 2, 'client': 3}
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_span(item):
+    record = {
+        'traceId': item.trace.trace_id,
+        'spanId': item.span_id,
+        'name': item.name,
+        'kind': _OTLP_KINDS.get(item.kind, 1),
+        'startTimeUnixNano': str(item.start_ns),
+        'endTimeUnixNano': str(item.end_ns),
+        'attributes': [{'key': key, 'value': _otlp_value(value)} for key, value in item.attributes.items()],
+        'status': {'code': 2, 'message': item.error} if item.error else {'code': 1},
+    }
+    if item.parent_id:
+        record['parentSpanId'] = item.parent_id
+    return record
+
+
+def _otlp_lines(spans):
+    request = {'resourceSpans': [{
+        'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}}]},
+        'scopeSpans': [{'scope': {'name': __name__}, 'spans': [_otlp_span(item) for item in spans]}],
+    }]}
+    return [json.dumps(request, default=str)]
+
+
+def export(spans):
+    if getattr(settings, 'TRACING_EXPORT', 'jsonl') == 'otlp':
+        lines = _otlp_lines(spans)
+    else:
+        lines = [json.dumps(_span_record(item), default=str) for item in spans]
+    data = '\n'.join(lines) + '\n'
+    # One append per trace keeps lines from different workers whole
+    with _write_lock, open(settings.TRACING_FILE, 'a', encoding='utf-8') as handle:
+        handle.write(data)
+
+
+# ---- automatic spans ----
+
+def _trace_sql(execute, sql, params, many, context):
+    parent = _current.get()
+    if parent is None:
+        return execute(sql, params, many, context)
+    with _child_span(parent, 'db.query', 'client', {
+        'db.system': context['connection'].vendor,
+        'db.statement': sql[:MAX_STATEMENT_LENGTH],
+        'db.many': many,
+    }):
+        return execute(sql, params, many, context)
+
+
+def _add_sql_wrapper(sender, connection, **kwargs):
+    if _trace_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_trace_sql)
+
+
+def _wrap(owner, attribute, make_span):
+    original = getattr(owner, attribute)
+    if getattr(original, '_traced', False):
+        return
+
+    @functools.wraps(original)
+    def wrapper(self, *args, **kwargs):
+        if _current.get() is None:
+            return original(self, *args, **kwargs)
+        with make_span(self):
+            return original(self, *args, **kwargs)
+    wrapper._traced = True
+    setattr(owner, attribute, wrapper)
+
+
+def install():
+    """Hook SQL, template and email spans in; a no-op unless TRACING_ENABLED"""
+    if not tracing_enabled():
+        return
+    from django.core.mail import EmailMessage
+    from django.db.backends.signals import connection_created
+    from django.template.backends.django import Template
+
+    connection_created.connect(_add_sql_wrapper, dispatch_uid='events.tracing.sql')
+    _wrap(Template, 'render', lambda template: span('template.render', template=template.origin.template_name or ''))
+    _wrap(EmailMessage, 'send', lambda message: span('email.send', 'client', recipients=len(message.recipients())))
+
+
+class TracingMiddleware:
+    """Root span per sampled request; removes itself when tracing is off"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not tracing_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with root_span(f'{request.method} {request.path}', **{'http.method': request.method}) as root:
+            response = self.get_response(request)
+            root.set(**{'http.status_code': response.status_code})
+        return response
+
+    async def __acall__(self, request):
+        with root_span(f'{request.method} {request.path}', **{'http.method': request.method}) as root:
+            response = await self.get_response(request)
+            root.set(**{'http.status_code': response.status_code})
+        return response
+
+    @staticmethod
+    def _name_root(request):
+        # Name the trace after the route, so /event/1/ and /event/2/ group together
+        root = _current.get()
+        if root is not None and request.resolver_match is not None:
+            root.name = f'{request.method} {request.resolver_match.route or request.path}'
+            root.set(view=request.resolver_match.view_name)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self._name_root(request)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self._name_root(request)
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, metrics, views
 
 urlpatterns = [
     # Home (Class-Based View)
@@ -12,16 +12,46 @@ urlpatterns = [
     path('logout/', views.logout_view, name='logout'),
 
     # Events
+    path('events/archive/', views.event_archive, name='event_archive'),
     path('event/<int:event_id>/', views.event_detail, name='event_detail'),
+    path('event/<int:event_id>/availability/stream/', views.event_availability_stream, name='event_availability_stream'),
     path('event/create/', views.create_event, name='create_event'),
     path('event/<int:event_id>/edit/', views.edit_event, name='edit_event'),
     path('event/<int:event_id>/delete/', views.delete_event, name='delete_event'),
+    path('event/import/', views.bulk_import_events, name='bulk_import_events'),
+    path('event/<int:event_id>/clone/', views.clone_event_series, name='clone_event_series'),
+    path('event/<int:event_id>/impact/', views.report_event_impact, name='report_event_impact'),
+
+    # Recurring series dates (materialized as events on first registration)
+    path('series/<int:series_id>/<int:start>/', views.series_occurrence, name='series_occurrence'),
+    path('series/<int:series_id>/<int:start>/register/', views.register_series_occurrence, name='register_series_occurrence'),
 
     # Registration
     path('event/<int:event_id>/register/', views.register_for_event, name='register_event'),
     path('event/<int:event_id>/cancel/', views.cancel_registration, name='cancel_registration'),
     path('event/<int:event_id>/registrations/', views.view_registrations, name='view_registrations'),
 
+    # Tickets & door check-in
+    path('event/<int:event_id>/check-in/', views.check_in_desk, name='check_in_desk'),
+    path('event/<int:event_id>/check-in/scan/', views.check_in_scan, name='check_in_scan'),
+    path('event/<int:event_id>/check-in/roster/', views.check_in_roster, name='check_in_roster'),
+    path('event/<int:event_id>/check-in/sync/', views.check_in_sync, name='check_in_sync'),
+    path('ticket/<int:registration_id>/', views.event_ticket, name='event_ticket'),
+
+    # Calendar feeds (.ics)
+    path('calendar/volunteer/<str:token>.ics', views.volunteer_calendar_feed, name='volunteer_calendar_feed'),
+    path('calendar/organizer/<str:token>.ics', views.organizer_calendar_feed, name='organizer_calendar_feed'),
+    path('calendar/category/<str:category>.ics', views.category_calendar_feed, name='category_calendar_feed'),
+
+    # Read-only JSON API
+    path('api/v1/events/', api.event_list, name='api_event_list'),
+    path('api/v1/events/<int:event_id>/', api.event_item, name='api_event_item'),
+    path('api/v1/registrations/', api.registration_list, name='api_registration_list'),
+    path('api/v1/stats/', api.dashboard_stats, name='api_dashboard_stats'),
+
+    # Prometheus scrape endpoint
+    path('metrics', metrics.metrics_view, name='metrics'),
+
     # Dashboards
     path('my-profile/', views.my_profile, name='my_profile'),
     path('volunteer/edit-profile/', views.edit_volunteer_profile, name='edit_volunteer_profile'),
@@ -1,44 +1,162 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.mail import send_mail
 from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Q, Count, Sum
+from django.urls import reverse
 from django.utils import timezone
-from datetime import datetime, timedelta
+from django.utils.cache import get_conditional_response, patch_cache_control
+from datetime import datetime, timedelta, timezone as dt_timezone
 from allauth.socialaccount.models import SocialAccount
 from django.db.models.functions import TruncMonth
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from .models import Event, EventRegistration, VolunteerProfile, OrganizerProfile, UserHistory
+from .models import Attendance, Event, EventImpactReport, EventRegistration, EventSeries, VolunteerProfile, OrganizerProfile, UserHistory
+from .roles import aget_user_role, get_user_role
+from .mailer import send_mail_in_background
+from .routers import reads_from_replica, replica_reads
+from .sqlite import write_transaction
+from .deletion import soft_delete_event
+from .archive import archived_events, listed_events
+from .tracing import span
+from .metrics import EMAILS_FAILED, record_cache
+from .availability import availability_snapshot, availability_stream, streaming_supported
+from . import calendar as ical
+from .categories import CATEGORIES, category_label
+from .geo import DEFAULT_RADIUS_KM, parse_point, radius_filter, sort_by_distance
+from .recommendations import interest_fallback, recommended_for_user, similar_events
+from .search import acompute_facets, apply_filters, facet_filters
+from .importer import IMPORT_FIELDS, clone_event, import_events, read_rows
+from .impact import IMPACT_METRICS, aplatform_impact, estimate, event_impact, summary_query
+from . import tickets
+from .series import LISTING_WINDOW_DAYS, expand_series, find_occurrence, materialize, upcoming_occurrences
 from .forms import (
-    VolunteerSignupForm, OrganizerSignupForm, EventForm,
+    VolunteerSignupForm, OrganizerSignupForm, EventForm, EventImportForm, EventCloneForm, EventImpactReportForm,
     EventSearchForm, ContactForm, VolunteerProfileForm, OrganizerProfileForm
 )
 
+from asgiref.sync import sync_to_async
+import asyncio
+import csv
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 # ==================== ANALYTICS HELPER FUNCTIONS ====================
 
-def calculate_volunteer_analytics(user, registrations):
-    """Calculate analytics data for volunteer dashboard"""
+# Each analytics query is described as (kind, queryset) so the same set can be
+# evaluated one after another in sync views or concurrently in async views.
+_SYNC_EVALUATORS = {
+    'count': lambda qs: qs.count(),
+    'first': lambda qs: qs.first(),
+    'list': lambda qs: list(qs),
+}
+
+
+async def _alist(qs):
+    return [obj async for obj in qs]
+
+
+_ASYNC_EVALUATORS = {
+    'count': lambda qs: qs.acount(),
+    'first': lambda qs: qs.afirst(),
+    'list': _alist,
+}
+
 
-    # Basic stats
-    total_events_registered = registrations.filter(status='confirmed').count()
-    upcoming_events = registrations.filter(
-        event__date__gte=timezone.now(),
-        status='confirmed'
-    ).count()
-    past_events = registrations.filter(
-        event__date__lt=timezone.now(),
-        status='confirmed'
-    ).count()
-
-    # Environmental Impact Calculations (estimates based on event types)
-    trees_planted = past_events * 5  # Assume 5 trees per event on average
-    co2_saved = past_events * 25  # 25kg CO2 per event
-    waste_collected = past_events * 15  # 15kg waste per event
-    hours_volunteered = past_events * 4  # 4 hours per event
+def run_queries(queries):
+    """Evaluate a {name: (kind, queryset)} mapping synchronously"""
+    with replica_reads():
+        return {name: _SYNC_EVALUATORS[kind](qs) for name, (kind, qs) in queries.items()}
+
+
+async def arun_queries(queries):
+    """Evaluate a {name: (kind, queryset)} mapping with asyncio.gather"""
+    with replica_reads():
+        results = await asyncio.gather(
+            *(_ASYNC_EVALUATORS[kind](qs) for kind, qs in queries.values())
+        )
+    return dict(zip(queries, results))
+
+
+def _monthly_series(monthly_entries, now):
+    """Turn TruncMonth/Count rows into six month labels and counts"""
+    months = []
+    counts = []
+    for i in range(6):
+        month_date = now - timedelta(days=30*i)
+        months.insert(0, month_date.strftime('%b'))
+
+        # Find count for this month
+        count = 0
+        for entry in monthly_entries:
+            if entry['month'].month == month_date.month and entry['month'].year == month_date.year:
+                count = entry['count']
+                break
+        counts.insert(0, count)
+    return months, counts
+
+
+def volunteer_analytics_queries(user, registrations, now):
+    """Independent queries behind the volunteer dashboard"""
+    six_months_ago = now - timedelta(days=180)
+    user_profile = get_user_role(user).volunteer_profile
+
+    return {
+        # Basic stats
+        'total_events_registered': ('count', registrations.filter(status='confirmed')),
+        'upcoming_events': ('count', registrations.filter(
+            event__date__gte=now,
+            status='confirmed'
+        )),
+        # Attended = the ledger (close_past_events), like the leaderboard
+        'past_events': ('count', Attendance.objects.filter(volunteer=user)),
+        # Streak calculation (simplified - check if user has recent activity)
+        'latest_registration': ('first', registrations.filter(
+            registered_at__gte=now - timedelta(days=30),
+            status='confirmed'
+        ).order_by('-registered_at')),
+        # Activity chart data (last 6 months)
+        'monthly_activity': ('list', registrations.filter(
+            event__date__gte=six_months_ago,
+            event__date__lte=now,
+            status='confirmed'
+        ).annotate(
+            month=TruncMonth('event__date')
+        ).values('month').annotate(
+            count=Count('id')
+        ).order_by('month')),
+        # Leaderboard (top 10 volunteers by events attended)
+        'leaderboard': ('list', VolunteerProfile.objects.select_related('user').order_by('-total_events_attended')[:10]),
+        # Find user's rank
+        'volunteers_ahead': ('count', VolunteerProfile.objects.filter(
+            total_events_attended__gt=user_profile.total_events_attended
+        )),
+        # Precomputed impact totals (rebuild_impact)
+        'impact': ('first', summary_query('volunteer', user.id)),
+    }
+
+
+def build_volunteer_analytics(results, now):
+    """Derive the volunteer dashboard figures from evaluated queries"""
+    total_events_registered = results['total_events_registered']
+    upcoming_events = results['upcoming_events']
+    past_events = results['past_events']
+
+    # Environmental impact per event category (events.impact); flat
+    # per-event estimate until the summary has been built for this volunteer
+    impact = results['impact']
+    if impact is None:
+        impact = estimate(past_events)
+    else:
+        impact = {metric: getattr(impact, metric) for metric in IMPACT_METRICS}
+    trees_planted = round(impact['trees_planted'])
+    co2_saved = round(impact['co2_saved_kg'])
+    waste_collected = round(impact['waste_collected_kg'])
+    hours_volunteered = round(impact['hours_volunteered'])
 
     # Achievement Level
     if past_events >= 50:
@@ -60,60 +178,24 @@ def calculate_volunteer_analytics(user, registrations):
     # Points system
     total_points = past_events * 10  # 10 points per event
 
-    # Streak calculation (simplified - check if user has recent activity)
-    recent_registrations = registrations.filter(
-        registered_at__gte=timezone.now() - timedelta(days=30),
-        status='confirmed'
-    ).order_by('-registered_at')
-
-    if recent_registrations.exists():
-        streak_days = (timezone.now() - recent_registrations.first().registered_at).days
+    latest_registration = results['latest_registration']
+    if latest_registration is not None:
+        streak_days = (now - latest_registration.registered_at).days
         if streak_days > 30:
             streak_days = 0
     else:
         streak_days = 0
 
-    # Activity chart data (last 6 months)
-    six_months_ago = timezone.now() - timedelta(days=180)
-    monthly_activity = registrations.filter(
-        event__date__gte=six_months_ago,
-        event__date__lte=timezone.now(),
-        status='confirmed'
-    ).annotate(
-        month=TruncMonth('event__date')
-    ).values('month').annotate(
-        count=Count('id')
-    ).order_by('month')
-
     # Format for chart
-    activity_months = []
-    activity_counts = []
-    for i in range(6):
-        month_date = timezone.now() - timedelta(days=30*i)
-        activity_months.insert(0, month_date.strftime('%b'))
-
-        # Find count for this month
-        count = 0
-        for entry in monthly_activity:
-            if entry['month'].month == month_date.month and entry['month'].year == month_date.year:
-                count = entry['count']
-                break
-        activity_counts.insert(0, count)
-
-    # Leaderboard (top 10 volunteers by events attended)
-    leaderboard = VolunteerProfile.objects.select_related('user').order_by('-total_events_attended')[:10]
+    activity_months, activity_counts = _monthly_series(results['monthly_activity'], now)
 
     # Add points to leaderboard
     leaderboard_with_points = []
-    for profile in leaderboard:
+    for profile in results['leaderboard']:
         profile.points = profile.total_events_attended * 10
         leaderboard_with_points.append(profile)
 
-    # Find user's rank
-    user_profile = user.volunteer_profile
-    leaderboard_rank = VolunteerProfile.objects.filter(
-        total_events_attended__gt=user_profile.total_events_attended
-    ).count() + 1
+    leaderboard_rank = results['volunteers_ahead'] + 1
 
     # Percentages for progress bars
     upcoming_percentage = (upcoming_events / max(total_events_registered, 1)) * 100
@@ -140,13 +222,53 @@ def calculate_volunteer_analytics(user, registrations):
     }
 
 
-def calculate_organizer_analytics(user, events):
-    """Calculate analytics data for organizer dashboard"""
+def calculate_volunteer_analytics(user, registrations):
+    """Calculate analytics data for volunteer dashboard"""
+    now = timezone.now()
+    results = run_queries(volunteer_analytics_queries(user, registrations, now))
+    return build_volunteer_analytics(results, now)
 
-    # Basic counts
-    total_events = events.count()
-    upcoming_events = events.filter(date__gte=timezone.now()).count()
-    past_events = events.filter(date__lt=timezone.now()).count()
+
+async def acalculate_volunteer_analytics(user, registrations):
+    """Async calculate_volunteer_analytics(); the queries run concurrently"""
+    now = timezone.now()
+    results = await arun_queries(volunteer_analytics_queries(user, registrations, now))
+    return build_volunteer_analytics(results, now)
+
+
+def organizer_analytics_queries(user, events, now):
+    """Independent queries behind the organizer dashboard"""
+    six_months_ago = now - timedelta(days=180)
+
+    return {
+        # Basic counts
+        'total_events': ('count', events),
+        'upcoming_events': ('count', events.filter(date__gte=now)),
+        'past_events': ('count', events.filter(date__lt=now)),
+        # Registration trends (last 6 months)
+        'monthly_registrations': ('list', EventRegistration.objects.filter(
+            event__organizer=user,
+            registered_at__gte=six_months_ago,
+            status='confirmed'
+        ).annotate(
+            month=TruncMonth('registered_at')
+        ).values('month').annotate(
+            count=Count('id')
+        ).order_by('month')),
+        # Category distribution
+        'category_data': ('list', events.values('category').annotate(
+            count=Count('id')
+        ).order_by('-count')),
+        # Precomputed impact totals (rebuild_impact)
+        'impact': ('first', summary_query('organizer', user.id)),
+    }
+
+
+def build_organizer_analytics(results, now):
+    """Derive the organizer dashboard figures from evaluated queries"""
+    total_events = results['total_events']
+    upcoming_events = results['upcoming_events']
+    past_events = results['past_events']
 
     # Percentages
     if total_events > 0:
@@ -156,45 +278,11 @@ def calculate_organizer_analytics(user, events):
         upcoming_percentage = 0
         completion_percentage = 0
 
-    # Registration trends (last 6 months)
-    six_months_ago = timezone.now() - timedelta(days=180)
-    monthly_registrations = EventRegistration.objects.filter(
-        event__organizer=user,
-        registered_at__gte=six_months_ago,
-        status='confirmed'
-    ).annotate(
-        month=TruncMonth('registered_at')
-    ).values('month').annotate(
-        count=Count('id')
-    ).order_by('month')
-
     # Format for chart
-    registration_months = []
-    registration_counts = []
-    for i in range(6):
-        month_date = timezone.now() - timedelta(days=30*i)
-        registration_months.insert(0, month_date.strftime('%b'))
-
-        # Find count for this month
-        count = 0
-        for entry in monthly_registrations:
-            if entry['month'].month == month_date.month and entry['month'].year == month_date.year:
-                count = entry['count']
-                break
-        registration_counts.insert(0, count)
-
-    # Category distribution
-    category_data = events.values('category').annotate(
-        count=Count('id')
-    ).order_by('-count')
+    registration_months, registration_counts = _monthly_series(results['monthly_registrations'], now)
 
-    category_labels = []
-    category_counts = []
-    for item in category_data:
-        # Get display name for category
-        category_dict = dict(Event.CATEGORY_CHOICES)
-        category_labels.append(category_dict.get(item['category'], item['category']))
-        category_counts.append(item['count'])
+    category_labels = [category_label(item['category']) for item in results['category_data']]
+    category_counts = [item['count'] for item in results['category_data']]
 
     return {
         'total_events': total_events,
@@ -206,20 +294,62 @@ def calculate_organizer_analytics(user, events):
         'registration_counts': json.dumps(registration_counts),
         'category_labels': json.dumps(category_labels),
         'category_counts': json.dumps(category_counts),
-        'now': timezone.now(),
+        'impact': results['impact'],
+        'now': now,
     }
 
+
+def calculate_organizer_analytics(user, events):
+    """Calculate analytics data for organizer dashboard"""
+    now = timezone.now()
+    results = run_queries(organizer_analytics_queries(user, events, now))
+    return build_organizer_analytics(results, now)
+
+
+async def acalculate_organizer_analytics(user, events):
+    """Async calculate_organizer_analytics(); the queries run concurrently"""
+    now = timezone.now()
+    results = await arun_queries(organizer_analytics_queries(user, events, now))
+    return build_organizer_analytics(results, now)
+
+# ==================== ASYNC VIEW HELPERS ====================
+
+async def aget_request_user(request):
+    """
+    Resolve the user natively and share it with request.user, so context
+    processors running during rendering don't load the user a second time.
+    """
+    user = await request.auser()
+    request.user = user
+    return user
+
+
+async def arender(request, template_name, context=None):
+    """Render a template on a worker thread once all queries have run"""
+    return await sync_to_async(render)(request, template_name, context)
+
+
 # ==================== HOME & PAGES ====================
 
-def home(request):
-    """Home page with event listing, search, and pagination"""
-    events = Event.objects.all().order_by('-created_at')
+@reads_from_replica
+async def home(request):
+    """Home page with upcoming event listing, search, and pagination"""
+    await aget_request_user(request)
+    # Upcoming events only; finished ones are on the archive page
+    now = timezone.now()
+    events = listed_events(now)
 
     # Search functionality
+    near_point = None
+    query, categories, cities, buckets = '', [], [], []
     search_form = EventSearchForm(request.GET or None)
     if search_form.is_valid():
-        query = search_form.cleaned_data.get('query')
-        category = search_form.cleaned_data.get('category')
+        query = search_form.cleaned_data.get('query') or ''
+        categories = search_form.cleaned_data.get('category')
+        cities = search_form.cleaned_data.get('city')
+        buckets = search_form.cleaned_data.get('when')
+        near = search_form.cleaned_data.get('near')
+        radius_km = search_form.cleaned_data.get('radius_km') or DEFAULT_RADIUS_KM
 
         if query:
             events = events.filter(
@@ -228,14 +358,38 @@ def home(request):
                 Q(location__icontains=query)
             )
 
-        if category:
-            events = events.filter(category=category)
+        # "Near me": grid-index lookup, then nearest first
+        if near:
+            near_point = parse_point(near)
+            if near_point is None:
+                messages.warning(request, f'We couldn\'t find "{near}". Showing events everywhere.')
+            else:
+                latitude, longitude, _ = near_point
+                events = events.filter(radius_filter(latitude, longitude, radius_km))
+
+    # Facet counts see the keyword/distance filters but not their own selection;
+    # the cache key only holds what was actually applied (cleaned values)
+    facets = acompute_facets(
+        events, categories, cities, buckets, now,
+        cache_key_parts=(query, near_point and near_point[:2], near_point and radius_km),
+    )
+    events = apply_filters(events, facet_filters(categories, cities, buckets, now))
 
     # Add registration count to each event
-    events = events.annotate(registration_count=Count('registrations'))
+    events = events.annotate(
+        registration_count=Count('registrations'),
+        confirmed_count=Count('registrations', filter=Q(registrations__status='confirmed')),
+    )
+
+    # The facet aggregates run alongside the count (or the distance-sorted rows)
+    if near_point is not None:
+        rows, facets = await asyncio.gather(_alist(events), facets)
+        events = sort_by_distance(rows, latitude, longitude, radius_km)
 
     # ========== ADD PAGINATION ==========
     paginator = Paginator(events, 20)
+    if near_point is None:
+        paginator.count, facets = await asyncio.gather(events.acount(), facets)
     page = request.GET.get('page')
 
     try:
@@ -244,18 +398,69 @@ def home(request):
         events_page = paginator.page(1)
     except EmptyPage:
         events_page = paginator.page(paginator.num_pages)
+    if near_point is None:
+        events_page.object_list = await _alist(events_page.object_list)
     # ====================================
 
+    # Recurring series dates nobody has registered for yet (not Event rows)
+    recurring = []
+    if events_page.number == 1 and near_point is None and not query:
+        recurring = await sync_to_async(upcoming_occurrences)(
+            now, now + timedelta(days=LISTING_WINDOW_DAYS), categories, cities, limit=6,
+        )
+
+    platform_impact = await aplatform_impact()
+
     # Track visit (sessions & cookies)
-    visit_count = request.session.get('visit_count', 0)
-    request.session['visit_count'] = visit_count + 1
+    visit_count = await request.session.aget('visit_count', 0)
+    await request.session.aset('visit_count', visit_count + 1)
 
     context = {
         'events': events_page,  # ← CHANGED from 'events' to 'events_page'
         'search_form': search_form,
-        'visit_count': request.session.get('visit_count', 0),
+        'near_label': near_point[2] if near_point else None,
+        'facets': facets,
+        'recurring': recurring,
+        'platform_impact': platform_impact,
+        'visit_count': visit_count + 1,
     }
-    return render(request, 'events/home.html', context)
+    return await arender(request, 'events/home.html', context)
+
+
+@reads_from_replica
+async def event_archive(request):
+    """Past events, most recent first, with keyword and category search"""
+    await aget_request_user(request)
+    events = archived_events()
+
+    query = request.GET.get('query', '').strip()
+    if query:
+        events = events.filter(
+            Q(title__icontains=query) |
+            Q(description__icontains=query) |
+            Q(location__icontains=query)
+        )
+    category = request.GET.get('category', '')
+    if category in CATEGORIES:
+        events = events.filter(category=category)
+    events = events.annotate(confirmed_count=Count('registrations', filter=Q(registrations__status='confirmed')))
+
+    paginator = Paginator(events, 20)
+    paginator.count = await events.acount()
+    try:
+        events_page = paginator.page(request.GET.get('page'))
+    except PageNotAnInteger:
+        events_page = paginator.page(1)
+    except EmptyPage:
+        events_page = paginator.page(paginator.num_pages)
+    events_page.object_list = await _alist(events_page.object_list)
+
+    return await arender(request, 'events/archive.html', {
+        'events': events_page,
+        'query': query,
+        'category': category,
+        'categories': Event.CATEGORY_CHOICES,
+    })
 
 
 def about(request):
@@ -263,8 +468,9 @@ def about(request):
     return render(request, 'pages/about.html')
 
 
-def contact(request):
+async def contact(request):
     """Contact page with form"""
+    await aget_request_user(request)
     if request.method == 'POST':
         form = ContactForm(request.POST)
         if form.is_valid():
@@ -273,23 +479,20 @@ def contact(request):
             subject = form.cleaned_data['subject']
             message = form.cleaned_data['message']
 
-            # Send email to niketbhatt28@gmail.com
-            try:
-                send_mail(
-                    f'GreenEvents Contact: {subject}',
-                    f'From: {name} ({email})\n\n{message}',
-                    settings.EMAIL_HOST_USER,  # From address
-                    ['niketbhatt28@gmail.com'],  # To address
-                    fail_silently=False,
-                )
-                messages.success(request, 'Thank you! Your message has been sent successfully.')
-                return redirect('contact')
-            except Exception as e:
-                messages.error(request, f'Sorry, there was an error sending your message: {str(e)}')
+            # Send email to niketbhatt28@gmail.com (SMTP runs on the mail pool)
+            send_mail_in_background(
+                f'GreenEvents Contact: {subject}',
+                f'From: {name} ({email})\n\n{message}',
+                settings.EMAIL_HOST_USER,  # From address
+                ['niketbhatt28@gmail.com'],  # To address
+                fail_silently=False,
+            )
+            messages.success(request, 'Thank you! Your message has been sent successfully.')
+            return redirect('contact')
     else:
         form = ContactForm()
 
-    return render(request, 'pages/contact.html', {'form': form})
+    return await arender(request, 'pages/contact.html', {'form': form})
 
 
 # ==================== AUTHENTICATION ====================
@@ -316,7 +519,7 @@ def volunteer_signup(request):
             )
 
             # Log the user in with explicit backend
-            login(request, user, backend='django.contrib.auth.backends.ModelBackend')
+            login(request, user, backend='events.backends.ProfileModelBackend')
 
             messages.success(request, f'Welcome {user.first_name}! Your volunteer account has been created! 🎉')
             return redirect('home')
@@ -346,7 +549,7 @@ def organizer_signup(request):
             )
 
             # Log the user in with explicit backend
-            login(request, user, backend='django.contrib.auth.backends.ModelBackend')
+            login(request, user, backend='events.backends.ProfileModelBackend')
 
             messages.success(request, f'Welcome {user.first_name}! Your organizer account has been created! 🎉')
             return redirect('home')
@@ -368,10 +571,8 @@ def logout_view(request):
 @login_required
 def signup_choice_google(request):
     """Show choice page for Google OAuth users"""
-    user = request.user
-
     # If user already has a profile, redirect to home
-    if hasattr(user, 'volunteer_profile') or hasattr(user, 'organizer_profile'):
+    if get_user_role(request.user).has_profile:
         return redirect('home')
 
     return render(request, 'account/signup_choice_google.html')
@@ -383,7 +584,7 @@ def volunteer_google_signup(request):
     user = request.user
 
     # Check if user already has a profile
-    if hasattr(user, 'volunteer_profile') or hasattr(user, 'organizer_profile'):
+    if get_user_role(user).has_profile:
         messages.info(request, 'You already have a profile!')
         return redirect('my_profile')
 
@@ -417,7 +618,7 @@ def organizer_google_signup(request):
     user = request.user
 
     # Check if user already has a profile
-    if hasattr(user, 'volunteer_profile') or hasattr(user, 'organizer_profile'):
+    if get_user_role(user).has_profile:
         messages.info(request, 'You already have a profile!')
         return redirect('my_profile')
 
@@ -447,37 +648,46 @@ def organizer_google_signup(request):
 
 # ==================== EVENT VIEWS ====================
 
-def event_detail(request, event_id):
+@reads_from_replica
+async def event_detail(request, event_id):
     """Event detail view"""
-    event = get_object_or_404(Event, pk=event_id)
+    user = await aget_request_user(request)
+    event = await aget_object_or_404(Event, pk=event_id)
+
+    # Get registration count and precomputed similar events
+    registration_count = event.registrations.filter(status='confirmed').acount()
+    similar = _alist(similar_events(event))
 
-    # Track recently viewed events (using sessions)
-    if request.user.is_authenticated:
-        recent_events = request.session.get('recent_events', [])
+    # Check if user is registered
+    is_registered = False
+    user_registration = None
+    if user.is_authenticated:
+        # Track recently viewed events (using sessions)
+        recent_events = await request.session.aget('recent_events', [])
         if event_id not in recent_events:
             recent_events.insert(0, event_id)
             recent_events = recent_events[:5]  # Keep only last 5
-            request.session['recent_events'] = recent_events
+            await request.session.aset('recent_events', recent_events)
 
-        # Create user history
-        UserHistory.objects.create(
-            user=request.user,
-            event=event
+        # Create user history alongside the read queries
+        _, user_registration, registration_count, similar = await asyncio.gather(
+            UserHistory.objects.acreate(
+                user=user,
+                event=event
+            ),
+            EventRegistration.objects.filter(
+                volunteer=user,
+                event=event,
+                status__in=['confirmed', 'waitlist']
+            ).afirst(),
+            registration_count,
+            similar,
         )
-
-    # Check if user is registered
-    is_registered = False
-    user_registration = None
-    if request.user.is_authenticated:
-        user_registration = EventRegistration.objects.filter(
-            volunteer=request.user,
-            event=event,
-            status__in=['confirmed', 'waitlist']
-        ).first()
         is_registered = user_registration is not None
+    else:
+        registration_count, similar = await asyncio.gather(registration_count, similar)
 
-    # Get registration count
-    registration_count = event.registrations.filter(status='confirmed').count()
+    event.confirmed_count = registration_count
     available_spots = event.capacity - registration_count
 
     context = {
@@ -486,15 +696,80 @@ def event_detail(request, event_id):
         'user_registration': user_registration,
         'registration_count': registration_count,
         'available_spots': available_spots,
+        'similar_events': similar,
+        'live_availability': streaming_supported(request),
     }
-    return render(request, 'events/event_detail.html', context)
+    return await arender(request, 'events/event_detail.html', context)
+
+
+async def event_availability_stream(request, event_id):
+    """Server-Sent Events stream of spots left and waitlist size"""
+    if not streaming_supported(request):
+        # 204 tells EventSource to stop reconnecting
+        return HttpResponse(status=204)
+    snapshot = await sync_to_async(availability_snapshot)(event_id)
+    if snapshot is None:
+        raise Http404('Event not found')
+
+    response = StreamingHttpResponse(
+        availability_stream(event_id, snapshot),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # don't let nginx buffer the stream
+    return response
+
+
+
+def _calendar_response(request, kind, owner, name, events, extra=None):
+    """Serve an .ics feed: 304 if unchanged, cached body if built before, else stream it"""
+    scope = ical.feed_scope(kind, owner, request.get_host())
+    etag = '"%s"' % ical.feed_etag(scope, name, events, extra)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        key = ical.cache_key(scope, etag)
+        body = record_cache('ical', cache.get(key))
+        base_url = f'{request.scheme}://{request.get_host()}'
+        if body is not None:
+            response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+        else:
+            response = StreamingHttpResponse(
+                ical.caching_stream(ical.stream_calendar(name, events, base_url, request.get_host()), key),
+                content_type='text/calendar; charset=utf-8',
+            )
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=ical.feed_cache_seconds())
+    return response
+
+
+def volunteer_calendar_feed(request, token):
+    """iCalendar feed of a volunteer's confirmed registrations"""
+    user_id = ical.user_id_from_token(token, 'volunteer')
+    if user_id is None:
+        raise Http404('Calendar not found')
+    events = ical.volunteer_feed_events(user_id)
+    return _calendar_response(request, 'volunteer', user_id, 'My Volunteer Events', events, ical.registration_state())
 
 
+def organizer_calendar_feed(request, token):
+    """iCalendar feed of an organizer's events"""
+    user_id = ical.user_id_from_token(token, 'organizer')
+    if user_id is None:
+        raise Http404('Calendar not found')
+    return _calendar_response(request, 'organizer', user_id, 'My Organized Events', ical.organizer_feed_events(user_id))
+
+
+def category_calendar_feed(request, category):
+    """Public iCalendar feed of upcoming events in one category"""
+    if category not in CATEGORIES:
+        raise Http404('Unknown category')
+    return _calendar_response(request, 'category', category, f'{category_label(category)} Events', ical.category_feed_events(category))
+
 @login_required
 def create_event(request):
     """Create new event (organizers only)"""
     # Check if user is an organizer
-    if not hasattr(request.user, 'organizer_profile'):
+    if not get_user_role(request.user).is_organizer:
         messages.error(request, 'Only organizers can create events.')
         return redirect('home')
 
@@ -526,6 +801,9 @@ def edit_event(request, event_id):
     if request.method == 'POST':
         form = EventForm(request.POST, request.FILES, instance=event)
         if form.is_valid():
+            # Moved to a later date: back on the listing
+            if event.archived_at and not event.has_ended():
+                event.archived_at = None
             form.save()
             messages.success(request, f'Event "{event.title}" updated successfully!')
             return redirect('event_detail', event_id=event.id)
@@ -535,6 +813,102 @@ def edit_event(request, event_id):
     return render(request, 'events/edit_event.html', {'form': form, 'event': event})
 
 
+@login_required
+def bulk_import_events(request):
+    """Create many events from a CSV/JSONL upload (organizers only)"""
+    if not get_user_role(request.user).is_organizer:
+        messages.error(request, 'Only organizers can import events.')
+        return redirect('home')
+
+    result = None
+    if request.method == 'POST':
+        form = EventImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                rows = read_rows(upload, upload.name)
+            except (UnicodeDecodeError, ValueError, csv.Error) as e:
+                form.add_error('file', f'Could not read the file: {e}')
+            else:
+                result = import_events(
+                    rows,
+                    request.user,
+                    dry_run=form.cleaned_data['dry_run'],
+                    skip_invalid=form.cleaned_data['skip_invalid'],
+                )
+                if result.created:
+                    messages.success(request, f'Imported {len(result.created)} of {result.total} events! 🎉')
+                    if result.ok:
+                        return redirect('my_profile')
+                elif result.ok:
+                    messages.info(request, f'All {result.total} rows are valid. Uncheck "Only validate" to import them.')
+    else:
+        form = EventImportForm()
+
+    return render(request, 'events/import_events.html', {
+        'form': form,
+        'result': result,
+        'columns': IMPORT_FIELDS,
+    })
+
+
+@login_required
+def clone_event_series(request, event_id):
+    """Copy an event across a recurring schedule (organizer only)"""
+    event = get_object_or_404(Event, pk=event_id)
+
+    if event.organizer != request.user:
+        messages.error(request, 'You can only repeat your own events.')
+        return redirect('event_detail', event_id=event.id)
+
+    if request.method == 'POST':
+        form = EventCloneForm(request.POST)
+        if form.is_valid():
+            clones = clone_event(event, form.cleaned_data['rule'])
+            if clones:
+                messages.success(request, f'Created {len(clones)} more occurrences of "{event.title}"! 🔁')
+            else:
+                messages.info(request, 'Those dates already have this event; nothing was created.')
+            return redirect('my_profile')
+    else:
+        form = EventCloneForm(initial={'weekdays': []})
+
+    return render(request, 'events/clone_event.html', {'form': form, 'event': event})
+
+
+@login_required
+def report_event_impact(request, event_id):
+    """Record actual impact figures for a finished event (organizer only)"""
+    event = get_object_or_404(Event, pk=event_id)
+
+    if event.organizer != request.user:
+        messages.error(request, 'You can only report impact for your own events.')
+        return redirect('event_detail', event_id=event.id)
+    if event.date > timezone.now():
+        messages.info(request, 'Impact can be reported once the event has taken place.')
+        return redirect('event_detail', event_id=event.id)
+
+    report = EventImpactReport.objects.filter(event=event).first()
+    if request.method == 'POST':
+        form = EventImpactReportForm(request.POST, instance=report)
+        if form.is_valid():
+            report = form.save(commit=False)
+            report.event = event
+            report.save()
+            messages.success(request, f'Impact recorded for "{event.title}"! 🌍 Totals update at the next summary rebuild.')
+            return redirect('my_profile')
+    else:
+        form = EventImpactReportForm(instance=report)
+
+    # The ledger once attendance is recorded, confirmed registrations until then
+    if event.attendance_closed_at:
+        attendees = event.attendances.count()
+    else:
+        attendees = event.registrations.filter(status='confirmed').count()
+    estimate_figures = event_impact(event.category, attendees)
+    return render(request, 'events/report_impact.html', {'form': form, 'event': event, 'estimate': estimate_figures})
+
+
 @login_required
 def delete_event(request, event_id):
     """Delete event (organizer only)"""
@@ -546,14 +920,56 @@ def delete_event(request, event_id):
         return redirect('event_detail', event_id=event.id)
 
     if request.method == 'POST':
-        event_title = event.title
-        event.delete()
-        messages.success(request, f'Event "{event_title}" deleted successfully.')
+        # Hidden at once; registrations and history are purged in the background
+        soft_delete_event(event, requested_by=request.user)
+        messages.success(request, f'Event "{event.title}" deleted successfully.')
         return redirect('home')
 
     return render(request, 'events/delete_event.html', {'event': event})
 
 
+def _get_occurrence_or_404(series_id, start):
+    series = get_object_or_404(EventSeries, pk=series_id, is_active=True)
+    try:
+        original_start = datetime.fromtimestamp(start, tz=dt_timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        raise Http404('No such occurrence')
+    occurrence = find_occurrence(series, original_start)
+    if occurrence is None:
+        raise Http404('No such occurrence')
+    return occurrence
+
+
+def series_occurrence(request, series_id, start):
+    """One date of a recurring event that has no registrations yet"""
+    occurrence = _get_occurrence_or_404(series_id, start)
+    event = Event.objects.filter(series_id=series_id, series_start=occurrence.original_start).first()
+    if event is not None:
+        return redirect('event_detail', event_id=event.id)
+
+    now = timezone.now()
+    upcoming = expand_series([occurrence.series], now, now + timedelta(days=60))[:6]
+    return render(request, 'events/series_occurrence.html', {
+        'occurrence': occurrence,
+        'series': occurrence.series,
+        'upcoming': upcoming,
+    })
+
+
+@login_required
+def register_series_occurrence(request, series_id, start):
+    """Materialize a series date as an Event, then register for it"""
+    occurrence = _get_occurrence_or_404(series_id, start)
+    if request.method != 'POST':
+        return redirect('series_occurrence', series_id=series_id, start=start)
+    if not get_user_role(request.user).is_volunteer:
+        messages.error(request, 'Only volunteers can register for events.')
+        return redirect('series_occurrence', series_id=series_id, start=start)
+
+    event = materialize(occurrence)
+    return register_for_event(request, event.id)
+
+
 # ==================== REGISTRATION VIEWS ====================
 
 @login_required
@@ -562,7 +978,7 @@ def register_for_event(request, event_id):
     event = get_object_or_404(Event, pk=event_id)
 
     # Check if user is a volunteer
-    if not hasattr(request.user, 'volunteer_profile'):
+    if not get_user_role(request.user).is_volunteer:
         messages.error(request, 'Only volunteers can register for events.')
         return redirect('event_detail', event_id=event.id)
 
@@ -578,48 +994,59 @@ def register_for_event(request, event_id):
             return redirect('event_detail', event_id=event.id)
         elif existing_registration.status == 'cancelled':
             # Allow re-registration - update existing registration
-            confirmed_count = event.registrations.filter(status='confirmed').count()
+            with write_transaction(lock=event):
+                confirmed_count = event.registrations.filter(status='confirmed').count()
 
-            if confirmed_count < event.capacity:
-                existing_registration.status = 'confirmed'
-                message_text = f'Successfully re-registered for "{event.title}"! 🎉'
-            else:
-                existing_registration.status = 'waitlist'
-                message_text = f'You have been added to the waitlist for "{event.title}".'
+                if confirmed_count < event.capacity:
+                    existing_registration.status = 'confirmed'
+                    message_text = f'Successfully re-registered for "{event.title}"! 🎉'
+                else:
+                    existing_registration.status = 'waitlist'
+                    message_text = f'You have been added to the waitlist for "{event.title}".'
 
-            existing_registration.registered_at = timezone.now()
-            existing_registration.save()
+                existing_registration.registered_at = timezone.now()
+                existing_registration.save()
 
             messages.success(request, message_text)
             return redirect('event_detail', event_id=event.id)
 
-    # Check capacity for new registration
-    confirmed_count = event.registrations.filter(status='confirmed').count()
+    # The count and the insert run as one write transaction, so two
+    # volunteers can't both take the last spot
+    with write_transaction(lock=event):
+        # Check capacity for new registration
+        with span('registration.capacity_count', event_id=event.id):
+            confirmed_count = event.registrations.filter(status='confirmed').count()
 
-    if confirmed_count < event.capacity:
-        status = 'confirmed'
-        message_text = f'Successfully registered for "{event.title}"! 🎉'
-    else:
-        status = 'waitlist'
-        message_text = f'You have been added to the waitlist for "{event.title}".'
+        if confirmed_count < event.capacity:
+            status = 'confirmed'
+            message_text = f'Successfully registered for "{event.title}"! 🎉'
+        else:
+            status = 'waitlist'
+            message_text = f'You have been added to the waitlist for "{event.title}".'
+
+        # Create registration
+        with span('registration.create', status=status):
+            registration = EventRegistration.objects.create(
+                volunteer=request.user,
+                event=event,
+                status=status
+            )
 
-    # Create registration
-    registration = EventRegistration.objects.create(
-        volunteer=request.user,
-        event=event,
-        status=status
-    )
+        # Create user history
+        with span('registration.history'):
+            UserHistory.objects.create(
+                user=request.user,
+                event=event
+            )
 
-    # Create user history
-    UserHistory.objects.create(
-        user=request.user,
-        event=event
-    )
+    # Confirmed spots as of this registration, counted under the lock above
+    confirmed_count += status == 'confirmed'
 
     # Send confirmation email to volunteer (acts as ticket)
-    try:
-        email_subject = f'🎟️ Your Event Ticket - {event.title}'
-        email_body = f'''
+    with span('registration.ticket_email'):
+        try:
+            email_subject = f'🎟️ Your Event Ticket - {event.title}'
+            email_body = f'''
 Dear {request.user.first_name or request.user.username},
 
 🎉 Congratulations! Your registration has been confirmed.
@@ -640,36 +1067,40 @@ Dear {request.user.first_name or request.user.username},
 
 📧 Volunteer: {request.user.get_full_name() or request.user.username}
 📬 Email: {request.user.email}
-🆔 Registration ID: {EventRegistration.objects.filter(volunteer=request.user, event=event).first().id if EventRegistration.objects.filter(volunteer=request.user, event=event).exists() else 'N/A'}
+🆔 Registration ID: {registration.id}
+🎟️ Your ticket (QR code): {request.build_absolute_uri(reverse('event_ticket', args=[registration.id]))}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 💚 Thank you for being part of the green movement!
 
-Please save this email as your event ticket. Show this confirmation at the event.
+Please save this email as your event ticket. Show the QR code from the link above at the event.
 
 Need to cancel? Log in to your GreenEvents profile to manage your registrations.
 
 Best regards,
 The GreenEvents Team
 🌍 Making the world greener, one event at a time!
-        '''
-
-        send_mail(
-            email_subject,
-            email_body,
-            settings.EMAIL_HOST_USER,
-            [request.user.email],
-            fail_silently=True,
-        )
-    except Exception as e:
-        print(f"Error sending volunteer email: {e}")
+            '''
+
+            send_mail_in_background(
+                email_subject,
+                email_body,
+                settings.EMAIL_HOST_USER,
+                [request.user.email],
+                fail_silently=True,
+            )
+        except Exception:
+            # The registration is saved; a broken email must not turn it into an error page
+            logger.exception('Error preparing volunteer email')
+            EMAILS_FAILED.inc(source='web')
 
     # Send notification email to organizer
-    try:
-        organizer_email = event.organizer.email
-        email_subject = f'📝 New Registration for {event.title}'
-        email_body = f'''
+    with span('registration.organizer_email'):
+        try:
+            organizer_email = event.organizer.email
+            email_subject = f'📝 New Registration for {event.title}'
+            email_body = f'''
 Dear {event.organizer.first_name or event.organizer.username},
 
 Great news! A new volunteer has registered for your event.
@@ -694,9 +1125,9 @@ Status: {status.upper()}
 📊 CURRENT REGISTRATIONS
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-Total Confirmed: {EventRegistration.objects.filter(event=event, status='confirmed').count()}
+Total Confirmed: {confirmed_count}
 Capacity: {event.capacity}
-Remaining Spots: {event.capacity - EventRegistration.objects.filter(event=event, status='confirmed').count()}
+Remaining Spots: {max(event.capacity - confirmed_count, 0)}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -705,17 +1136,18 @@ You can view all registrations and manage your event in your organizer dashboard
 Best regards,
 The GreenEvents Team
 🌍 Supporting your green initiatives!
-        '''
-
-        send_mail(
-            email_subject,
-            email_body,
-            settings.EMAIL_HOST_USER,
-            [organizer_email],
-            fail_silently=True,
-        )
-    except Exception as e:
-        print(f"Error sending organizer email: {e}")
+            '''
+
+            send_mail_in_background(
+                email_subject,
+                email_body,
+                settings.EMAIL_HOST_USER,
+                [organizer_email],
+                fail_silently=True,
+            )
+        except Exception:
+            logger.exception('Error preparing organizer email')
+            EMAILS_FAILED.inc(source='web')
 
     messages.success(request, message_text)
     return redirect('event_detail', event_id=event.id)
@@ -733,15 +1165,16 @@ def cancel_registration(request, event_id):
         status__in=['confirmed', 'waitlist']
     )
 
-    # Cancel the registration
-    registration.status = 'cancelled'
-    registration.save()
+    with write_transaction():
+        # Cancel the registration
+        registration.status = 'cancelled'
+        registration.save()
 
-    # Create user history
-    UserHistory.objects.create(
-        user=request.user,
-        event=event
-    )
+        # Create user history
+        UserHistory.objects.create(
+            user=request.user,
+            event=event
+        )
 
     messages.success(request, f'Registration cancelled for "{event.title}". You can re-register anytime!')
     return redirect('my_profile')
@@ -770,47 +1203,148 @@ def view_registrations(request, event_id):
     return render(request, 'events/view_registrations.html', context)
 
 
+# ==================== TICKETS & CHECK-IN ====================
+MAX_SYNC_SCANS = 5000
+
+
+@login_required
+def event_ticket(request, registration_id):
+    """A volunteer's signed QR ticket"""
+    registration = get_object_or_404(
+        EventRegistration.objects.select_related('event'),
+        pk=registration_id,
+        volunteer=request.user,
+    )
+    token = tickets.ticket_token(registration)
+    context = {
+        'registration': registration,
+        'event': registration.event,
+        'token': token,
+        'qr_svg': tickets.qr_svg(token) if registration.status == 'confirmed' else None,
+    }
+    return render(request, 'events/ticket.html', context)
+
+
+@login_required
+def check_in_desk(request, event_id):
+    """Door check-in page for scanning tickets (organizer only)"""
+    event = get_object_or_404(Event, pk=event_id)
+
+    if event.organizer != request.user:
+        messages.error(request, 'You can only check in volunteers for your own events.')
+        return redirect('event_detail', event_id=event.id)
+
+    counts = event.registrations.aggregate(
+        confirmed=Count('id', filter=Q(status='confirmed')),
+        checked_in=Count('id', filter=Q(checked_in_at__isnull=False)),
+    )
+    return render(request, 'events/check_in.html', {'event': event, **counts})
+
+
+def _organizes(user, event_id):
+    return Event.objects.filter(pk=event_id, organizer=user).exists()
+
+
+@login_required
+def check_in_scan(request, event_id):
+    """Check in one scanned ticket: a signature check and a single UPDATE"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+    if not _organizes(request.user, event_id):
+        return JsonResponse({'error': 'Not your event'}, status=403)
+
+    result, registration_id = tickets.check_in(event_id, request.POST.get('token', ''))
+    return JsonResponse({'result': result, 'registration': registration_id})
+
+
+@login_required
+def check_in_roster(request, event_id):
+    """Compact roster of confirmed tickets for offline door devices"""
+    event = Event.objects.filter(pk=event_id, organizer=request.user).first()
+    if event is None:
+        return JsonResponse({'error': 'Not your event'}, status=403)
+
+    response = JsonResponse(tickets.roster(event))
+    patch_cache_control(response, private=True, no_store=True)
+    return response
+
+
+@login_required
+def check_in_sync(request, event_id):
+    """
+    Upload check-ins recorded offline, with the roster they were checked
+    against: {"roster": {...}, "scans": [[token, iso time], ...]}
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+    if not _organizes(request.user, event_id):
+        return JsonResponse({'error': 'Not your event'}, status=403)
+
+    try:
+        payload = json.loads(request.body)
+        issued = payload['roster']
+        scans = [(str(token), datetime.fromisoformat(scanned_at)) for token, scanned_at in payload['scans']]
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'Expected {"roster": {...}, "scans": [[token, ISO time], ...]}'}, status=400)
+    # The door let these people in on the roster's word: it must be one we issued for this event
+    if not tickets.verify_roster(issued) or issued.get('event') != event_id:
+        return JsonResponse({'error': 'Roster was altered or is for another event; download it again'}, status=400)
+    if len(scans) > MAX_SYNC_SCANS:
+        return JsonResponse({'error': f'At most {MAX_SYNC_SCANS} scans per upload'}, status=400)
+
+    scans = [
+        (token, timezone.make_aware(scanned_at) if timezone.is_naive(scanned_at) else scanned_at)
+        for token, scanned_at in scans
+    ]
+    recorded, rejected = tickets.bulk_check_in(event_id, scans)
+    return JsonResponse({'recorded': recorded, 'rejected': rejected, 'received': len(scans)})
+
+
 # ==================== PROFILE VIEWS ====================
 @login_required
-def my_profile(request):
+async def my_profile(request):
     """Unified profile page for both volunteers and organizers with analytics"""
-    user = request.user
+    user = await aget_request_user(request)
 
     # Check user type
-    is_volunteer = hasattr(user, 'volunteer_profile')
-    is_organizer = hasattr(user, 'organizer_profile')
+    role = await aget_user_role(user)
 
-    if is_volunteer:
-        profile = user.volunteer_profile
+    if role.is_volunteer:
+        profile = role.volunteer_profile
 
         # Get user's registrations
         registrations = EventRegistration.objects.filter(
             volunteer=user,
-            status__in=['confirmed', 'waitlist']
+            status__in=['confirmed', 'waitlist'],
+            event__deleted_at__isnull=True,  # until purge_deleted removes them
         ).select_related('event').order_by('-registered_at')
 
         # Get recently viewed events
-        recent_event_ids = request.session.get('recent_events', [])
+        recent_event_ids = await request.session.aget('recent_events', [])
         recent_events = Event.objects.filter(id__in=recent_event_ids)
 
-        # Calculate analytics
-        analytics = calculate_volunteer_analytics(user, registrations)
-
-        # Update profile's total events attended
-        profile.total_events_attended = analytics['past_events']
-        profile.save()
+        # Calculate analytics while the listings load
+        analytics, registration_list, recommended = await asyncio.gather(
+            acalculate_volunteer_analytics(user, registrations),
+            _alist(registrations),
+            _alist(recommended_for_user(user, profile.interests)),
+        )
+        if not recommended:
+            recommended = await _alist(interest_fallback(user, profile.interests))
 
         context = {
             'profile': profile,
             'is_volunteer': True,
-            'registrations': registrations,
+            'registrations': registration_list,
             'recent_events': recent_events,
+            'recommended_events': recommended,
+            'calendar_feed_url': reverse('volunteer_calendar_feed', args=[ical.feed_token(user, 'volunteer')]),
             **analytics  # Unpack all analytics data
         }
-        return render(request, 'events/volunteer_dashboard.html', context)
+        return await arender(request, 'events/volunteer_dashboard.html', context)
 
-    elif is_organizer:
-        profile = user.organizer_profile
+    elif role.is_organizer:
+        profile = role.organizer_profile
 
         # Get organizer's events
         events = Event.objects.filter(organizer=user).annotate(
@@ -821,19 +1355,24 @@ def my_profile(request):
         total_registrations = EventRegistration.objects.filter(
             event__organizer=user,
             status='confirmed'
-        ).count()
+        ).acount()
 
-        # Calculate analytics
-        analytics = calculate_organizer_analytics(user, events)
+        # Calculate analytics while the listings load
+        analytics, event_list, total_registrations = await asyncio.gather(
+            acalculate_organizer_analytics(user, events),
+            _alist(events),
+            total_registrations,
+        )
 
         context = {
             'profile': profile,
             'is_organizer': True,
-            'events': events,
+            'events': event_list,
             'total_registrations': total_registrations,
+            'calendar_feed_url': reverse('organizer_calendar_feed', args=[ical.feed_token(user, 'organizer')]),
             **analytics  # Unpack all analytics data
         }
-        return render(request, 'events/organizer_dashboard.html', context)
+        return await arender(request, 'events/organizer_dashboard.html', context)
 
     else:
         messages.error(request, 'Profile not found. Please complete your signup.')
@@ -843,12 +1382,11 @@ def my_profile(request):
 @login_required
 def edit_volunteer_profile(request):
     """Edit volunteer profile"""
-    if not hasattr(request.user, 'volunteer_profile'):
+    profile = get_user_role(request.user).volunteer_profile
+    if profile is None:
         messages.error(request, 'You do not have a volunteer profile.')
         return redirect('home')
 
-    profile = request.user.volunteer_profile
-
     if request.method == 'POST':
         form = VolunteerProfileForm(request.POST, request.FILES, instance=profile)  # ← ADDED request.FILES
         if form.is_valid():
@@ -863,12 +1401,11 @@ def edit_volunteer_profile(request):
 @login_required
 def edit_organizer_profile(request):
     """Edit organizer profile"""
-    if not hasattr(request.user, 'organizer_profile'):
+    profile = get_user_role(request.user).organizer_profile
+    if profile is None:
         messages.error(request, 'You do not have an organizer profile.')
         return redirect('home')
 
-    profile = request.user.organizer_profile
-
     if request.method == 'POST':
         form = OrganizerProfileForm(request.POST, request.FILES, instance=profile)  # ← ADDED request.FILES
         if form.is_valid():
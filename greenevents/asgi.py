@@ -3,6 +3,11 @@ ASGI config for greenevents project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Long-lived responses such as the event availability stream
+(/event/<id>/availability/stream/) need this entry point, e.g.
+``uvicorn greenevents.asgi:application``. Under WSGI each open stream
+would hold a worker thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """